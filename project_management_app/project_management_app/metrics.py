@@ -0,0 +1,211 @@
+"""
+In-process request metrics.
+
+Per-request timings are collected by `PerformanceMetricsMiddleware` into a `RequestTimings` object that lives in a
+context variable for the duration of the request. Database time is gathered by an execute wrapper installed by the
+middleware and template time by the `TimedDjangoTemplates` backend. Finished requests are aggregated into the
+histograms of `REGISTRY`, which `metrics_view` exposes in the Prometheus text format.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from django.http import HttpResponse
+from django.template.backends.django import DjangoTemplates, Template
+
+
+class RequestTimings:
+    """
+    Timings gathered while a single request is being handled.
+
+    Attributes:
+        queries (int): Number of database queries executed.
+        db_seconds (float): Time spent executing database queries.
+        template_seconds (float): Time spent rendering top-level templates.
+        render_depth (int): Nesting depth of template renders, so nested renders are not counted twice.
+    """
+
+    __slots__ = ('queries', 'db_seconds', 'template_seconds', 'render_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.render_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper that times every query run on the wrapped connection.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+current_timings = ContextVar('current_timings', default=None)
+
+
+class Histogram:
+    """
+    A thread-safe cumulative histogram with fixed bucket bounds, keyed by a label value.
+    """
+
+    def __init__(self, name, documentation, buckets, label='view'):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label = label
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, value):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                # One count per bucket plus the running sum and total count
+                series = self._series[label_value] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def expose(self):
+        """
+        Returns the histogram as lines of the Prometheus text exposition format.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for label_value, (counts, total, count) in sorted(snapshot.items()):
+            label = f'{self.label}="{_escape(label_value)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{label}}} {total}')
+            lines.append(f'{self.name}_count{{{label}}} {count}')
+        return lines
+
+
+class Counter:
+    """
+    A thread-safe counter keyed by a tuple of label values.
+    """
+
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for label_values, value in snapshot:
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            lines.append(f'{self.name}{{{labels}}} {value}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    The set of metrics recorded for every request handled by this process.
+    """
+
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    def __init__(self):
+        self.requests = Counter('http_requests_total', "Requests handled, by view and status code.",
+                                ('view', 'status'))
+        self.latency = Histogram('http_request_duration_seconds', "Total request latency.",
+                                 self.LATENCY_BUCKETS)
+        self.db_time = Histogram('http_request_db_seconds', "Time spent in database queries per request.",
+                                 self.LATENCY_BUCKETS)
+        self.template_time = Histogram('http_request_template_seconds', "Time spent rendering templates per request.",
+                                       self.LATENCY_BUCKETS)
+        self.queries = Histogram('http_request_db_queries', "Database queries executed per request.",
+                                 self.QUERY_BUCKETS)
+        self.collectors = []
+
+    def record(self, view_name, status_code, total_seconds, timings):
+        self.requests.inc((view_name, str(status_code)))
+        self.latency.observe(view_name, total_seconds)
+        self.db_time.observe(view_name, timings.db_seconds)
+        self.template_time.observe(view_name, timings.template_seconds)
+        self.queries.observe(view_name, timings.queries)
+
+    def register_collector(self, collector):
+        """
+        Registers a callable returning extra exposition lines, appended to every scrape.
+        """
+        self.collectors.append(collector)
+
+    def expose(self):
+        lines = []
+        for metric in (self.requests, self.latency, self.db_time, self.template_time, self.queries):
+            lines.extend(metric.expose())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+def metrics_view(request):
+    """
+    Exposes the metrics of this process in the Prometheus text format.
+    """
+    return HttpResponse(REGISTRY.expose(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class TimedTemplate(Template):
+    """
+    Template wrapper that adds its render time to the timings of the current request.
+    """
+
+    def render(self, context=None, request=None):
+        timings = current_timings.get()
+        if timings is None:
+            return super().render(context, request)
+
+        timings.render_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.render_depth -= 1
+            # Templates rendered from within another template (e.g. crispy form fields) are already counted
+            if timings.render_depth == 0:
+                timings.template_seconds += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    The Django template backend, returning templates that record their render time.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -1,7 +1,20 @@
+import cProfile
+import time
+from contextlib import ExitStack
+
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.shortcuts import redirect
 from django.urls import resolve, Resolver404
 
+from project_task.models import Project
+from project_task.scoping import SESSION_KEY as PROJECT_SESSION_KEY, project_scope
+from .metrics import REGISTRY, RequestTimings, current_timings
+from .profiling import ProfileStore, get_config as get_profiling_config
+from .slow_queries import SlowQueryLogger, configure_logger, get_config as get_slow_query_config
+from .transactions import UNSAFE_METHODS, get_config as get_transaction_config, run_atomic
+
 
 class LoginRequiredMiddleware:
     """
@@ -48,6 +61,7 @@ class LoginRequiredMiddleware:
             'register',
             'register_success',
             'activate_account',
+            'metrics',
             # ... any other URL names related to authentication
         ]
 
@@ -64,3 +78,269 @@ class LoginRequiredMiddleware:
             return self.get_response(request)
         else:
             return redirect(settings.LOGIN_URL)
+
+
+class ProjectScopeMiddleware:
+    """
+    Middleware to scope every query of a request to the user's current project.
+
+    The current project is the one stored in the session, which defaults to the first project the user is a member of
+    and, for users that are not a member of any project, to the default project. It is set as `request.project` and
+    the project-scoped models only return its rows while the request is handled.
+
+    Attributes:
+        get_response (function): The next middleware or view function in the chain.
+    """
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response (function): The next middleware or view function in the chain.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Process the incoming request within the scope of the user's current project.
+
+        Args:
+            request (HttpRequest): The incoming request.
+
+        Returns:
+            HttpResponse: The response generated by the next middleware or view function.
+        """
+        request.project = None
+        if not request.user.is_authenticated:
+            return self.get_response(request)
+
+        project_id = request.session.get(PROJECT_SESSION_KEY)
+        project = Project.available_to(request.user).filter(id=project_id).first() if project_id is not None else None
+        if project is None:
+            project = Project.objects.filter(members=request.user).order_by('id').first() or Project.get_default()
+            request.session[PROJECT_SESSION_KEY] = project.id
+
+        request.project = project
+        with project_scope(project.id):
+            return self.get_response(request)
+
+
+class PerformanceMetricsMiddleware:
+    """
+    Middleware to record per-request performance metrics.
+
+    For every request it records the number of database queries, the time spent in the database, the time spent
+    rendering templates and the total latency. The timings are returned to the client as a `Server-Timing` header
+    and aggregated per view into the in-process histograms exposed on the `/metrics` endpoint.
+
+    Attributes:
+        get_response (function): The next middleware or view function in the chain.
+    """
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response (function): The next middleware or view function in the chain.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Process the incoming request, timing the rest of the middleware chain and the view.
+
+        Args:
+            request (HttpRequest): The incoming request.
+
+        Returns:
+            HttpResponse: The response generated by the next middleware or view function, with a `Server-Timing`
+            header added.
+        """
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        total_seconds = time.perf_counter() - start
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.view_name if resolver_match else 'unresolved'
+        REGISTRY.record(view_name, response.status_code, total_seconds, timings)
+
+        response['Server-Timing'] = (
+            f'db;dur={timings.db_seconds * 1000:.2f};desc="{timings.queries} queries", '
+            f'tpl;dur={timings.template_seconds * 1000:.2f}, '
+            f'total;dur={total_seconds * 1000:.2f}'
+        )
+        return response
+
+
+class SlowQueryLogMiddleware:
+    """
+    Middleware to log slow database queries.
+
+    When `SLOW_QUERY_LOG['ENABLED']` is set, every database query made while handling a request is timed, and
+    queries slower than `SLOW_QUERY_LOG['THRESHOLD_MS']` are written to the rotating slow query log along with the
+    view name and the application call site. When disabled, the middleware removes itself from the chain.
+
+    Attributes:
+        get_response (function): The next middleware or view function in the chain.
+        threshold_ms (float): Minimum query duration in milliseconds for a query to be logged.
+    """
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response (function): The next middleware or view function in the chain.
+
+        Raises:
+            MiddlewareNotUsed: If the slow query log is disabled.
+        """
+        config = get_slow_query_config()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        configure_logger(config)
+        self.get_response = get_response
+        self.threshold_ms = config['THRESHOLD_MS']
+
+    def __call__(self, request):
+        """
+        Process the incoming request with the slow query logger wrapped around every database connection.
+
+        Args:
+            request (HttpRequest): The incoming request.
+
+        Returns:
+            HttpResponse: The response generated by the next middleware or view function.
+        """
+        slow_query_logger = SlowQueryLogger(request, self.threshold_ms)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(slow_query_logger))
+            return self.get_response(request)
+
+
+class ProfilingMiddleware:
+    """
+    Middleware to profile a single request on demand.
+
+    A staff user can ask for a request to be profiled by sending the `X-Profile: 1` header or adding the
+    `_profile` query parameter. The check runs after authentication, so the switch has no effect for anyone else.
+    The request is run under cProfile and the profile, tagged with the URL name and a timestamp, is written to the
+    bounded profile store. Its name is returned in the `X-Profile-Id` response header.
+
+    Attributes:
+        get_response (function): The next middleware or view function in the chain.
+        header (str): Request header that switches profiling on.
+        query_param (str): Query parameter that switches profiling on.
+        store (ProfileStore): Where the profiles are written.
+    """
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response (function): The next middleware or view function in the chain.
+
+        Raises:
+            MiddlewareNotUsed: If profiling is disabled.
+        """
+        config = get_profiling_config()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = config['HEADER']
+        self.query_param = config['QUERY_PARAM']
+        self.store = ProfileStore(config['DIR'], config['MAX_FILES'], config['MAX_BYTES'])
+
+    def __call__(self, request):
+        """
+        Process the incoming request, under the profiler if a staff user asked for it.
+
+        Args:
+            request (HttpRequest): The incoming request.
+
+        Returns:
+            HttpResponse: The response generated by the next middleware or view function.
+        """
+        if not self._profiling_requested(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        response['X-Profile-Id'] = self.store.save(profiler, resolver_match.url_name if resolver_match else None)
+        return response
+
+    def _profiling_requested(self, request):
+        requested = request.headers.get(self.header) == '1' or self.query_param in request.GET
+        return requested and request.user.is_authenticated and request.user.is_staff
+
+
+class TransactionMiddleware:
+    """
+    Middleware to run the view of every mutating request in a single transaction.
+
+    Views handling POST, PUT, PATCH and DELETE requests, and views marked with `atomic_request`, are called in a
+    transaction that is retried with backoff while the database is locked. Their side effects registered with
+    `transaction.on_commit` run once the transaction commits. Views marked with `transaction.non_atomic_requests`
+    manage their transactions themselves.
+
+    Attributes:
+        get_response (function): The next middleware or view function in the chain.
+        config (dict): The request transaction settings.
+    """
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response (function): The next middleware or view function in the chain.
+
+        Raises:
+            MiddlewareNotUsed: If request transactions are disabled.
+        """
+        config = get_transaction_config()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.config = config
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Call a mutating request's view in a transaction, retrying it while the database is locked.
+
+        Args:
+            request (HttpRequest): The incoming request.
+            view_func (function): The view resolved for the request.
+            view_args (list): The positional arguments of the view.
+            view_kwargs (dict): The keyword arguments of the view.
+
+        Returns:
+            HttpResponse or None: The view's response, or None to let Django call views that aren't mutating.
+        """
+        mutating = request.method in UNSAFE_METHODS or getattr(view_func, 'atomic_request', False)
+        if not mutating or DEFAULT_DB_ALIAS in getattr(view_func, '_non_atomic_requests', ()):
+            return None
+
+        return run_atomic(lambda: view_func(request, *view_args, **view_kwargs), request.resolver_match.view_name,
+                          self.config)
@@ -0,0 +1,111 @@
+"""
+On-demand request profiling.
+
+`ProfilingMiddleware` runs a single request under cProfile when a staff user asks for it, and `ProfileStore` keeps
+the resulting profiles in a bounded directory on disk. Profiles can be listed and downloaded from the admin site.
+"""
+import re
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+
+# Profile file names: <timestamp>_<url name>.prof
+PROFILE_NAME = re.compile(r'^(?P<timestamp>\d{8}-\d{6}-\d{6})_(?P<url_name>[\w.-]+)\.prof$')
+
+
+def get_config():
+    """
+    Returns the profiling settings merged over their defaults.
+    """
+    config = {
+        'ENABLED': True,
+        'HEADER': 'X-Profile',
+        'QUERY_PARAM': '_profile',
+        'DIR': Path(settings.BASE_DIR) / 'profiles',
+        'MAX_FILES': 50,
+        'MAX_BYTES': 100 * 1024 * 1024,
+    }
+    config.update(getattr(settings, 'PROFILING', {}))
+    return config
+
+
+class ProfileStore:
+    """
+    A bounded on-disk store of profiles.
+
+    Once the store holds more than `max_files` profiles or `max_bytes` bytes, the oldest profiles are deleted.
+
+    Attributes:
+        directory (Path): Directory the profiles are written to.
+        max_files (int): Maximum number of profiles kept.
+        max_bytes (int): Maximum total size of the kept profiles.
+    """
+
+    def __init__(self, directory, max_files, max_bytes):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_settings(cls):
+        config = get_config()
+        return cls(config['DIR'], config['MAX_FILES'], config['MAX_BYTES'])
+
+    def save(self, profiler, url_name):
+        """
+        Writes the stats of a finished profiler to the store and prunes the oldest profiles.
+
+        Parameters:
+            profiler (cProfile.Profile): The profiler that ran the request.
+            url_name (str): URL name of the profiled view, used to tag the profile.
+
+        Returns:
+            str: The name of the stored profile.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        safe_url_name = re.sub(r'[^\w.-]', '-', url_name or 'unresolved')
+        name = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{safe_url_name}.prof"
+        profiler.dump_stats(self.directory / name)
+        self.prune()
+        return name
+
+    def list(self):
+        """
+        Lists the stored profiles, newest first.
+
+        Returns:
+            list of dict: The name, URL name, creation time and size of each profile.
+        """
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for path in self.directory.iterdir():
+            match = PROFILE_NAME.match(path.name)
+            if not match:
+                continue
+            profiles.append({
+                'name': path.name,
+                'url_name': match['url_name'],
+                'created': datetime.strptime(match['timestamp'], '%Y%m%d-%H%M%S-%f'),
+                'size': path.stat().st_size,
+            })
+        return sorted(profiles, key=lambda profile: profile['name'], reverse=True)
+
+    def path_for(self, name):
+        """
+        Returns the path of a stored profile, or None if the name is not a stored profile.
+        Only well-formed profile names are accepted, so the path can never leave the store directory.
+        """
+        if not PROFILE_NAME.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+    def prune(self):
+        total_bytes = 0
+        for index, profile in enumerate(self.list()):
+            total_bytes += profile['size']
+            # The newest profile is always kept, even if it alone exceeds the size limit
+            if index >= self.max_files or (index and total_bytes > self.max_bytes):
+                (self.directory / profile['name']).unlink(missing_ok=True)
@@ -35,6 +35,8 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    # Serve static files through WhiteNoise under runserver too, as in production
+    'whitenoise.runserver_nostatic',
     'django.contrib.staticfiles',
     'project_task.apps.ProjectTaskConfig',
 
@@ -46,21 +48,32 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so that it compresses the final response body, streamed responses included
+    'django.middleware.gzip.GZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Serves static files, with the precompressed variants and far-future immutable caching of hashed files
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'project_management_app.middleware.PerformanceMetricsMiddleware',
+    'project_management_app.middleware.SlowQueryLogMiddleware',
     'project_management_app.middleware.LoginRequiredMiddleware',
+    'project_management_app.middleware.ProjectScopeMiddleware',
+    'project_management_app.middleware.ProfilingMiddleware',
+    # Last, so that it wraps nothing but the view in the request's transaction
+    'project_management_app.middleware.TransactionMiddleware',
 ]
 
 ROOT_URLCONF = 'project_management_app.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Django template backend that also records template render time for the performance metrics
+        'BACKEND': 'project_management_app.metrics.TimedDjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -69,6 +82,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'project_task.context_processors.projects',
             ],
         },
     },
@@ -83,9 +97,85 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Seconds a statement waits for another connection's lock before failing with "database is locked"
+        'OPTIONS': {'timeout': 5},
     }
 }
 
+# Request transactions
+# Mutating requests run their view in one transaction, retried with backoff up to MAX_RETRIES times while the database
+# is locked
+REQUEST_TRANSACTIONS = {
+    'ENABLED': True,
+    'MAX_RETRIES': 3,
+    'BACKOFF_MS': 25,
+    'MAX_BACKOFF_MS': 500,
+}
+
+# Cache
+# The default local memory cache is private to each process and evicts the least recently used entries beyond
+# MAX_ENTRIES, which is fine for development. Deployments running several processes need a shared backend, so that an
+# invalidation in one process is seen by all of them: Redis (with `maxmemory-policy allkeys-lru`) when
+# DJANGO_CACHE_REDIS_URL is set, or a file based cache in DJANGO_CACHE_DIR on a single host.
+if os.environ.get('DJANGO_CACHE_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['DJANGO_CACHE_REDIS_URL'],
+            'KEY_PREFIX': 'scrum',
+        }
+    }
+elif os.environ.get('DJANGO_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['DJANGO_CACHE_DIR'],
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'scrum-planning',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+# Sessions
+# Reading the session row of every request from the database competes with the task writes, so sessions are read
+# from the cache, or kept in a signed cookie without any server side storage with DJANGO_SESSION_ENGINE=signed_cookies.
+# The cached sessions are only consistent across processes with a shared cache, so without one they are written to
+# and read from the database. Expired database sessions are deleted by `manage.py purge_sessions`.
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get(
+    'DJANGO_SESSION_ENGINE',
+    'cached_db' if os.environ.get('DJANGO_CACHE_REDIS_URL') or os.environ.get('DJANGO_CACHE_DIR') else 'db',
+)]
+
+# Slow query log (opt-in)
+# Queries slower than THRESHOLD_MS are written to a rotating log file, summarized by `manage.py slow_query_report`
+SLOW_QUERY_LOG = {
+    'ENABLED': os.environ.get('SLOW_QUERY_LOG_ENABLED', '') == '1',
+    'THRESHOLD_MS': float(os.environ.get('SLOW_QUERY_LOG_THRESHOLD_MS', 100)),
+    'FILE': BASE_DIR / 'logs' / 'slow_queries.log',
+    'MAX_BYTES': 5 * 1024 * 1024,
+    'BACKUP_COUNT': 5,
+}
+
+# On-demand profiling
+# Staff users can profile a single request with the `X-Profile: 1` header or the `_profile` query parameter
+PROFILING = {
+    'ENABLED': True,
+    'DIR': BASE_DIR / 'profiles',
+    'MAX_FILES': 50,
+    'MAX_BYTES': 100 * 1024 * 1024,
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -119,6 +209,20 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # collectstatic fingerprints the files with their content hash and writes gzip and brotli variants of them
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Fall back to the unhashed file names when collectstatic hasn't been run, e.g. in tests
+WHITENOISE_MANIFEST_STRICT = False
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
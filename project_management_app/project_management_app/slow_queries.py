@@ -0,0 +1,166 @@
+"""
+Opt-in slow query log.
+
+`SlowQueryLogger` is a database execute wrapper installed by `SlowQueryLogMiddleware`. Queries slower than
+`SLOW_QUERY_LOG['THRESHOLD_MS']` are written as JSON lines to a rotating log file, together with the view handling
+the request, the application call site that issued the query and its parameters with sensitive values redacted.
+The `slow_query_report` management command summarizes the log.
+"""
+import json
+import logging
+import re
+import sys
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+from . import metrics
+
+logger = logging.getLogger('slow_queries')
+
+# Columns whose values must never reach the log
+SENSITIVE_COLUMNS = ('password', 'token', 'session_key', 'session_data', 'secret', 'email')
+REDACTED = '<redacted>'
+MAX_PARAM_LENGTH = 200
+
+# Instrumentation modules that wrap query execution and are never the real call site
+INSTRUMENTATION_FILES = {__file__, metrics.__file__}
+
+_IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+
+
+def get_config():
+    """
+    Returns the slow query log settings merged over their defaults.
+    """
+    config = {
+        'ENABLED': False,
+        'THRESHOLD_MS': 100,
+        'FILE': Path(settings.BASE_DIR) / 'logs' / 'slow_queries.log',
+        'MAX_BYTES': 5 * 1024 * 1024,
+        'BACKUP_COUNT': 5,
+    }
+    config.update(getattr(settings, 'SLOW_QUERY_LOG', {}))
+    return config
+
+
+def configure_logger(config):
+    """
+    Attaches the rotating file handler to the slow query logger, creating the log directory if needed.
+    """
+    if logger.handlers:
+        return
+    log_file = Path(config['FILE'])
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(log_file, maxBytes=config['MAX_BYTES'], backupCount=config['BACKUP_COUNT'],
+                                  delay=True)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def normalise_sql(sql):
+    """
+    Collapses IN lists of any length so the same statement issued with different list sizes groups together.
+    """
+    return _IN_LIST.sub('(%s, ...)', sql)
+
+
+def redact_params(sql, params):
+    """
+    Returns the query parameters safe for logging.
+
+    Every string parameter is redacted if the statement touches a sensitive column, and long strings are truncated.
+    """
+    if params is None:
+        return None
+    lowered = sql.lower()
+    sensitive = any(column in lowered for column in SENSITIVE_COLUMNS)
+
+    def clean(value):
+        if isinstance(value, (list, tuple)):
+            return [clean(item) for item in value]
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return REDACTED
+        if isinstance(value, str):
+            if sensitive:
+                return REDACTED
+            return value if len(value) <= MAX_PARAM_LENGTH else value[:MAX_PARAM_LENGTH] + '...'
+        if value is None or isinstance(value, (int, float, bool)):
+            return value
+        return str(value)
+
+    if isinstance(params, dict):
+        return {key: clean(value) for key, value in params.items()}
+    return clean(params)
+
+
+def find_call_site():
+    """
+    Returns the innermost frame of application code on the current stack, as "path:line in function".
+    Frames from Django, installed packages and the query instrumentation are skipped.
+    """
+    base_dir = str(settings.BASE_DIR)
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(base_dir) and 'site-packages' not in filename and filename not in INSTRUMENTATION_FILES:
+            relative = filename[len(base_dir):].lstrip('/\\')
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLogger:
+    """
+    Database execute wrapper that logs queries slower than the threshold.
+
+    Attributes:
+        request (HttpRequest): The request being handled, used to resolve the view name.
+        threshold (float): Minimum query duration in seconds for a query to be logged.
+    """
+
+    def __init__(self, request, threshold_ms):
+        self.request = request
+        self.threshold = threshold_ms / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            if duration >= self.threshold:
+                self.log(sql, params, many, duration)
+
+    def view_name(self):
+        """
+        Returns the name of the view handling the request, resolving the path if the query ran in middleware
+        before URL resolution.
+        """
+        resolver_match = getattr(self.request, 'resolver_match', None)
+        if resolver_match is None:
+            try:
+                resolver_match = resolve(self.request.path_info)
+            except Resolver404:
+                return None
+        return resolver_match.view_name
+
+    def log(self, sql, params, many, duration):
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'view': self.view_name(),
+            'path': self.request.path,
+            'duration_ms': round(duration * 1000, 3),
+            'sql': normalise_sql(sql),
+            # executemany parameters can be huge, so only their count is kept
+            'params': f"<{len(params) if hasattr(params, '__len__') else '?'} rows>" if many
+            else redact_params(sql, params),
+            'call_site': find_call_site(),
+        }
+        logger.info(json.dumps(record, default=str))
@@ -0,0 +1,86 @@
+"""
+One transaction per mutating request.
+
+`TransactionMiddleware` runs every view handling a POST, PUT, PATCH or DELETE request, and every view marked with
+`atomic_request`, in a single database transaction, so a request's writes cost one commit instead of one per
+statement. Side effects that must only happen once the writes are committed, like cache invalidations and emails, are
+registered with `transaction.on_commit` and run after the commit, or not at all when the transaction rolls back.
+
+SQLite allows one writer at a time, and a transaction that can't get the write lock fails with "database is
+locked". Such a transaction is rolled back as a whole, so the view is run again, up to `MAX_RETRIES` times with an
+exponential, jittered backoff, and its deferred side effects only ever run for the attempt that committed.
+"""
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+from . import metrics
+
+UNSAFE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+_retries = metrics.Counter('db_lock_retries_total',
+                           "Request transactions retried or given up on because the database was locked, by view.",
+                           ('view', 'outcome'))
+metrics.REGISTRY.register_collector(_retries.expose)
+
+
+def get_config():
+    """
+    Returns the request transaction settings merged over their defaults.
+    """
+    config = {
+        'ENABLED': True,
+        'MAX_RETRIES': 3,
+        'BACKOFF_MS': 25,
+        'MAX_BACKOFF_MS': 500,
+    }
+    config.update(getattr(settings, 'REQUEST_TRANSACTIONS', {}))
+    return config
+
+
+def atomic_request(view):
+    """
+    Marks a view that writes on safe requests, e.g. a GET that archives sprints, to run in a request transaction.
+    """
+    view.atomic_request = True
+    return view
+
+
+def is_database_locked(exception):
+    """
+    Returns whether an exception is SQLite failing to get a lock, which retrying the transaction can resolve.
+    """
+    return isinstance(exception, OperationalError) and 'locked' in str(exception)
+
+
+def run_atomic(func, view_name, config):
+    """
+    Calls `func` in a transaction, retrying it with backoff while the database is locked.
+
+    Parameters:
+        func (callable): The work of the transaction, called once per attempt.
+        view_name (str): The name of the view, for the retry metrics.
+        config (dict): The request transaction settings.
+
+    Returns:
+        The return value of `func` in the attempt that committed.
+
+    Raises:
+        OperationalError: If the database is still locked after the last retry.
+    """
+    for attempt in range(config['MAX_RETRIES'] + 1):
+        try:
+            with transaction.atomic():
+                return func()
+        except OperationalError as exception:
+            if not is_database_locked(exception):
+                raise
+            if attempt == config['MAX_RETRIES']:
+                _retries.inc((view_name, 'exhausted'))
+                raise
+            _retries.inc((view_name, 'retried'))
+            # Full jitter, so the transactions that collided don't collide again
+            backoff_ms = min(config['MAX_BACKOFF_MS'], config['BACKOFF_MS'] * 2 ** attempt)
+            time.sleep(random.uniform(0, backoff_ms) / 1000)
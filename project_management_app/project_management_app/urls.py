@@ -16,11 +16,13 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from .metrics import metrics_view
 
 urlpatterns = [
     path('', include('project_task.urls')),
     path('', include('register.urls')),
     path('admin/', admin.site.urls),
     path('', include("django.contrib.auth.urls")),
+    path('metrics/', metrics_view, name='metrics'),
 
 ]
@@ -1,13 +1,220 @@
+from functools import partial
+
+from django import forms
 from django.contrib import admin
-from .models import Task, Tag
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from register.models import CustomizedUser
+from . import caching, dependencies, forecast
+from .admin_utils import ScalableModelAdmin
+from .charts import SprintCharts
+from .events import TRACKED_FIELDS, TaskHistory
+from .models import Project, Sprint, Task, TaskDependency, Tag
+from .reports import SprintReports
+
+
+class ReassignTasksForm(forms.Form):
+    """
+    Intermediate form of the reassign action, searching users on demand instead of listing all of them.
+    """
+    assignee = forms.ModelChoiceField(
+        queryset=CustomizedUser.objects.all(),
+        required=False,
+        widget=AutocompleteSelect(Task._meta.get_field('assignee'), admin.site),
+        help_text="Leave empty to unassign the tasks.",
+    )
 
 
 # Register your models here.
+@admin.register(Project)
+class ProjectAdmin(admin.ModelAdmin):
+    search_fields = ('name',)
+    autocomplete_fields = ('members',)
+
+
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
-    pass
+class TaskAdmin(ScalableModelAdmin):
+    """
+    Admin configuration for the Task model.
+
+    The changelist joins the assignee into its single query, the change form searches users, tags and sprints on
+    demand, and the bulk actions update the selected tasks with one statement per batch. Tasks added, changed, moved
+    between sprints or deleted through the admin are recorded in their history, like in the views.
+    """
+
+    list_display = ('name', 'status', 'priority', 'stage', 'story_point', 'assignee', 'created_date',
+                    'completed_date')
+    list_filter = ('status', 'priority', 'stage', 'type')
+    list_select_related = ('assignee',)
+    search_fields = ('name',)
+    date_hierarchy = 'created_date'
+    autocomplete_fields = ('assignee', 'tags', 'sprints')
+    actions = ('mark_completed', 'reassign')
+
+    def save_model(self, request, obj, form, change):
+        before = TaskHistory.snapshots([obj.id]).get(obj.id) if change else None
+        super().save_model(request, obj, form, change)
+        if change:
+            TaskHistory.record_changes([(obj.id, before, TaskHistory.snapshot(obj))], request.user)
+        else:
+            TaskHistory.record_created(obj, request.user)
+
+    def save_related(self, request, form, formsets, change):
+        task = form.instance
+        before = set(task.sprints.values_list('id', flat=True)) if change else set()
+        super().save_related(request, form, formsets, change)
+        after = set(task.sprints.values_list('id', flat=True))
+        for sprint_id in after - before:
+            TaskHistory.record_sprint_changes(sprint_id, added=[task.id], actor=request.user)
+        for sprint_id in before - after:
+            TaskHistory.record_sprint_changes(sprint_id, removed=[task.id], actor=request.user)
+
+    def delete_model(self, request, obj):
+        TaskHistory.record_deleted(obj, request.user)
+        super().delete_model(request, obj)
+
+    @admin.action(description="Mark selected tasks as completed")
+    def mark_completed(self, request, queryset):
+        updated = self._update_tasks(request, queryset.exclude(status=Task.COMPLETED),
+                                     {'status': Task.COMPLETED, 'completed_date': timezone.localdate()})
+        self.message_user(request, f"{updated} tasks marked as completed.")
+
+    @admin.action(description="Reassign selected tasks")
+    def reassign(self, request, queryset):
+        form = ReassignTasksForm(request.POST if request.POST.get('post') == 'yes' else None)
+        if form.is_valid():
+            assignee = form.cleaned_data['assignee']
+            updated = self._update_tasks(request, queryset, {'assignee_id': assignee.pk if assignee else None})
+            self.message_user(request, f"{updated} tasks reassigned to {assignee or 'nobody'}.")
+            return None
+        return self.confirm_action(request, 'reassign', "Reassign tasks",
+                                   f"Reassign the {queryset.count()} selected tasks to:", "Reassign", form)
+
+    def delete_queryset(self, request, queryset):
+        """
+        Deletes the selected tasks, with their working hours and dependencies, in batches that each run in their own
+        transaction, recording the deletions in the tasks' history.
+        """
+        for task_ids in self.batched_ids(queryset):
+            with transaction.atomic():
+                TaskHistory.record_deleted_tasks(task_ids, request.user)
+                # The signals sent for each deleted task, working hour and dependency invalidate the charts, task
+                # details, tag lists and dependency graphs, while the forecasts count the deleted completed tasks
+                transaction.on_commit(partial(caching.invalidate, forecast.CACHE_NAMESPACE))
+                Task.all_objects.filter(id__in=task_ids).delete()
+
+    ### Utilities Methods ###
+
+    def _update_tasks(self, request, queryset, values):
+        """
+        Utility method to set the given model attributes on the selected tasks, bumping their versions and
+        recording the changes in their history.
+
+        Returns:
+            int: The number of updated tasks.
+        """
+        changed_fields = {field: values[attribute] for field, (attribute, _) in TRACKED_FIELDS.items()
+                          if attribute in values}
+        updated = 0
+        for task_ids in self.batched_ids(queryset):
+            with transaction.atomic():
+                before = TaskHistory.snapshots(task_ids)
+                updated += Task.objects.filter(id__in=task_ids).update(version=F('version') + 1, **values)
+                TaskHistory.record_changes(
+                    [(task_id, snapshot, {**snapshot, **changed_fields}) for task_id, snapshot in before.items()],
+                    request.user,
+                )
+                # update sends no signals, so invalidate the charts, forecasts, and task details here
+                SprintCharts.invalidate_tasks(task_ids)
+                transaction.on_commit(partial(caching.invalidate, forecast.CACHE_NAMESPACE, caching.TASK_DETAILS))
+        return updated
+
+
+@admin.register(Sprint)
+class SprintAdmin(ScalableModelAdmin):
+    list_display = ('name', 'start_date', 'end_date', 'is_completed')
+    list_filter = ('is_completed',)
+    search_fields = ('name',)
+    date_hierarchy = 'start_date'
+    actions = ('archive',)
+
+    def save_model(self, request, obj, form, change):
+        """
+        Saves the sprint, freezing its report when it is archived from the form. A sprint archived again gets a new
+        report, like in `archive_sprint_backlog`.
+        """
+        super().save_model(request, obj, form, change)
+        if obj.is_completed and 'is_completed' in form.changed_data:
+            SprintReports.freeze([obj.id], replace=True)
+
+    @admin.action(description="Archive selected sprints")
+    def archive(self, request, queryset):
+        """
+        Archives the selected sprints with one statement per batch, ending the ones still running today like
+        `archive_sprint_backlog` does, and freezes their reports.
+        """
+        today = timezone.localdate()
+        archived = 0
+        for sprint_ids in self.batched_ids(queryset.filter(is_completed=False)):
+            with transaction.atomic():
+                archived += Sprint.objects.filter(id__in=sprint_ids).update(
+                    is_completed=True,
+                    end_date=Case(When(end_date__gt=today, then=Value(today)), default=F('end_date')),
+                )
+                SprintReports.freeze(sprint_ids, replace=True)
+                # update sends no signals, so invalidate the charts, forecasts, and active sprints here
+                SprintCharts.invalidate_sprints(sprint_ids)
+                transaction.on_commit(partial(caching.invalidate, forecast.CACHE_NAMESPACE, caching.SPRINTS))
+        self.message_user(request, f"{archived} sprints archived.")
+
+
+class TaskDependencyForm(forms.ModelForm):
+    """
+    Form of the dependency admin, refusing the dependencies that would make a task block itself.
+    """
+
+    class Meta:
+        model = TaskDependency
+        fields = ('task', 'blocked_by')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        task, blocked_by = cleaned_data.get('task'), cleaned_data.get('blocked_by')
+        if task and blocked_by:
+            if task.project_id != blocked_by.project_id:
+                raise forms.ValidationError("Tasks can only be blocked by tasks of the same project.")
+            cycle = dependencies.TaskDependencies.find_cycle(task.project_id, task.id, blocked_by.id)
+            if cycle:
+                raise forms.ValidationError(
+                    f"Task {blocked_by.id} already depends on task {task.id}: {' -> '.join(map(str, cycle))}."
+                )
+        return cleaned_data
+
+
+@admin.register(TaskDependency)
+class TaskDependencyAdmin(ScalableModelAdmin):
+    """
+    Admin configuration for task dependencies, which can be added and deleted but not changed, as changing one
+    end of a dependency would skip the cycle check of the form.
+    """
+
+    form = TaskDependencyForm
+    list_display = ('task', 'blocked_by')
+    list_select_related = ('task', 'blocked_by')
+    search_fields = ('task__name', 'blocked_by__name')
+    autocomplete_fields = ('task', 'blocked_by')
+
+    def has_change_permission(self, request, obj=None):
+        return obj is None and super().has_change_permission(request)
+
+    def save_model(self, request, obj, form, change):
+        obj.project_id = obj.task.project_id
+        super().save_model(request, obj, form, change)
 
 
 @admin.register(Tag)
-class TagAdmin(admin.ModelAdmin):
-    pass
+class TagAdmin(ScalableModelAdmin):
+    search_fields = ('name',)
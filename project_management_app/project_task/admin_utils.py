@@ -0,0 +1,123 @@
+"""
+Building blocks for admin pages over large tables.
+
+`ScalableModelAdmin` keeps changelists, delete confirmations and bulk actions cheap regardless of table size: the
+changelist is paginated without an exact `COUNT(*)` of large result sets, and the delete confirmation summarizes
+the selection instead of collecting every related object.
+"""
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import connections
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never counts more than `MAX_EXACT_COUNT` rows.
+
+    Result sets are counted exactly up to `MAX_EXACT_COUNT` rows with a count bounded by a LIMIT. Beyond that, the
+    size of an unfiltered table is read from the planner statistics on PostgreSQL, and any other result set is
+    paginated over its first `MAX_EXACT_COUNT` rows, to be narrowed down with the search, filters or date hierarchy.
+    """
+
+    MAX_EXACT_COUNT = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        bounded = queryset.order_by()[:self.MAX_EXACT_COUNT + 1].count()
+        if bounded <= self.MAX_EXACT_COUNT:
+            return bounded
+        estimate = None if queryset.query.where else self._estimated_table_count(queryset)
+        return max(estimate, self.MAX_EXACT_COUNT) if estimate else self.MAX_EXACT_COUNT
+
+    @staticmethod
+    def _estimated_table_count(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                           [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return row[0] if row and row[0] > 0 else None
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin for tables with millions of rows.
+
+    The changelist uses `EstimatedCountPaginator` and skips the second, unfiltered count. The delete confirmations
+    only state how many objects are selected instead of collecting every object and relation that would be deleted,
+    and the bulk delete action deletes through `delete_queryset`, which subclasses override to delete the selection in
+    batches of `ACTION_BATCH_SIZE`.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    # Number of IDs handled per statement by bulk actions
+    ACTION_BATCH_SIZE = 500
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if 'delete_selected' in actions:
+            _, name, description = actions['delete_selected']
+            actions['delete_selected'] = (ScalableModelAdmin.delete_selected, name, description)
+        return actions
+
+    def delete_selected(self, request, queryset):
+        """
+        Bulk delete action that replaces the default one, which loads every selected object for its confirmation
+        page, its log entries and its deletion.
+        """
+        if not self.has_delete_permission(request):
+            raise PermissionDenied
+        count = queryset.count()
+        opts = self.model._meta
+        name = opts.verbose_name if count == 1 else opts.verbose_name_plural
+        if request.POST.get('post') == 'yes':
+            self.delete_queryset(request, queryset)
+            self.message_user(request, f"Successfully deleted {count} {name}.", messages.SUCCESS)
+            return None
+        return self.confirm_action(request, 'delete_selected', f"Delete {opts.verbose_name_plural}",
+                                   f"Are you sure you want to delete the {count} selected {name}?", "Yes, I'm sure")
+
+    def confirm_action(self, request, action, title, message, submit_label, form=None):
+        """
+        Renders the intermediate page of an action, which posts the selection back with `post=yes` and the data
+        of the optional form.
+        """
+        return TemplateResponse(request, 'admin/action_confirmation.html', {
+            **self.admin_site.each_context(request),
+            'title': title,
+            'message': message,
+            'submit_label': submit_label,
+            'opts': self.model._meta,
+            'form': form,
+            'media': self.media + form.media if form else self.media,
+            'action': action,
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'select_across': request.POST.get('select_across', '0'),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        })
+
+    def get_deleted_objects(self, objs, request):
+        opts = self.model._meta
+        count = len(objs) if isinstance(objs, (list, tuple)) else objs.count()
+        name = opts.verbose_name if count == 1 else opts.verbose_name_plural
+        perms_needed = set() if self.has_delete_permission(request) else {opts.verbose_name}
+        return [f"{count} {name}"], {opts.verbose_name_plural: count}, perms_needed, []
+
+    def batched_ids(self, queryset):
+        """
+        Yields the primary keys of a queryset in lists of `ACTION_BATCH_SIZE`.
+
+        The keys are read up front, so actions that change the rows can't change which rows the queryset matches.
+        """
+        ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+        for start in range(0, len(ids), self.ACTION_BATCH_SIZE):
+            yield ids[start:start + self.ACTION_BATCH_SIZE]
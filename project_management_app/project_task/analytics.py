@@ -0,0 +1,251 @@
+"""
+Sprint analytics.
+
+`VelocityReport` aggregates every archived sprint from a few bulk queries. The rows are loaded into NumPy arrays
+and aggregated per sprint with vectorized operations instead of per-sprint queries.
+
+`WorkloadReport` aggregates the work of every person in a few sprints from a fixed number of grouped queries, however
+many people and sprints there are.
+"""
+from collections import defaultdict
+
+import numpy as np
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from register.models import CustomizedUser, WorkingHour
+from .models import Sprint, Task
+from .scoping import get_current_project_id
+
+
+class VelocityReport:
+    """
+    Utility class for computing sprint velocity across archived sprints.
+    """
+
+    # Default and maximum number of sprints the rolling averages span
+    DEFAULT_WINDOW = 3
+    MAX_WINDOW = 20
+
+    @staticmethod
+    def build(window=DEFAULT_WINDOW):
+        """
+        Computes the velocity of every archived sprint, oldest first.
+
+        Committed points are the story points of every task in the sprint and completed points those of its
+        completed tasks. Hours are the working hours logged on the sprint's tasks during the sprint.
+
+        Parameters:
+            window (int): Number of sprints the rolling averages span.
+
+        Returns:
+            dict: A dictionary containing:
+                - 'sprints' (list of dict): The committed and completed points, completion rate, hours, hours per
+                  point and rolling averages of each sprint.
+                - 'summary' (dict): The mean and standard deviation of the velocity and the overall hours per point.
+        """
+        sprints = list(
+            Sprint.objects.filter(is_completed=True).order_by('start_date', 'id')
+            .values_list('id', 'name', 'start_date', 'end_date')
+        )
+        if not sprints:
+            return {'window': window, 'sprints': [], 'summary': VelocityReport._summary(np.zeros(0), 0.0, 0.0)}
+
+        # Sprint IDs in ascending order, used to map query rows onto report positions
+        sprint_ids = np.array([sprint[0] for sprint in sprints], dtype=np.int64)
+        order = np.argsort(sprint_ids)
+        sorted_ids = sprint_ids[order]
+
+        def positions(ids):
+            # The later queries read the archived sprints again, so a sprint archived in the meantime has no position
+            # in the report and its rows are masked out
+            found = np.searchsorted(sorted_ids, ids)
+            known = sorted_ids[np.minimum(found, len(sorted_ids) - 1)] == ids
+            return order[found[known]], known
+
+        # Story points of every task in an archived sprint, one row per (sprint, task). The sprint membership table
+        # is not project-scoped itself, so it is narrowed down to the current project's archived sprints
+        points = np.array(
+            Task.sprints.through.objects.filter(
+                sprint__in=Sprint.objects.filter(is_completed=True).values('id')
+            ).values_list(
+                'sprint_id',
+                Coalesce('task__story_point', 0),
+                Case(When(task__status=Task.COMPLETED, then=Value(1)), default=Value(0), output_field=IntegerField()),
+            ),
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        index, known = positions(points[:, 0])
+        points = points[known]
+        committed = np.bincount(index, weights=points[:, 1], minlength=len(sprints))
+        completed = np.bincount(index, weights=points[:, 1] * points[:, 2], minlength=len(sprints))
+
+        # Hours logged on the sprint's tasks during the sprint, grouped per sprint by the database
+        logged = list(
+            WorkingHour.objects.filter(
+                task__sprints__is_completed=True,
+                date__gte=F('task__sprints__start_date'),
+                date__lte=F('task__sprints__end_date'),
+            ).values('task__sprints').annotate(total=Sum('hour')).values_list('task__sprints', 'total')
+        )
+        hours = np.zeros(len(sprints))
+        if logged:
+            index, known = positions(np.array([sprint_id for sprint_id, _ in logged], dtype=np.int64))
+            hours[index] = np.array([total.total_seconds() / 3600 for _, total in logged])[known]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            completion_rate = np.where(committed > 0, completed / committed, np.nan)
+            hours_per_point = np.where(completed > 0, hours / completed, np.nan)
+            rolling_velocity = VelocityReport._rolling_mean(completed, window)
+            rolling_hours_per_point = np.where(
+                rolling_velocity > 0, VelocityReport._rolling_mean(hours, window) / rolling_velocity, np.nan
+            )
+
+        rows = [
+            {
+                'id': sprint_id,
+                'name': name,
+                'start_date': start_date,
+                'end_date': end_date,
+                'committed_points': committed_points,
+                'completed_points': completed_points,
+                'completion_rate': VelocityReport._rounded(rate),
+                'hours': round(sprint_hours, 2),
+                'hours_per_point': VelocityReport._rounded(per_point),
+                'rolling_velocity': VelocityReport._rounded(rolling),
+                'rolling_hours_per_point': VelocityReport._rounded(rolling_per_point),
+            }
+            for (sprint_id, name, start_date, end_date), committed_points, completed_points, rate, sprint_hours,
+            per_point, rolling, rolling_per_point in zip(
+                sprints, committed.astype(np.int64).tolist(), completed.astype(np.int64).tolist(),
+                completion_rate.tolist(), hours.tolist(),
+                hours_per_point.tolist(), rolling_velocity.tolist(), rolling_hours_per_point.tolist(),
+            )
+        ]
+        return {
+            'window': window,
+            'sprints': rows,
+            'summary': VelocityReport._summary(completed, hours.sum(), completed.sum()),
+        }
+
+    ### Utilities Methods ###
+
+    @staticmethod
+    def _rolling_mean(values, window):
+        """
+        Utility method to compute the trailing mean over `window` values, averaging fewer values at the start.
+        """
+        cumulative = np.concatenate(([0.0], np.cumsum(values)))
+        ends = np.arange(1, len(values) + 1)
+        starts = np.maximum(ends - window, 0)
+        return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+    @staticmethod
+    def _summary(completed, total_hours, total_points):
+        return {
+            'sprints': int(len(completed)),
+            'mean_velocity': VelocityReport._rounded(completed.mean()) if len(completed) else None,
+            'velocity_std': VelocityReport._rounded(completed.std()) if len(completed) else None,
+            'hours_per_point': VelocityReport._rounded(total_hours / total_points) if total_points else None,
+        }
+
+    @staticmethod
+    def _rounded(value):
+        """
+        Utility method to round a float for display, turning NaN (no data) into None.
+        """
+        return None if value is None or np.isnan(value) else round(float(value), 2)
+
+
+class WorkloadReport:
+    """
+    Utility class for computing how loaded each person is in a few sprints.
+    """
+
+    # Upper bound on the number of sprints in one report
+    MAX_SPRINTS = 10
+
+    @staticmethod
+    def build(sprint_ids=None):
+        """
+        Computes the workload of every person in the given sprints, or in the sprints that aren't archived.
+
+        Assigned points are the story points of every task assigned to the person in the sprint, open tasks those
+        not completed yet, and hours the working hours the person logged on the sprint's tasks during the sprint.
+        A person is over capacity in a sprint when their assigned points exceed their sprint capacity. The people
+        are the members of the current project and everyone with tasks or hours in the sprints.
+
+        Parameters:
+            sprint_ids (list of int, optional): The IDs of the sprints, at most `MAX_SPRINTS`.
+
+        Returns:
+            dict: A dictionary containing:
+                - 'sprints' (list of dict): The ID, name and dates of each sprint, oldest first.
+                - 'people' (list of dict): The ID, username, name and capacity of each person, with their assigned
+                  points, completed points, open tasks, hours and over capacity flag in each sprint, most loaded
+                  first.
+                - 'unassigned' (list of dict): The points and open tasks nobody is assigned to in each sprint.
+                - 'over_capacity' (int): The number of people over capacity in at least one sprint.
+        """
+        sprints = Sprint.objects.filter(id__in=sprint_ids) if sprint_ids else Sprint.objects.filter(is_completed=False)
+        sprints = list(sprints.order_by('start_date', 'id').values('id', 'name', 'start_date', 'end_date')
+                       [:WorkloadReport.MAX_SPRINTS])
+        positions = {sprint['id']: index for index, sprint in enumerate(sprints)}
+
+        def empty():
+            return [{'assigned_points': 0, 'completed_points': 0, 'open_tasks': 0, 'hours': 0.0}
+                    for _ in sprints]
+
+        # Points and tasks per assignee, sprint and status. The sprint membership table is not project-scoped
+        # itself, so it is narrowed down to the sprints read above
+        workloads = defaultdict(empty)
+        tasks = Task.sprints.through.objects.filter(sprint_id__in=list(positions)).values(
+            'sprint_id', 'task__assignee_id', 'task__status',
+        ).annotate(points=Coalesce(Sum('task__story_point'), 0), tasks=Count('task_id'))
+        for row in tasks:
+            workload = workloads[row['task__assignee_id']][positions[row['sprint_id']]]
+            workload['assigned_points'] += row['points']
+            if row['task__status'] == Task.COMPLETED:
+                workload['completed_points'] += row['points']
+            else:
+                workload['open_tasks'] += row['tasks']
+
+        # Hours logged per person on the sprint's tasks during the sprint
+        hours = WorkingHour.objects.filter(
+            task__sprints__in=list(positions),
+            date__gte=F('task__sprints__start_date'),
+            date__lte=F('task__sprints__end_date'),
+        ).values('person_id', 'task__sprints').annotate(total=Sum('hour'))
+        for row in hours:
+            workloads[row['person_id']][positions[row['task__sprints']]]['hours'] = \
+                round(row['total'].total_seconds() / 3600, 2)
+
+        unassigned = workloads.pop(None, None) or empty()
+        people = CustomizedUser.objects.filter(id__in=list(workloads))
+        project_id = get_current_project_id()
+        if project_id is not None:
+            people = CustomizedUser.objects.filter(Q(id__in=list(workloads)) | Q(projects=project_id)).distinct()
+
+        rows = []
+        for person in people.values('id', 'username', 'first_name', 'last_name', 'sprint_capacity'):
+            person_sprints = workloads.get(person['id']) or empty()
+            for workload in person_sprints:
+                workload['over_capacity'] = workload['assigned_points'] > person['sprint_capacity']
+            rows.append({
+                'id': person['id'],
+                'username': person['username'],
+                'name': f"{person['first_name']} {person['last_name']}",
+                'capacity': person['sprint_capacity'],
+                'sprints': person_sprints,
+                'over_capacity': any(workload['over_capacity'] for workload in person_sprints),
+            })
+        rows.sort(key=lambda row: (-max((workload['assigned_points'] for workload in row['sprints']), default=0),
+                                   row['username']))
+
+        return {
+            'sprints': sprints,
+            'people': rows,
+            'unassigned': [{'points': workload['assigned_points'] - workload['completed_points'],
+                            'open_tasks': workload['open_tasks']} for workload in unassigned],
+            'over_capacity': sum(1 for row in rows if row['over_capacity']),
+        }
@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ProjectTaskConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'project_task'
+
+    def ready(self):
+        # Connect the cache invalidation handlers
+        from . import signals
+
+        # Recreate the default project after the tables were flushed
+        post_migrate.connect(signals.create_default_project, sender=self,
+                             dispatch_uid='project_task.create_default_project')
+
+        # Expose the cache hit and miss counters with the request metrics
+        from project_management_app.metrics import REGISTRY
+        from . import caching
+        REGISTRY.register_collector(caching.expose_metrics)
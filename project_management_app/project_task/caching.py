@@ -0,0 +1,143 @@
+"""
+Versioned cache keys and read-through caching.
+
+Cached results are stored under keys that include a per-namespace version. Invalidating a namespace replaces its
+version, so every key built before is never read again and simply expires, without having to know or delete the
+individual keys. Versions are timestamps rather than counters, so a version that is evicted from the cache and
+recreated can never collide with an older one.
+
+The values of a project are cached under the namespace's version and the project's own version of it, so a write
+invalidates the values of its project only, while invalidating the namespace without a project drops them all.
+
+`get_or_compute` reads a value through the cache and counts the hits and misses of each namespace, exposed with the
+request metrics. The namespaces below are invalidated by the signal handlers in `signals` whenever the models they
+are computed from change, and explicitly by the bulk writes that send no signals.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from project_management_app.metrics import Counter
+
+# Details of single tasks, including the names of their tags and assignee
+TASK_DETAILS = 'task-details'
+# Lists of tags, e.g. the autocomplete pages and the tag filter of sprint boards
+TAGS = 'tags'
+# Lists of active sprints
+SPRINTS = 'sprints'
+# Pages of the user directory searched by the assignee autocomplete
+USERS = 'users'
+
+DEFAULT_TIMEOUT = 15 * 60
+
+_lookups = Counter('cache_lookups_total', "Cache lookups, by namespace and result.", ('namespace', 'result'))
+
+
+def _version_key(namespace, project_id=None):
+    if project_id is None:
+        return f'cache-version:{namespace}'
+    return f'cache-version:{namespace}:p{project_id}'
+
+
+def _get_versions(keys):
+    """
+    Returns the versions stored under the given version keys with one cache round trip, creating the missing ones.
+    """
+    found = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+    return {key: found.get(key, missing.get(key)) for key in keys}
+
+
+def get_version(namespace):
+    """
+    Returns the current version of a namespace.
+    """
+    return cache.get_or_set(_version_key(namespace), time.time_ns, timeout=None)
+
+
+def get_versions(namespaces):
+    """
+    Returns the current versions of several namespaces with one cache round trip.
+
+    Returns:
+        dict: The version of each namespace.
+    """
+    keys = {_version_key(namespace): namespace for namespace in namespaces}
+    versions = _get_versions(list(keys))
+    return {namespace: versions[key] for key, namespace in keys.items()}
+
+
+def invalidate(*namespaces, project_id=None):
+    """
+    Invalidates everything cached under the given namespaces by replacing their versions, or only the values of a
+    project if one is given.
+    """
+    cache.set_many({_version_key(namespace, project_id): time.time_ns() for namespace in namespaces}, timeout=None)
+
+
+def make_key(namespace, *parts, project_id=None):
+    """
+    Builds a cache key for a namespace from the given parts and the namespace's current version, and the project's
+    version of it if a project is given.
+    """
+    if project_id is None:
+        return ':'.join([namespace, f'v{get_version(namespace)}', *(str(part) for part in parts)])
+
+    keys = [_version_key(namespace), _version_key(namespace, project_id)]
+    versions = _get_versions(keys)
+    return ':'.join([namespace, f'p{project_id}', f'v{versions[keys[0]]}.{versions[keys[1]]}',
+                     *(str(part) for part in parts)])
+
+
+def get_or_compute(namespace, parts, compute, timeout=DEFAULT_TIMEOUT, project_id=None):
+    """
+    Returns the value cached under a namespace for the given key parts, computing and caching it on a miss. Within
+    a transaction the value is always computed and never cached.
+
+    Parameters:
+        namespace (str): The namespace of the value, whose invalidation drops it.
+        parts (iterable): The parts identifying the value within the namespace.
+        compute (callable): Computes the value, which must be picklable and may be None.
+        timeout (int): Seconds the value is cached for.
+        project_id (int): The project the value belongs to, whose invalidation of the namespace drops it.
+
+    Returns:
+        The cached or computed value.
+    """
+    if transaction.get_connection().in_atomic_block:
+        # Writes of the transaction only invalidate the namespace once it commits, so within it the cache may be
+        # stale, and a value computed from its uncommitted writes must not be cached
+        _lookups.inc((namespace, 'bypass'))
+        return compute()
+
+    key = make_key(namespace, *parts, project_id=project_id)
+    # Values are cached wrapped in a tuple, so that a cached None can be told apart from a miss
+    cached = cache.get(key)
+    if cached is not None:
+        record_lookups(namespace, hits=1)
+        return cached[0]
+
+    record_lookups(namespace, misses=1)
+    value = compute()
+    cache.set(key, (value,), timeout)
+    return value
+
+
+def record_lookups(namespace, hits=0, misses=0):
+    """
+    Counts cache hits and misses of a namespace, for caches that read the cache themselves.
+    """
+    if hits:
+        _lookups.inc((namespace, 'hit'), hits)
+    if misses:
+        _lookups.inc((namespace, 'miss'), misses)
+
+
+def expose_metrics():
+    """
+    Returns the exposition lines of the cache lookup counters, for the metrics registry.
+    """
+    return _lookups.expose()
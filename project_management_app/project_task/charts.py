@@ -0,0 +1,173 @@
+"""
+Burndown and effort chart data for sprints.
+
+`SprintCharts` computes the series of any number of sprints with a fixed set of grouped queries and caches them per
+sprint. Each sprint has its own cache version, which is replaced whenever a write touches the sprint's tasks, story
+points, completions or logged hours, so archived sprints stay cached while the active one is refreshed.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+
+from register.models import WorkingHour
+from . import caching
+from .models import Sprint, Task
+from .scoping import get_current_project_id
+
+
+class SprintCharts:
+    """
+    Utility class for computing, caching and invalidating the chart series of sprints.
+    """
+
+    CACHE_TIMEOUT = 24 * 60 * 60
+
+    # Upper bound on the number of sprints fetched in one request
+    MAX_SPRINTS = 50
+
+    @staticmethod
+    def series(sprint_ids):
+        """
+        Returns the chart series of the given sprints, computing only those that are not cached.
+
+        Parameters:
+            sprint_ids (iterable of int): The IDs of the sprints.
+
+        Returns:
+            dict: The series of each existing sprint keyed by sprint ID, each holding the sprint 'name', the 'days'
+            labels and the 'ideal', 'remaining' (story points) and 'accumulated' (hours) series.
+        """
+        sprint_ids = list(dict.fromkeys(sprint_ids))
+        versions = caching.get_versions(SprintCharts._namespace(sprint_id) for sprint_id in sprint_ids)
+        # The current project is part of the key, so the series of another project's sprint are never read from the
+        # cache; computing them finds no sprint instead
+        project_id = get_current_project_id()
+        keys = {}
+        for sprint_id in sprint_ids:
+            namespace = SprintCharts._namespace(sprint_id)
+            keys[sprint_id] = f'{namespace}:p{project_id}:v{versions[namespace]}'
+        cached = cache.get_many(keys.values())
+
+        missing = [sprint_id for sprint_id in sprint_ids if keys[sprint_id] not in cached]
+        caching.record_lookups('sprint-chart', hits=len(sprint_ids) - len(missing), misses=len(missing))
+        computed = SprintCharts.compute(missing) if missing else {}
+        if computed:
+            cache.set_many({keys[sprint_id]: data for sprint_id, data in computed.items()}, SprintCharts.CACHE_TIMEOUT)
+
+        return {
+            sprint_id: cached[keys[sprint_id]] if keys[sprint_id] in cached else computed[sprint_id]
+            for sprint_id in sprint_ids
+            if keys[sprint_id] in cached or sprint_id in computed
+        }
+
+    @staticmethod
+    def invalidate_sprints(sprint_ids):
+        """
+        Invalidates the cached series of the given sprints once the current transaction commits.
+        """
+        namespaces = [SprintCharts._namespace(sprint_id) for sprint_id in set(sprint_ids)]
+        if namespaces:
+            transaction.on_commit(partial(caching.invalidate, *namespaces))
+
+    @staticmethod
+    def invalidate_tasks(task_ids):
+        """
+        Invalidates the cached series of every sprint the given tasks belong to.
+        """
+        SprintCharts.invalidate_sprints(
+            Task.sprints.through.objects.filter(task_id__in=task_ids).values_list('sprint_id', flat=True)
+        )
+
+    @staticmethod
+    def ideal_effort(num_days_in_sprint, total_story_points):
+        """
+        Returns the ideal remaining story points on each day, burning down linearly to zero on the last day.
+        """
+        if num_days_in_sprint <= 1:
+            return [total_story_points] * num_days_in_sprint
+        ideal_decrease_per_day = total_story_points / (num_days_in_sprint - 1)
+        return [total_story_points - i * ideal_decrease_per_day for i in range(num_days_in_sprint)]
+
+    @staticmethod
+    def compute(sprint_ids):
+        """
+        Computes the series of several sprints, bypassing the cache, with one query per measure grouped by sprint.
+
+        Returns:
+            dict: The series of each existing sprint keyed by sprint ID, as returned by `series`.
+        """
+        sprints = {sprint.id: sprint for sprint in Sprint.objects.filter(id__in=sprint_ids)}
+        if not sprints:
+            return {}
+
+        memberships = Task.sprints.through.objects.filter(sprint_id__in=sprints)
+        total_points = dict(
+            memberships.values('sprint_id').annotate(total=Sum('task__story_point')).values_list('sprint_id', 'total')
+        )
+
+        # Story points completed on each day of each sprint
+        burned = defaultdict(dict)
+        completions = (
+            memberships.filter(task__status=Task.COMPLETED, task__completed_date__isnull=False)
+            .values('sprint_id', 'task__completed_date').annotate(total=Sum('task__story_point'))
+            .values_list('sprint_id', 'task__completed_date', 'total')
+        )
+        for sprint_id, completed_date, points in completions:
+            burned[sprint_id][completed_date] = points or 0
+
+        # Hours logged on each day of each sprint, on the sprint's tasks
+        logged = defaultdict(dict)
+        hours = (
+            WorkingHour.objects.filter(
+                task__sprints__in=list(sprints),
+                date__gte=F('task__sprints__start_date'),
+                date__lte=F('task__sprints__end_date'),
+            )
+            .values('task__sprints', 'date').annotate(total=Sum('hour'))
+            .values_list('task__sprints', 'date', 'total')
+        )
+        for sprint_id, day, total in hours:
+            logged[sprint_id][day] = total.total_seconds() / 3600
+
+        return {
+            sprint_id: SprintCharts._sprint_series(sprint, total_points.get(sprint_id) or 0, burned[sprint_id],
+                                                   logged[sprint_id])
+            for sprint_id, sprint in sprints.items()
+        }
+
+    ### Utilities Methods ###
+
+    @staticmethod
+    def _namespace(sprint_id):
+        return f'sprint-chart-{sprint_id}'
+
+    @staticmethod
+    def _sprint_series(sprint, total_story_points, burned, logged):
+        """
+        Utility method to turn the per-day totals of one sprint into its chart series.
+        """
+        num_days_in_sprint = (sprint.end_date - sprint.start_date).days + 1
+        days = [sprint.start_date + timedelta(days=i) for i in range(num_days_in_sprint)]
+
+        remaining_effort = []
+        accumulated_hours = []
+        remaining = total_story_points
+        accumulated = 0.0
+        for day in days:
+            remaining -= burned.get(day, 0)
+            accumulated += logged.get(day, 0.0)
+            remaining_effort.append(remaining)
+            accumulated_hours.append(round(accumulated, 2))
+
+        return {
+            'name': sprint.name,
+            'days': ["Day {}".format(i + 1) for i in range(num_days_in_sprint)],
+            'dates': [day.isoformat() for day in days],
+            'ideal': SprintCharts.ideal_effort(num_days_in_sprint, total_story_points),
+            'remaining': remaining_effort,
+            'accumulated': accumulated_hours,
+        }
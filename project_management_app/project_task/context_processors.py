@@ -0,0 +1,14 @@
+from .models import Project
+
+
+def projects(request):
+    """
+    Adds the current project and the projects the user can switch to, loaded only if a template uses them.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {
+        'current_project': getattr(request, 'project', None),
+        'available_projects': Project.available_to(user).order_by('name'),
+    }
@@ -0,0 +1,297 @@
+"""
+Dependencies between tasks.
+
+A task can be blocked by other tasks of its project, which have to be completed before it. `TaskDependencies` adds
+and removes dependencies, refusing the ones that would make a task block itself, and computes the dependency graph of
+a sprint or of the whole backlog: a topological order of the remaining tasks, in which every task comes after the
+tasks blocking it, and the critical path, the chain of dependent tasks with the most story points, which bounds how
+soon the remaining work can be done.
+
+Completed tasks are left out of the graphs, as the dependencies on them are satisfied. Graphs are built from one
+query for the tasks and one for the dependencies, and cached under a fingerprint of the tasks, so they are recomputed
+whenever a task of the sprint or backlog is added, changed or removed, and under a namespace that is invalidated
+whenever a dependency changes. Which of the blockers outside of the sprint or backlog are still remaining is checked
+on every read.
+"""
+import heapq
+from collections import defaultdict, deque
+
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import Coalesce
+
+from . import caching
+from .models import Project, Task, TaskDependency
+from .scoping import get_current_project_id
+
+# Cache namespace of dependency graphs, invalidated whenever a dependency is added or removed
+CACHE_NAMESPACE = 'task-dependencies'
+
+
+class TaskDependencies:
+    """
+    Utility class for managing task dependencies and computing dependency graphs.
+    """
+
+    # Ready tasks are ordered by priority, then by age
+    PRIORITY_RANKS = {Task.URGENT: 0, Task.IMPORTANT: 1, Task.MEDIUM: 2, Task.LOW: 3}
+
+    CACHE_TIMEOUT = 60 * 60
+
+    @staticmethod
+    def add(task_id, blocked_by_id):
+        """
+        Makes a task blocked by another task of its project, unless the other task already depends on it.
+
+        Parameters:
+            task_id (int): The ID of the blocked task.
+            blocked_by_id (int): The ID of the task blocking it.
+
+        Returns:
+            tuple: A tuple containing:
+                - bool: Status of the addition (True if successful, False otherwise).
+                - str: Success or error message.
+                - dict or None: The 'cycle' of task IDs the dependency would close, if it was refused for that reason.
+        """
+        try:
+            task_id, blocked_by_id = int(task_id), int(blocked_by_id)
+        except (TypeError, ValueError):
+            return False, "Invalid task ID", None
+        if task_id == blocked_by_id:
+            return False, "A task cannot be blocked by itself", None
+
+        tasks = {task.id: task for task in Task.objects.filter(id__in=(task_id, blocked_by_id)).only('project_id')}
+        missing = [str(missing_id) for missing_id in (task_id, blocked_by_id) if missing_id not in tasks]
+        if missing:
+            return False, f"Tasks not found: {', '.join(missing)}", None
+        project_id = tasks[task_id].project_id
+        if tasks[blocked_by_id].project_id != project_id:
+            return False, "Tasks can only be blocked by tasks of the same project", None
+
+        # Dependencies of a project are added one at a time, so two additions can't close a cycle together: the
+        # project's row stays locked until the transaction adding the dependency ends. SQLite serializes writers by
+        # itself and ignores the row lock.
+        with transaction.atomic():
+            Project.objects.select_for_update().filter(id=project_id).first()
+            if TaskDependency.all_objects.filter(task_id=task_id, blocked_by_id=blocked_by_id).exists():
+                return True, f"Task {task_id} is already blocked by task {blocked_by_id}", None
+
+            cycle = TaskDependencies.find_cycle(project_id, task_id, blocked_by_id)
+            if cycle:
+                return False, f"Task {blocked_by_id} already depends on task {task_id}", {'cycle': cycle}
+
+            TaskDependency.all_objects.create(project_id=project_id, task_id=task_id, blocked_by_id=blocked_by_id)
+        return True, f"Task {task_id} is now blocked by task {blocked_by_id}", None
+
+    @staticmethod
+    def remove(task_id, blocked_by_id):
+        """
+        Removes the dependency of a task on another task.
+
+        Returns:
+            tuple: A tuple containing:
+                - bool: Status of the removal (True if the dependency existed, False otherwise).
+                - str: Success or error message.
+        """
+        try:
+            task_id, blocked_by_id = int(task_id), int(blocked_by_id)
+        except (TypeError, ValueError):
+            return False, "Invalid task ID"
+
+        # Deleted through the model, so the signal handlers invalidate the cached graphs
+        deleted, _ = TaskDependency.objects.filter(task_id=task_id, blocked_by_id=blocked_by_id).delete()
+        if not deleted:
+            return False, f"Task {task_id} is not blocked by task {blocked_by_id}"
+        return True, f"Task {task_id} is no longer blocked by task {blocked_by_id}"
+
+    @staticmethod
+    def find_cycle(project_id, task_id, blocked_by_id):
+        """
+        Returns the cycle that making `task_id` blocked by `blocked_by_id` would close, i.e. the chain of tasks through
+        which `blocked_by_id` already depends on `task_id`, found by a breadth-first search of the project's graph.
+
+        Returns:
+            list of int or None: The IDs of the tasks of the cycle from `task_id` to `blocked_by_id`, or None.
+        """
+        blocks = defaultdict(list)
+        for blocker_id, blocked_id in TaskDependency.all_objects.filter(project_id=project_id) \
+                .values_list('blocked_by_id', 'task_id').iterator(chunk_size=10000):
+            blocks[blocker_id].append(blocked_id)
+
+        previous = {task_id: None}
+        queue = deque([task_id])
+        while queue:
+            current = queue.popleft()
+            if current == blocked_by_id:
+                cycle = []
+                while current is not None:
+                    cycle.append(current)
+                    current = previous[current]
+                return cycle[::-1]
+            for blocked_id in blocks[current]:
+                if blocked_id not in previous:
+                    previous[blocked_id] = current
+                    queue.append(blocked_id)
+        return None
+
+    @staticmethod
+    def graph(tasks, scope):
+        """
+        Returns the dependency graph of a set of tasks, using a cached result when the tasks haven't changed.
+
+        Parameters:
+            tasks (QuerySet): The tasks of the graph, e.g. the tasks of a sprint. Completed tasks are left out.
+            scope (str): Identifies the set of tasks within the current project, e.g. 'sprint-3'.
+
+        Returns:
+            dict: The graph, as returned by `compute`.
+        """
+        tasks = tasks.exclude(status=Task.COMPLETED)
+        # The size of the set, its members and its latest change are part of the key, like for the forecasts
+        fingerprint = tasks.order_by().aggregate(
+            count=Count('id'),
+            ids=Coalesce(Sum('id'), 0),
+            latest=Max('version'),
+            latest_id=Max('id'),
+        )
+        graph = caching.get_or_compute(CACHE_NAMESPACE, (get_current_project_id(), scope, *fingerprint.values()),
+                                       lambda: TaskDependencies._graph(tasks), TaskDependencies.CACHE_TIMEOUT)
+        return TaskDependencies._with_remaining_blockers(graph)
+
+    @staticmethod
+    def compute(tasks):
+        """
+        Computes the dependency graph of a set of tasks, bypassing the cache.
+
+        Parameters:
+            tasks (QuerySet): The tasks of the graph. Completed tasks are left out.
+
+        Returns:
+            dict: The number of 'tasks' and 'dependencies' between them, the task IDs in topological 'order', the
+            'critical_path' with its tasks and total story points, the 'external_blockers' of each task blocked by
+            remaining tasks outside of the set, and the tasks that are part of a 'cycle', if any.
+        """
+        return TaskDependencies._with_remaining_blockers(
+            TaskDependencies._graph(tasks.exclude(status=Task.COMPLETED))
+        )
+
+    ### Utilities Methods ###
+
+    @staticmethod
+    def _graph(tasks):
+        """
+        Utility method to compute the dependency graph of a set of tasks, with one query for the tasks and one for
+        their dependencies.
+
+        Returns:
+            dict: The graph, as returned by `compute`, with every blocker outside of the set in 'external_blockers',
+            whatever its status, as the status of tasks outside of the set isn't part of the cache key.
+        """
+        nodes = {
+            task_id: (name, story_point or 0, priority)
+            for task_id, name, story_point, priority in tasks.values_list('id', 'name', 'story_point', 'priority')
+        }
+
+        # Adjacency lists of the set: for each task, the tasks of the set it blocks
+        blocks = defaultdict(list)
+        blocker_counts = dict.fromkeys(nodes, 0)
+        external_blockers = defaultdict(list)
+        edges = 0
+        dependencies = TaskDependency.all_objects.filter(task__in=tasks.values('id')) \
+            .values_list('blocked_by_id', 'task_id')
+        for blocker_id, blocked_id in dependencies.iterator(chunk_size=10000):
+            if blocker_id in nodes:
+                blocks[blocker_id].append(blocked_id)
+                blocker_counts[blocked_id] += 1
+                edges += 1
+            else:
+                external_blockers[blocked_id].append(blocker_id)
+
+        order = TaskDependencies._topological_order(nodes, blocks, blocker_counts)
+        return {
+            'tasks': len(nodes),
+            'dependencies': edges,
+            'order': order,
+            'critical_path': TaskDependencies._critical_path(nodes, blocks, order),
+            'external_blockers': {task_id: sorted(blocker_ids) for task_id, blocker_ids in external_blockers.items()},
+            # Dependencies are checked for cycles as they are added, so these only show up after direct writes
+            'cycle': sorted(set(nodes) - set(order)),
+        }
+
+    @staticmethod
+    def _with_remaining_blockers(graph):
+        """
+        Utility method to drop the completed tasks from the external blockers of a graph, with one query.
+
+        Returns:
+            dict: A copy of the graph with only the remaining external blockers.
+        """
+        blocker_ids = {blocker_id for blocker_ids in graph['external_blockers'].values() for blocker_id in blocker_ids}
+        if not blocker_ids:
+            return graph
+        remaining = set(Task.all_objects.filter(id__in=blocker_ids).exclude(status=Task.COMPLETED)
+                        .values_list('id', flat=True))
+        external_blockers = {}
+        for task_id, blocker_ids in graph['external_blockers'].items():
+            blocker_ids = [blocker_id for blocker_id in blocker_ids if blocker_id in remaining]
+            if blocker_ids:
+                external_blockers[task_id] = blocker_ids
+        return {**graph, 'external_blockers': external_blockers}
+
+    @staticmethod
+    def _topological_order(nodes, blocks, blocker_counts):
+        """
+        Utility method to order the tasks so that every task comes after the tasks blocking it, with Kahn's
+        algorithm. Among the tasks whose blockers are all ordered, the most urgent and then the oldest comes first.
+
+        Returns:
+            list of int: The ordered task IDs, without the tasks of cycles.
+        """
+        remaining = dict(blocker_counts)
+        ranks = TaskDependencies.PRIORITY_RANKS
+        ready = [(ranks.get(nodes[task_id][2], len(ranks)), task_id)
+                 for task_id, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, task_id = heapq.heappop(ready)
+            order.append(task_id)
+            for blocked_id in blocks[task_id]:
+                remaining[blocked_id] -= 1
+                if remaining[blocked_id] == 0:
+                    heapq.heappush(ready, (ranks.get(nodes[blocked_id][2], len(ranks)), blocked_id))
+        return order
+
+    @staticmethod
+    def _critical_path(nodes, blocks, order):
+        """
+        Utility method to find the chain of dependent tasks with the most story points, by relaxing the longest path
+        to every task in topological order.
+
+        Returns:
+            dict: The 'tasks' of the path, each with its 'id', 'name' and 'story_point', and their total 'story_points'.
+        """
+        if not order:
+            return {'tasks': [], 'story_points': 0}
+
+        # The story points and length of the heaviest chain ending with each task, and the task before it on the
+        # chain. Between chains of equal points the longer one wins, so zero point tasks still extend the path.
+        chains = {task_id: (nodes[task_id][1], 1) for task_id in nodes}
+        previous = {}
+        for task_id in order:
+            points, length = chains[task_id]
+            for blocked_id in blocks[task_id]:
+                candidate = (points + nodes[blocked_id][1], length + 1)
+                if candidate > chains[blocked_id]:
+                    chains[blocked_id] = candidate
+                    previous[blocked_id] = task_id
+
+        last = max(order, key=lambda task_id: chains[task_id])
+        path = [last]
+        while path[-1] in previous:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return {
+            'tasks': [{'id': task_id, 'name': nodes[task_id][0], 'story_point': nodes[task_id][1]} for task_id in path],
+            'story_points': chains[last][0],
+        }
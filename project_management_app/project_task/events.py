@@ -0,0 +1,270 @@
+"""
+Task event log.
+
+`TaskHistory` writes `TaskEvent` rows for every change made through `TaskManager`, `SprintBoard` and the task admin,
+and replays them to reconstruct the tasks of a sprint as they were at any point in time. Changes made by other means,
+e.g. from the shell, are not recorded unless they write their own events, as `generate_data` does.
+"""
+from datetime import date, datetime, time
+
+from django.utils import timezone
+
+from .models import Task, TaskEvent
+
+# Task fields whose transitions are recorded: event field name -> (model attribute, parser for stored values)
+TRACKED_FIELDS = {
+    'name': ('name', str),
+    'status': ('status', str),
+    'priority': ('priority', str),
+    'stage': ('stage', str),
+    'assignee': ('assignee_id', int),
+    'story_point': ('story_point', int),
+    'completed_date': ('completed_date', date.fromisoformat),
+}
+
+# Pseudo fields recording the creation and deletion of a task and its moves between sprints
+EXISTS = 'exists'
+SPRINT = 'sprint'
+
+
+class TaskHistory:
+    """
+    Utility class for recording and replaying task events.
+    Provides static methods to record field transitions and to reconstruct past states of a sprint.
+    """
+
+    @staticmethod
+    def snapshot(task):
+        """
+        Captures the current values of the tracked fields of a task.
+        Fields deferred when the task was loaded are left out instead of being fetched.
+
+        Parameters:
+            task (Task): The task.
+
+        Returns:
+            dict: The value of each loaded tracked field, keyed by event field name.
+        """
+        deferred = task.get_deferred_fields()
+        return {field: getattr(task, attribute) for field, (attribute, _) in TRACKED_FIELDS.items()
+                if attribute not in deferred}
+
+    @staticmethod
+    def snapshots(task_ids):
+        """
+        Captures the current values of the tracked fields of several tasks with a single query.
+
+        Parameters:
+            task_ids (iterable of int): The IDs of the tasks.
+
+        Returns:
+            dict: The snapshot of each existing task, keyed by task ID.
+        """
+        attributes = {attribute: field for field, (attribute, _) in TRACKED_FIELDS.items()}
+        return {
+            row.pop('id'): {attributes[attribute]: value for attribute, value in row.items()}
+            for row in Task.objects.filter(id__in=task_ids).values('id', *attributes)
+        }
+
+    @staticmethod
+    def record_changes(changes, actor=None):
+        """
+        Records the tracked fields that differ between before and after snapshots of tasks.
+
+        Parameters:
+            changes (iterable of tuple): (task_id, before, after) for each task, where before and after map event
+                field names to values. Fields missing from either snapshot are ignored.
+            actor (CustomizedUser, optional): The user who made the changes.
+
+        Returns:
+            int: The number of recorded events.
+        """
+        now = timezone.now()
+        events = [
+            TaskHistory._event(task_id, field, before[field], after[field], actor, now)
+            for task_id, before, after in changes
+            for field in TRACKED_FIELDS
+            if field in before and field in after and before[field] != after[field]
+        ]
+        TaskEvent.objects.bulk_create(events)
+        return len(events)
+
+    @staticmethod
+    def record_created(task, actor=None):
+        """
+        Records the creation of a task.
+        """
+        TaskHistory._event(task.id, EXISTS, None, '1', actor, timezone.now()).save()
+
+    @staticmethod
+    def record_deleted(task, actor=None):
+        """
+        Records the deletion of a task, including its final field values and its removal from every sprint, so that
+        its past states can still be reconstructed once the task row is gone. Must be called before deleting.
+        """
+        now = timezone.now()
+        before = TaskHistory.snapshot(task)
+        events = [TaskHistory._event(task.id, field, value, None, actor, now) for field, value in before.items()
+                  if value is not None]
+        events += [TaskHistory._event(task.id, SPRINT, sprint_id, None, actor, now, sprint_id=sprint_id)
+                   for sprint_id in task.sprints.values_list('id', flat=True)]
+        events.append(TaskHistory._event(task.id, EXISTS, '1', None, actor, now))
+        TaskEvent.objects.bulk_create(events)
+
+    @staticmethod
+    def record_deleted_tasks(task_ids, actor=None):
+        """
+        Records the deletion of several tasks like `record_deleted`, reading them with a fixed number of queries.
+        Must be called before deleting.
+        """
+        now = timezone.now()
+        events = [
+            TaskHistory._event(task_id, field, value, None, actor, now)
+            for task_id, before in TaskHistory.snapshots(task_ids).items()
+            for field, value in before.items()
+            if value is not None
+        ]
+        memberships = Task.sprints.through.objects.filter(task_id__in=task_ids).values_list('task_id', 'sprint_id')
+        events += [TaskHistory._event(task_id, SPRINT, sprint_id, None, actor, now, sprint_id=sprint_id)
+                   for task_id, sprint_id in memberships]
+        events += [TaskHistory._event(task_id, EXISTS, '1', None, actor, now) for task_id in task_ids]
+        TaskEvent.objects.bulk_create(events)
+
+    @staticmethod
+    def record_sprint_changes(sprint_id, added=(), removed=(), actor=None):
+        """
+        Records tasks being added to or removed from a sprint.
+
+        Parameters:
+            sprint_id (int): The ID of the sprint.
+            added (iterable of int): IDs of the tasks added to the sprint.
+            removed (iterable of int): IDs of the tasks removed from the sprint.
+            actor (CustomizedUser, optional): The user who moved the tasks.
+        """
+        now = timezone.now()
+        events = [TaskHistory._event(task_id, SPRINT, None, sprint_id, actor, now, sprint_id=sprint_id)
+                  for task_id in added]
+        events += [TaskHistory._event(task_id, SPRINT, sprint_id, None, actor, now, sprint_id=sprint_id)
+                   for task_id in removed]
+        TaskEvent.objects.bulk_create(events)
+
+    @staticmethod
+    def sprint_state_at(sprint_id, moment):
+        """
+        Reconstructs the tasks of a sprint as they were at a given moment.
+
+        Parameters:
+            sprint_id (int): The ID of the sprint.
+            moment (datetime or date): The point in time. A date stands for the end of that day.
+
+        Returns:
+            list of dict: The state of each task that was in the sprint at that moment.
+        """
+        return TaskHistory.sprint_states(sprint_id, [moment])[0][1]
+
+    @staticmethod
+    def sprint_states(sprint_id, moments):
+        """
+        Reconstructs the tasks of a sprint at several moments with one ordered scan of the event log.
+
+        The current state of every task that has ever been in the sprint is loaded first. Every event after the
+        earliest moment is then undone, newest first, which yields the state at the earliest moment, and the same
+        events are re-applied in order while stepping through the moments. Tasks that predate the event log are
+        treated as having always had their earliest recorded values.
+
+        Parameters:
+            sprint_id (int): The ID of the sprint.
+            moments (iterable of datetime or date): The points in time. A date stands for the end of that day.
+
+        Returns:
+            list of tuple: (moment, list of task state dicts) for each moment, in chronological order. Each state
+            holds the task 'id' and the value of every tracked field.
+        """
+        moments = sorted(TaskHistory._as_datetime(moment) for moment in moments)
+        if not moments:
+            return []
+
+        member_ids = set(Task.sprints.through.objects.filter(sprint_id=sprint_id).values_list('task_id', flat=True))
+        task_ids = member_ids | set(TaskEvent.objects.filter(sprint_id=sprint_id).values_list('task_id', flat=True))
+
+        # Current state; tasks that have since been deleted keep their defaults until their deletion is undone
+        states = {
+            task_id: {'id': task_id, EXISTS: False, SPRINT: task_id in member_ids,
+                      **{field: None for field in TRACKED_FIELDS}}
+            for task_id in task_ids
+        }
+        attributes = {attribute: field for field, (attribute, _) in TRACKED_FIELDS.items()}
+        for row in Task.objects.filter(id__in=task_ids).values('id', *attributes):
+            state = states[row.pop('id')]
+            state[EXISTS] = True
+            state.update({attributes[attribute]: value for attribute, value in row.items()})
+
+        events = list(
+            TaskEvent.objects.filter(task_id__in=task_ids, timestamp__gt=moments[0])
+            .order_by('timestamp', 'id')
+            .values_list('task_id', 'field', 'sprint_id', 'old_value', 'new_value', 'timestamp')
+        )
+
+        # Rewind to the earliest moment
+        for task_id, field, event_sprint_id, old_value, _, _ in reversed(events):
+            TaskHistory._apply(states[task_id], field, event_sprint_id, old_value, sprint_id)
+
+        # Replay forwards, taking a snapshot at each moment
+        results = []
+        position = 0
+        for moment in moments:
+            while position < len(events) and events[position][5] <= moment:
+                task_id, field, event_sprint_id, _, new_value, _ = events[position]
+                TaskHistory._apply(states[task_id], field, event_sprint_id, new_value, sprint_id)
+                position += 1
+            results.append((moment, [
+                {key: value for key, value in state.items() if key not in (EXISTS, SPRINT)}
+                for state in states.values() if state[EXISTS] and state[SPRINT]
+            ]))
+        return results
+
+    ### Utilities Methods ###
+
+    @staticmethod
+    def _apply(state, field, event_sprint_id, value, sprint_id):
+        """
+        Utility method to set a field of a replayed task state to a stored event value.
+        """
+        if field == EXISTS:
+            state[EXISTS] = value is not None
+        elif field == SPRINT:
+            if event_sprint_id == sprint_id:
+                state[SPRINT] = value is not None
+        elif field in TRACKED_FIELDS:
+            state[field] = None if value is None else TRACKED_FIELDS[field][1](value)
+
+    @staticmethod
+    def _event(task_id, field, old_value, new_value, actor, timestamp, sprint_id=None):
+        return TaskEvent(
+            task_id=task_id,
+            field=field,
+            old_value=TaskHistory._encode(old_value),
+            new_value=TaskHistory._encode(new_value),
+            sprint_id=sprint_id,
+            actor=actor if actor is not None and actor.is_authenticated else None,
+            timestamp=timestamp,
+        )
+
+    @staticmethod
+    def _encode(value):
+        if value is None:
+            return None
+        if isinstance(value, date):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def _as_datetime(moment):
+        """
+        Utility method to turn a moment into an aware datetime, reading a date as the end of that day.
+        """
+        if not isinstance(moment, datetime):
+            moment = datetime.combine(moment, time.max)
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
@@ -0,0 +1,179 @@
+"""
+Backlog completion forecast.
+
+`BacklogForecast` answers "when will the backlog be done" with a Monte Carlo simulation: future sprints are
+simulated by resampling the throughput of recent archived sprints until the backlog is used up, and the percentiles
+of the simulated number of sprints are turned into completion dates.
+"""
+import hashlib
+import math
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import caching
+from .models import Sprint, Task
+from .scoping import get_current_project_id
+
+# Cache namespace of forecasts, invalidated whenever a task is completed or a sprint archived
+CACHE_NAMESPACE = 'forecast'
+
+
+class BacklogForecast:
+    """
+    Utility class for forecasting when the product backlog will be completed.
+    """
+
+    PERCENTILES = (50, 85, 95)
+    UNITS = ('points', 'tasks')
+
+    DEFAULT_SIMULATIONS = 20000
+    MAX_SIMULATIONS = 100000
+
+    # Number of most recent archived sprints whose throughput is resampled
+    DEFAULT_HISTORY = 10
+
+    # Simulations that need more sprints than this are reported as not finishing
+    MAX_SPRINTS = 520
+
+    # Upper bound on the number of sampled values held in memory at once
+    MAX_BLOCK_ELEMENTS = 4000000
+
+    CACHE_TIMEOUT = 60 * 60
+
+    @staticmethod
+    def forecast(tasks, tag_filter=None, unit='points', simulations=DEFAULT_SIMULATIONS, history=DEFAULT_HISTORY,
+                 seed=None):
+        """
+        Forecasts the completion of a set of backlog tasks, using a cached result when one is available.
+
+        Parameters:
+            tasks (QuerySet): The backlog tasks to forecast, e.g. from TaskManager.list_tasks.
+            tag_filter (list of str, optional): Tag names the backlog was filtered by. Only the throughput of
+                completed tasks with these tags is sampled.
+            unit (str): Whether to forecast story 'points' or the number of 'tasks'.
+            simulations (int): Number of simulated futures.
+            history (int): Number of most recent archived sprints to sample throughput from.
+            seed (int, optional): Seed for the random generator, for reproducible forecasts.
+
+        Returns:
+            tuple: A tuple containing:
+                - bool: Status of the forecast (True if successful, False otherwise).
+                - str: Success or error message.
+                - dict or None: The remaining work, the sampled throughput and a completion date per percentile if
+                  successful, None otherwise.
+        """
+        # The project, the backlog's size and its latest change are part of the key, so every project has its own
+        # forecasts and adding, editing or planning backlog tasks also produces a fresh forecast
+        backlog = tasks.order_by().aggregate(
+            count=Count('id'),
+            points=Coalesce(Sum('story_point'), 0),
+            latest=Max('version'),
+            latest_id=Max('id'),
+        )
+        tags = hashlib.md5(','.join(sorted(tag_filter or [])).encode()).hexdigest()
+        key = caching.make_key(CACHE_NAMESPACE, get_current_project_id(), unit, simulations, history, seed, tags,
+                               *backlog.values())
+
+        result = cache.get(key)
+        caching.record_lookups(CACHE_NAMESPACE, hits=int(result is not None), misses=int(result is None))
+        if result is None:
+            remaining = backlog['points'] if unit == 'points' else backlog['count']
+            success, message, result = BacklogForecast._simulate(remaining, tag_filter, unit, simulations, history,
+                                                                 seed)
+            if not success:
+                return False, message, None
+            cache.set(key, result, BacklogForecast.CACHE_TIMEOUT)
+
+        label = 'story points' if unit == 'points' else 'tasks'
+        return True, f"Forecast for {result['remaining']} remaining {label}", result
+
+    ### Utilities Methods ###
+
+    @staticmethod
+    def _simulate(remaining, tag_filter, unit, simulations, history, seed):
+        """
+        Utility method to run the Monte Carlo simulation.
+
+        Every simulated future draws the throughput of each upcoming sprint from the sampled history. The futures
+        are simulated together as a (futures x sprints) matrix, whose cumulative sums give the first sprint in which
+        each future finishes the remaining work.
+        """
+        throughput, sprint_length = BacklogForecast._throughput(tag_filter, unit, history)
+        if throughput is None:
+            return False, "No archived sprints to forecast from", None
+
+        result = {
+            'unit': unit,
+            'remaining': remaining,
+            'simulations': simulations,
+            'history': throughput.tolist(),
+            'sprint_length_days': sprint_length,
+            'forecast': {},
+        }
+        if remaining <= 0:
+            today = timezone.localdate()
+            result['forecast'] = {f'p{percentile}': {'sprints': 0, 'date': today}
+                                  for percentile in BacklogForecast.PERCENTILES}
+            return True, '', result
+        if not throughput.any():
+            return False, "No work was completed in the sampled sprints", None
+
+        rng = np.random.default_rng(seed)
+        # Futures that never finish keep needing infinitely many sprints, so they sort last
+        sprints_needed = np.full(simulations, np.inf)
+        active = np.arange(simulations)
+        completed = np.zeros(simulations)
+        simulated = 0
+        # Sprints are simulated in blocks of roughly twice what the mean throughput needs, bounded in memory;
+        # only the futures that have not finished yet are carried into the next block
+        block = math.ceil(2 * remaining / throughput.mean())
+        block = min(max(block, 1), max(1, BacklogForecast.MAX_BLOCK_ELEMENTS // simulations))
+        while active.size and simulated < BacklogForecast.MAX_SPRINTS:
+            horizon = min(block, BacklogForecast.MAX_SPRINTS - simulated)
+            samples = rng.choice(throughput, size=(active.size, horizon))
+            cumulative = completed[:, None] + np.cumsum(samples, axis=1)
+            finished = cumulative[:, -1] >= remaining
+            sprints_needed[active[finished]] = simulated + (cumulative[finished] >= remaining).argmax(axis=1) + 1
+            completed = cumulative[~finished, -1]
+            active = active[~finished]
+            simulated += horizon
+
+        start = timezone.localdate()
+        for percentile in BacklogForecast.PERCENTILES:
+            sprints = np.percentile(sprints_needed, percentile, method='higher')
+            result['forecast'][f'p{percentile}'] = {
+                'sprints': int(sprints) if np.isfinite(sprints) else None,
+                'date': start + timedelta(days=int(sprints) * sprint_length) if np.isfinite(sprints) else None,
+            }
+        return True, '', result
+
+    @staticmethod
+    def _throughput(tag_filter, unit, history):
+        """
+        Utility method to load the throughput of the most recent archived sprints.
+
+        Returns:
+            tuple: The throughput of each sampled sprint as an array and the median sprint length in days, or
+            (None, None) if there are no archived sprints.
+        """
+        sprints = list(
+            Sprint.objects.filter(is_completed=True).order_by('-end_date', '-id')
+            .values_list('id', 'start_date', 'end_date')[:history]
+        )
+        if not sprints:
+            return None, None
+
+        completed = Task.objects.filter(status=Task.COMPLETED, sprints__in=[sprint[0] for sprint in sprints])
+        if tag_filter:
+            completed = completed.filter(id__in=Task.objects.filter(tags__name__in=tag_filter).values('id'))
+        measure = Coalesce(Sum('story_point'), 0) if unit == 'points' else Count('id')
+        per_sprint = dict(completed.values('sprints').annotate(total=measure).values_list('sprints', 'total'))
+
+        throughput = np.array([per_sprint.get(sprint_id, 0) for sprint_id, _, _ in sprints], dtype=float)
+        lengths = [(end_date - start_date).days + 1 for _, start_date, end_date in sprints]
+        return throughput, max(1, int(np.median(lengths)))
@@ -2,27 +2,80 @@ from datetime import timezone
 from django import forms
 from .models import Task, Tag
 from .models import Sprint
+from django.urls import reverse_lazy
 from django.utils import timezone
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Submit, HTML
 
 
-class CreateNewTaskForm(forms.ModelForm):
+class AutocompleteSelectMixin:
     """
-    A form for creating a new task.
+    Mixin for select widgets of model choice fields whose options are searched through an autocomplete endpoint.
 
-    This form provides fields for creating a new task, including name, type, priority, description,
-    story point, tags, stage, and created date. The tags field uses Django's built-in SelectMultiple widget.
-    The created date field is set to read-only and its initial value is set to the current datetime.
+    Only the selected options are rendered, so the size of the form doesn't grow with the number of choices. The
+    endpoint's URL is rendered as the `data-autocomplete-url` attribute, for Select2 to load the other options.
+    """
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = str(self.url)
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        choices = []
+        if not self.allow_multiple_selected and field.empty_label is not None:
+            choices.append(('', field.empty_label))
+        # Values that aren't IDs are new tag names, which have no option to render yet
+        selected_ids = [item for item in value if item.isdigit()]
+        if selected_ids:
+            choices += [(obj.pk, field.label_from_instance(obj)) for obj in field.queryset.filter(pk__in=selected_ids)]
+        return [
+            (None, [self.create_option(name, option_value, label, str(option_value) in value, index, attrs=attrs)],
+             index)
+            for index, (option_value, label) in enumerate(choices)
+        ]
+
+
+class AutocompleteSelect(AutocompleteSelectMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteSelectMixin, forms.SelectMultiple):
+    pass
+
+
+class ProjectTagsForm(forms.ModelForm):
+    """
+    Base form of the task forms, whose tags are chosen among the tags of the current project with a select whose
+    options are searched on demand.
     """
 
-    # For the tags, use Django's built-in SelectMultiple widget
     tags = forms.ModelMultipleChoiceField(
         queryset=Tag.objects.all(),
-        widget=forms.SelectMultiple(attrs={'class': 'form-control'}),
+        widget=AutocompleteSelectMultiple(reverse_lazy('autocomplete_tags'), attrs={'class': 'form-control'}),
         required=True
     )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Rebuilt per form, as the class-level queryset was created outside of any project scope
+        self.fields['tags'].queryset = Tag.objects.all()
+
+
+class CreateNewTaskForm(ProjectTagsForm):
+    """
+    A form for creating a new task.
+
+    This form provides fields for creating a new task, including name, type, priority, description,
+    story point, tags, stage, and created date. The tags field searches tags on demand.
+    The created date field is set to read-only and its initial value is set to the current datetime.
+    """
+
     # Set created_date to read-only and set its initial value to current datetime
     created_date = forms.DateField(
         widget=forms.DateInput(attrs={'readonly': 'readonly'}),
@@ -46,23 +99,16 @@ class CreateNewTaskForm(forms.ModelForm):
         self.fields['created_date'].initial = timezone.now()
 
 
-class EditTaskForm(forms.ModelForm):
+class EditTaskForm(ProjectTagsForm):
     """
     A form for editing a task.
 
     This form provides fields for editing a task, including name, type, priority, description,
-    story point, tags, status, stage, assignee, created date, and sprints. The tags field uses
-    Django's built-in SelectMultiple widget. The created date field is set to read-only and its
+    story point, tags, status, stage, assignee, created date, and sprints. The tags and assignee
+    fields search their choices on demand. The created date field is set to read-only and its
     initial value is set to the current datetime.
     """
 
-    # For the tags, use Django's built-in SelectMultiple widget
-    tags = forms.ModelMultipleChoiceField(
-        queryset=Tag.objects.all(),
-        widget=forms.SelectMultiple(attrs={'class': 'form-control'}),
-        required=True
-    )
-
     # Set created_date to read-only and set its initial value to current datetime
     created_date = forms.DateField(
         widget=forms.DateInput(attrs={'readonly': 'readonly'}),
@@ -81,6 +127,9 @@ class EditTaskForm(forms.ModelForm):
             "assignee",
             "created_date",
         ]
+        widgets = {
+            'assignee': AutocompleteSelect(reverse_lazy('autocomplete_assignees')),
+        }
 
     def __init__(self, *args, **kwargs):
         super(EditTaskForm, self).__init__(*args, **kwargs)
@@ -104,13 +153,7 @@ class CreateNewSprintForm(forms.ModelForm):
         super(CreateNewSprintForm, self).__init__(*args, **kwargs)
 
 
-class SprintBoardTaskForm(forms.ModelForm):
-
-    tags = forms.ModelMultipleChoiceField(
-        queryset=Tag.objects.all(),
-        widget=forms.SelectMultiple(attrs={'class': 'form-control'}),
-        required=True
-    )
+class SprintBoardTaskForm(ProjectTagsForm):
 
     hour = forms.DurationField(
         required=False,
@@ -138,6 +181,9 @@ class SprintBoardTaskForm(forms.ModelForm):
             "hour", 
             "total_hour",
         ]
+        widgets = {
+            'assignee': AutocompleteSelect(reverse_lazy('autocomplete_assignees')),
+        }
 
 
     def __init__(self, *args, **kwargs):
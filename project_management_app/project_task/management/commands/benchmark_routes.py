@@ -0,0 +1,307 @@
+import json
+import logging
+import math
+import time
+import tracemalloc
+from datetime import datetime
+from importlib import import_module
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, resolve, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from project_management_app.transactions import UNSAFE_METHODS
+from project_task.models import Project, Tag, Task, Sprint
+from project_task.scoping import project_scope
+from register.models import CustomizedUser, WorkingHour
+
+
+class Command(BaseCommand):
+    """
+    Management command that benchmarks every named route of the project_task and register apps.
+
+    Each route is driven through the Django test client as a logged in staff user. The requests that
+    `TransactionMiddleware` runs in a transaction, those with unsafe methods or to views marked with `atomic_request`,
+    run inside a transaction that is rolled back afterwards, so mutating routes can be repeated against unchanged
+    data. The other requests run outside of any transaction like in production, so their reads through the cache are
+    measured rather than bypassing it. The report contains the p50/p95 latency, query count and peak Python memory of each route and can be written as
+    JSON and compared against a previous run.
+    """
+
+    help = "Benchmark every route of project_task and register and report latency, query count and peak memory."
+
+    URLCONFS = ['project_task.urls', 'register.urls']
+
+    # Routes that are not plain GETs: url name -> (method, builder for the request data given the sample context)
+    ROUTE_REQUESTS = {
+        'bulk_edit_tasks': ('POST', lambda ctx: {
+            'tasks': [{'id': task_id, 'version': version, 'status': Task.IN_PROGRESS, 'assignee': ctx['user'].pk}
+                      for task_id, version in ctx['sprint_task_versions']],
+        }),
+        'charts_data': ('GET', lambda ctx: {'ids': ','.join(str(sprint_id) for sprint_id in ctx['sprint_ids'])}),
+        'delete_task': ('POST', lambda ctx: {}),
+        'edit_task': ('GET', None),
+        'edit_tasks': ('POST', lambda ctx: {
+            'assignee': ctx['user'].pk, 'status': Task.IN_PROGRESS, 'hour': '01:30:00',
+        }),
+        'move_selected_tasks_to_sprint': ('POST', lambda ctx: {
+            'selected_tasks': ctx['backlog_task_ids'], 'sprint_id': ctx['sprint_id'],
+        }),
+        'graph': ('POST', lambda ctx: {'date': ctx['working_date']}),
+        'plan_sprint': ('GET', lambda ctx: {'capacity': 40, 'per_assignee': 1}),
+        'log_time': ('POST', lambda ctx: {
+            'entries': [{'task': ctx['kwargs']['task_id'], 'duration': '01:30:00'}],
+        }),
+        'logout': ('POST', lambda ctx: {}),
+        'switch_project': ('POST', lambda ctx: {'project_id': ctx['project_id']}),
+    }
+
+    # Routes whose POST data is sent as a JSON body
+    JSON_ROUTES = {'bulk_edit_tasks', 'log_time'}
+
+    # Routes that end the benchmark user's session and require logging in again afterwards
+    LOGS_OUT = {'logout'}
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help="Timed requests per route.")
+        parser.add_argument('--warmup', type=int, default=2, help="Untimed requests per route before timing.")
+        parser.add_argument('--routes', nargs='*', default=None, help="Only benchmark these URL names.")
+        parser.add_argument('--username', default='benchmark', help="Staff user the requests are made as.")
+        parser.add_argument('--output', default=None, help="Write the JSON report to this file.")
+        parser.add_argument('--compare', default=None, help="JSON report of a previous run to compare against.")
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("At least one iteration is required.")
+
+        routes = self._discover_routes(options['routes'])
+        if not routes:
+            raise CommandError("No routes matched.")
+
+        context = self._sample_context(options['username'])
+        client = Client(raise_request_exception=False)
+        client.force_login(context['user'])
+
+        # Server errors are reported as status codes, so keep their tracebacks out of the report
+        request_logger = logging.getLogger('django.request')
+        request_logger.disabled = True
+
+        results = {}
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver'],
+                                   EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+                for name, converters in routes:
+                    results[name] = self._benchmark_route(client, name, converters, context, options)
+        finally:
+            request_logger.disabled = False
+
+        report = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'iterations': options['iterations'],
+                'database': connection.vendor,
+                'rows': {
+                    'tasks': Task.objects.count(),
+                    'tags': Tag.objects.count(),
+                    'sprints': Sprint.objects.count(),
+                    'users': CustomizedUser.objects.count(),
+                    'working_hours': WorkingHour.objects.count(),
+                },
+            },
+            'routes': results,
+        }
+
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                baseline = json.load(baseline_file)['routes']
+        self._print_report(results, baseline)
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(report, output_file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+    ### Benchmarking ###
+
+    def _benchmark_route(self, client, name, converters, context, options):
+        """
+        Benchmarks a single route.
+
+        Returns:
+            dict: The method, path, status code, latency percentiles, query count and peak memory of the route.
+        """
+        method, data_builder = self.ROUTE_REQUESTS.get(name, ('GET', None))
+        path = reverse(name, kwargs={key: context['kwargs'][key] for key in converters})
+        data = data_builder(context) if data_builder else None
+        rolled_back = method in UNSAFE_METHODS or getattr(resolve(path).func, 'atomic_request', False)
+
+        for _ in range(options['warmup']):
+            self._request(client, name, method, path, data, context, rolled_back)
+
+        timings = []
+        queries = 0
+        status_code = None
+        for _ in range(options['iterations']):
+            with CaptureQueriesContext(connection) as captured:
+                elapsed, status_code = self._request(client, name, method, path, data, context, rolled_back)
+            timings.append(elapsed)
+            queries = len(captured)
+
+        # Memory is measured in a separate request so tracing does not inflate the timings
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        self._request(client, name, method, path, data, context, rolled_back)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings.sort()
+        return {
+            'method': method,
+            'path': path,
+            'rolled_back': rolled_back,
+            'status': status_code,
+            'p50_ms': round(self._percentile(timings, 50) * 1000, 3),
+            'p95_ms': round(self._percentile(timings, 95) * 1000, 3),
+            'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+            'queries': queries,
+            'peak_memory_kb': round((peak - baseline) / 1024, 1),
+        }
+
+    def _request(self, client, name, method, path, data, context, rolled_back):
+        """
+        Sends one request, inside a transaction that is always rolled back if `rolled_back` is set.
+
+        Returns:
+            tuple: The elapsed wall time in seconds and the response status code.
+        """
+        if rolled_back:
+            with transaction.atomic():
+                elapsed, response = self._send(client, name, method, path, data)
+                transaction.set_rollback(True)
+        else:
+            elapsed, response = self._send(client, name, method, path, data)
+
+        if name in self.LOGS_OUT:
+            client.force_login(context['user'])
+        return elapsed, response.status_code
+
+    def _send(self, client, name, method, path, data):
+        start = time.perf_counter()
+        if method == 'POST' and name in self.JSON_ROUTES:
+            response = client.post(path, json.dumps(data), content_type='application/json')
+        elif method == 'POST':
+            response = client.post(path, data or {})
+        else:
+            response = client.get(path, data or {})
+        return time.perf_counter() - start, response
+
+    ### Route discovery and sample data ###
+
+    def _discover_routes(self, selected):
+        """
+        Collects every named URL pattern of the benchmarked URLconfs.
+
+        Returns:
+            list of tuple: (url_name, list of path parameter names) for each route.
+        """
+        routes = []
+        seen = set()
+
+        def collect(patterns):
+            for pattern in patterns:
+                if isinstance(pattern, URLResolver):
+                    collect(pattern.url_patterns)
+                elif isinstance(pattern, URLPattern) and pattern.name and pattern.name not in seen:
+                    if selected and pattern.name not in selected:
+                        continue
+                    seen.add(pattern.name)
+                    routes.append((pattern.name, list(getattr(pattern.pattern, 'converters', {}))))
+
+        for urlconf in self.URLCONFS:
+            collect(import_module(urlconf).urlpatterns)
+        return routes
+
+    def _sample_context(self, username):
+        """
+        Picks existing rows to fill in path parameters and POST data, creating the benchmark user if needed.
+
+        Returns:
+            dict: The benchmark user, path parameter values and sample IDs used by the POST builders.
+        """
+        user = CustomizedUser.objects.filter(username=username).first()
+        if user is None:
+            user = CustomizedUser.objects.create_superuser(
+                username, f"{username}@example.com", "Bench", "Mark", password=None,
+                activation_token=f"{username}-activation",
+            )
+
+        # Sample rows from the project the benchmark user's requests are scoped to
+        project = Project.objects.filter(members=user).order_by('id').first() or Project.get_default()
+        with project_scope(project.id):
+            sprint = Sprint.objects.filter(is_completed=False).order_by('-start_date').first() \
+                or Sprint.objects.order_by('-start_date').first()
+            if sprint is None:
+                raise CommandError("No sprints found. Run `manage.py generate_data` first.")
+
+            task_id = Task.objects.filter(sprints=sprint).values_list('id', flat=True).first() \
+                or Task.objects.values_list('id', flat=True).first()
+            if task_id is None:
+                raise CommandError("No tasks found. Run `manage.py generate_data` first.")
+
+            working_date = WorkingHour.objects.order_by('-date').values_list('date', flat=True).first()
+            sprint_ids = list(Sprint.objects.order_by('-start_date').values_list('id', flat=True)[:10])
+            sprint_task_versions = list(Task.objects.filter(sprints=sprint).values_list('id', 'version')[:20])
+            backlog_task_ids = list(Task.objects.filter(sprints=None).values_list('id', flat=True)[:5])
+
+        return {
+            'user': user,
+            'project_id': project.pk,
+            'sprint_id': sprint.pk,
+            'sprint_ids': sprint_ids,
+            'sprint_task_versions': sprint_task_versions,
+            'backlog_task_ids': backlog_task_ids,
+            'working_date': working_date.isoformat() if working_date else '',
+            'kwargs': {
+                'task_id': task_id,
+                'sprint_id': sprint.pk,
+                'activation_token': user.activation_token,
+                'uidb64': urlsafe_base64_encode(force_bytes(user.pk)),
+                'token': default_token_generator.make_token(user),
+                'profile_name': '00000000-000000-000000_benchmark.prof',
+                'form_name': 'edit_task',
+            },
+        }
+
+    ### Reporting ###
+
+    @staticmethod
+    def _percentile(sorted_values, percentile):
+        """
+        Returns the nearest-rank percentile of an already sorted list.
+        """
+        rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    def _print_report(self, results, baseline):
+        header = f"{'route':<36}{'method':<8}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'peak KB':>10}"
+        if baseline:
+            header += f"{'p95 delta':>12}{'query delta':>13}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for name, result in results.items():
+            line = (f"{name:<36}{result['method']:<8}{result['status']:>7}{result['p50_ms']:>10.2f}"
+                    f"{result['p95_ms']:>10.2f}{result['queries']:>9}{result['peak_memory_kb']:>10.1f}")
+            previous = baseline.get(name) if baseline else None
+            if previous:
+                p95_delta = (result['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100 \
+                    if previous['p95_ms'] else 0.0
+                line += f"{p95_delta:>+11.1f}%{result['queries'] - previous['queries']:>+13}"
+            self.stdout.write(line)
@@ -0,0 +1,418 @@
+import bisect
+import random
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from project_task import caching, dependencies, modal_forms
+from project_task.events import EXISTS, SPRINT
+from project_task.models import Project, Tag, Task, TaskDependency, Sprint, TaskEvent
+from project_task.reports import SprintReports
+from register.models import CustomizedUser, WorkingHour
+
+
+class Command(BaseCommand):
+    """
+    Management command that bulk-generates realistic synthetic data.
+
+    Users, tags, sprints, tasks (with their tag and sprint relations, and the events that led to their current state)
+    and working hours are created with bulk
+    inserts in fixed-size batches, so millions of WorkingHour rows can be generated without holding them all in
+    memory. Every value is drawn from a seeded random generator, so the same seed and anchor date always produce
+    the same data.
+    """
+
+    help = "Bulk-generate synthetic users, tags, sprints, tasks and working hours for benchmarking."
+
+    # Story points follow a Fibonacci-like scale, weighted towards the smaller estimates
+    STORY_POINTS = [1, 2, 3, 5, 8, 10]
+    STORY_POINT_WEIGHTS = [20, 25, 25, 15, 10, 5]
+
+    # Working hours are logged in quarter-hour slots between 15 minutes and a full 8 hour day
+    MAX_QUARTERS_PER_ENTRY = 32
+
+    # Dependencies created when --dependencies isn't given, or fewer if the tasks don't allow as many
+    DEFAULT_DEPENDENCIES = 2000
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help="Number of users to create.")
+        parser.add_argument('--tags', type=int, default=30, help="Number of tags to create.")
+        parser.add_argument('--sprints', type=int, default=20, help="Number of sprints to create.")
+        parser.add_argument('--tasks', type=int, default=5000, help="Number of tasks to create.")
+        parser.add_argument('--working-hours', type=int, default=100000,
+                            help="Number of WorkingHour rows to create.")
+        parser.add_argument('--dependencies', type=int, default=None,
+                            help="Number of task dependencies to create, between tasks of the same sprint or of the "
+                                 f"backlog. Defaults to {self.DEFAULT_DEPENDENCIES}, or as many as the tasks allow.")
+        parser.add_argument('--sprint-length', type=int, default=14, help="Length of each sprint in days.")
+        parser.add_argument('--seed', type=int, default=2101, help="Seed for the random generator.")
+        parser.add_argument('--anchor-date', type=date.fromisoformat, default=None,
+                            help="Date (YYYY-MM-DD) the last sprint ends on. Defaults to a week from today.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per bulk insert.")
+        parser.add_argument('--prefix', default='gen', help="Prefix for generated user, tag and sprint names.")
+        parser.add_argument('--project', default=None,
+                            help="Name of the project to generate into, created if needed. Defaults to the default "
+                                 "project.")
+        parser.add_argument('--password', default='benchmark-password',
+                            help="Password set on every generated user.")
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['sprints'], options['tags']) < 1:
+            raise CommandError("At least one user, one tag and one sprint are required.")
+        # Checked again once the tasks are split between the sprints and the backlog, within the transaction
+        if options['dependencies'] is not None and \
+                options['dependencies'] > options['tasks'] * (options['tasks'] - 1) // 2:
+            raise CommandError("Too many dependencies for the number of tasks.")
+
+        self.rng = random.Random(options['seed'])
+        # Dependencies are drawn from their own generator, so the same seed produces the same tasks and working hours
+        # whatever the number of dependencies
+        self.dependency_rng = random.Random(f"{options['seed']}-dependencies")
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+
+        anchor = options['anchor_date'] or date.today() + timedelta(days=7)
+
+        with transaction.atomic():
+            project = Project.objects.get_or_create(name=options['project'])[0] if options['project'] \
+                else Project.get_default()
+            # Bulk inserts bypass save, so every generated row is put in the project explicitly
+            self.project_id = project.id
+            user_ids = self._create_users(options['users'], options['password'])
+            project.members.add(*user_ids)
+            tag_ids = self._create_tags(options['tags'])
+            sprints = self._create_sprints(options['sprints'], options['sprint_length'], anchor)
+            tasks = self._create_tasks(options['tasks'], user_ids, tag_ids, sprints)
+            dependency_count = self._create_dependencies(options['dependencies'], tasks)
+        self._create_working_hours(options['working_hours'], user_ids, tasks, sprints)
+        # The sprints are archived by the bulk insert, so their reports are frozen once their hours are logged
+        archived_ids = [sprint_id for sprint_id, _, _, is_completed in sprints if is_completed]
+        for start in range(0, len(archived_ids), self.batch_size):
+            SprintReports.freeze(archived_ids[start:start + self.batch_size])
+        # Bulk inserts send no signals, so the lists cached by a shared cache backend are invalidated here
+        caching.invalidate(caching.TAGS, caching.SPRINTS, caching.USERS, modal_forms.CACHE_NAMESPACE,
+                           dependencies.CACHE_NAMESPACE)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(user_ids)} users, {len(tag_ids)} tags, {len(sprints)} sprints, {len(tasks)} tasks, "
+            f"{dependency_count} dependencies and {options['working_hours']} working hours in project "
+            f"'{project}' (seed {options['seed']})."
+        ))
+
+    ### Generators ###
+
+    def _create_users(self, count, password):
+        """
+        Creates the users, hashing the password once and reusing the hash for every user.
+
+        Returns:
+            list of int: IDs of the created users.
+        """
+        password_hash = make_password(password)
+        first_id = self._next_id(CustomizedUser)
+        users = (
+            CustomizedUser(
+                username=f"{self.prefix}_user{first_id + i}",
+                email=f"{self.prefix}_user{first_id + i}@example.com",
+                first_name=f"First{i}",
+                last_name=f"Last{i}",
+                password=password_hash,
+                is_email_confirmed=True,
+                # The model default is evaluated once at import time, so every row needs its own token
+                activation_token=f"{self.prefix}-{first_id + i}-{self.rng.getrandbits(64):016x}",
+            )
+            for i in range(count)
+        )
+        self._bulk_insert(CustomizedUser, users)
+        return list(CustomizedUser.objects.filter(id__gte=first_id).order_by('id').values_list('id', flat=True))
+
+    def _create_tags(self, count):
+        """
+        Creates the tags.
+
+        Returns:
+            list of int: IDs of the created tags.
+        """
+        first_id = self._next_id(Tag)
+        tags = (Tag(name=f"{self.prefix}-tag-{first_id + i}", project_id=self.project_id) for i in range(count))
+        self._bulk_insert(Tag, tags)
+        return list(Tag.objects.filter(id__gte=first_id).order_by('id').values_list('id', flat=True))
+
+    def _create_sprints(self, count, sprint_length, anchor):
+        """
+        Creates consecutive sprints ending on the anchor date.
+        Every sprint except the last one is already completed.
+
+        Returns:
+            list of tuple: (id, start_date, end_date, is_completed) for each created sprint, oldest first.
+        """
+        first_id = self._next_id(Sprint)
+        first_start = anchor - timedelta(days=count * sprint_length - 1)
+        sprints = []
+        for i in range(count):
+            start_date = first_start + timedelta(days=i * sprint_length)
+            sprints.append(Sprint(
+                name=f"{self.prefix} sprint {first_id + i}",
+                start_date=start_date,
+                end_date=start_date + timedelta(days=sprint_length - 1),
+                is_completed=i < count - 1,
+                project_id=self.project_id,
+            ))
+        self._bulk_insert(Sprint, sprints)
+        return list(
+            Sprint.objects.filter(id__gte=first_id).order_by('id')
+            .values_list('id', 'start_date', 'end_date', 'is_completed')
+        )
+
+    def _create_tasks(self, count, user_ids, tag_ids, sprints):
+        """
+        Creates the tasks along with their tag and sprint relations and their event history.
+
+        Roughly a fifth of the tasks stay in the product backlog. Tasks in archived sprints are mostly completed,
+        tasks in the active sprint are spread across every status.
+
+        Returns:
+            list of tuple: (task_id, sprint_index) for each created task, with None as the index of backlog tasks.
+        """
+        rng = self.rng
+        first_id = self._next_id(Task)
+        priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+        stages = [choice for choice, _ in Task.STAGE_CHOICES]
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+
+        plan = []
+        task_objects = []
+        for i in range(count):
+            sprint_index = rng.randrange(len(sprints)) if rng.random() < 0.8 else None
+            if sprint_index is None:
+                status = Task.NOT_STARTED
+                created_date = sprints[-1][1] - timedelta(days=rng.randrange(60))
+                completed_date = None
+            else:
+                _, start_date, end_date, is_completed = sprints[sprint_index]
+                status = (Task.COMPLETED if rng.random() < 0.85 else rng.choice(statuses[:2])) if is_completed \
+                    else rng.choice(statuses)
+                created_date = start_date - timedelta(days=rng.randrange(14))
+                completed_date = start_date + timedelta(days=rng.randrange((end_date - start_date).days + 1)) \
+                    if status == Task.COMPLETED else None
+
+            plan.append(sprint_index)
+            task_objects.append(Task(
+                name=f"{self.prefix} task {first_id + i}",
+                description=f"Synthetic task {first_id + i}",
+                type=Task.BUG if rng.random() < 0.2 else Task.STORY,
+                priority=rng.choice(priorities),
+                stage=rng.choice(stages),
+                story_point=rng.choices(self.STORY_POINTS, self.STORY_POINT_WEIGHTS)[0],
+                assignee_id=rng.choice(user_ids) if rng.random() < 0.9 else None,
+                created_date=created_date,
+                status=status,
+                completed_date=completed_date,
+                project_id=self.project_id,
+            ))
+        self._bulk_insert(Task, task_objects)
+        task_ids = list(Task.objects.filter(id__gte=first_id).order_by('id').values_list('id', flat=True))
+
+        # Attach one to three tags to every task and put planned tasks into their sprint
+        task_tags = (
+            Task.tags.through(task_id=task_id, tag_id=tag_id)
+            for task_id in task_ids
+            for tag_id in rng.sample(tag_ids, min(len(tag_ids), rng.randint(1, 3)))
+        )
+        self._bulk_insert(Task.tags.through, task_tags)
+        task_sprints = (
+            Task.sprints.through(task_id=task_id, sprint_id=sprints[sprint_index][0])
+            for task_id, sprint_index in zip(task_ids, plan)
+            if sprint_index is not None
+        )
+        self._bulk_insert(Task.sprints.through, task_sprints)
+        self._bulk_insert(TaskEvent, self._task_events(task_ids, task_objects, plan, sprints))
+
+        return list(zip(task_ids, plan))
+
+    def _task_events(self, task_ids, task_objects, plan, sprints):
+        """
+        Generates the events of each task: its creation, its move into its sprint and its progress to its current
+        status, each timestamped during the working day.
+        """
+        rng = self.rng
+
+        def at(day):
+            return timezone.make_aware(datetime.combine(day, time(9)) + timedelta(minutes=rng.randrange(8 * 60)))
+
+        for task_id, task, sprint_index in zip(task_ids, task_objects, plan):
+            yield TaskEvent(task_id=task_id, field=EXISTS, new_value='1', timestamp=at(task.created_date))
+            if sprint_index is None:
+                continue
+
+            sprint_id, start_date, end_date, _ = sprints[sprint_index]
+            yield TaskEvent(task_id=task_id, field=SPRINT, new_value=str(sprint_id), sprint_id=sprint_id,
+                            timestamp=at(start_date))
+            if task.status == Task.NOT_STARTED:
+                continue
+
+            last_day = task.completed_date or end_date
+            started = start_date + timedelta(days=rng.randrange((last_day - start_date).days + 1))
+            yield TaskEvent(task_id=task_id, field='status', old_value=Task.NOT_STARTED,
+                            new_value=Task.IN_PROGRESS, timestamp=at(started))
+            if task.status == Task.COMPLETED:
+                completed_at = max(at(task.completed_date), at(started) + timedelta(minutes=1))
+                yield TaskEvent(task_id=task_id, field='status', old_value=Task.IN_PROGRESS,
+                                new_value=Task.COMPLETED, timestamp=completed_at)
+                yield TaskEvent(task_id=task_id, field='completed_date', new_value=task.completed_date.isoformat(),
+                                timestamp=completed_at)
+
+    def _create_working_hours(self, count, user_ids, tasks, sprints):
+        """
+        Creates working hours logged against planned tasks, dated within the task's sprint.
+        Rows are generated lazily and committed batch by batch; only the keys of generated rows are kept.
+        """
+        planned = [(task_id, sprint_index) for task_id, sprint_index in tasks if sprint_index is not None]
+        if not planned or not count:
+            return
+
+        rng = self.rng
+        sprint_days = [(start_date, (end_date - start_date).days + 1) for _, start_date, end_date, _ in sprints]
+
+        # A person logs at most one entry per task per day, so every drawn key must be unique
+        max_days = max(days for _, days in sprint_days)
+        if count > len(planned) * len(user_ids) * max_days // 2:
+            raise CommandError("Too many working hours for the number of tasks, users and sprint days.")
+
+        def rows():
+            seen = set()
+            while len(seen) < count:
+                task_id, sprint_index = rng.choice(planned)
+                start_date, days = sprint_days[sprint_index]
+                person_index = rng.randrange(len(user_ids))
+                day = rng.randrange(days)
+                key = (task_id * len(user_ids) + person_index) * max_days + day
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield WorkingHour(
+                    task_id=task_id,
+                    person_id=user_ids[person_index],
+                    date=start_date + timedelta(days=day),
+                    hour=timedelta(minutes=15 * rng.randint(1, self.MAX_QUARTERS_PER_ENTRY)),
+                    project_id=self.project_id,
+                )
+
+        self._bulk_insert(WorkingHour, rows(), atomic_batches=True, progress=True)
+
+    def _create_dependencies(self, count, tasks):
+        """
+        Creates dependencies between the tasks of each sprint and between the backlog tasks. A task only ever depends
+        on a task created before it, so the dependencies never form a cycle.
+
+        Each dependency is drawn from the pairs that are still free, so drawing stays as fast when nearly every pair
+        is taken.
+
+        Parameters:
+            count (int or None): The number of dependencies, or None for DEFAULT_DEPENDENCIES within what the tasks
+                allow.
+            tasks (list of tuple): (task_id, sprint_index) for each task, as returned by `_create_tasks`.
+
+        Returns:
+            int: The number of created dependencies.
+        """
+        groups = defaultdict(list)
+        for task_id, sprint_index in tasks:
+            groups[sprint_index].append(task_id)
+        groups = list(groups.values())
+        pairs = sum(len(task_ids) * (len(task_ids) - 1) // 2 for task_ids in groups)
+        if count is None:
+            count = min(self.DEFAULT_DEPENDENCIES, pairs)
+        elif count > pairs:
+            raise CommandError(f"Too many dependencies for the number of tasks: at most {pairs} are possible.")
+
+        rng = self.dependency_rng
+
+        def rows():
+            # The tasks that can still be blocked by another task, and the blockers drawn for each, sorted by index
+            open_tasks = [(group, index) for group, task_ids in enumerate(groups) for index in range(1, len(task_ids))]
+            blockers = defaultdict(list)
+            for _ in range(count):
+                position = rng.randrange(len(open_tasks))
+                group, index = open_tasks[position]
+                drawn = blockers[group, index]
+                # Mostly on one of the few tasks created just before, giving chains rather than a flat fan-in
+                distance = min(1 + int(rng.expovariate(0.5)), index - len(drawn))
+                blocker_index = self._free_blocker(drawn, index, distance)
+                bisect.insort(drawn, blocker_index)
+                if len(drawn) == index:
+                    open_tasks[position] = open_tasks[-1]
+                    open_tasks.pop()
+                yield TaskDependency(task_id=groups[group][index], blocked_by_id=groups[group][blocker_index],
+                                     project_id=self.project_id)
+
+        self._bulk_insert(TaskDependency, rows())
+        return count
+
+    ### Utilities Methods ###
+
+    def _bulk_insert(self, model, objects, atomic_batches=False, progress=False):
+        """
+        Inserts the objects in batches of `batch_size`, consuming the iterable lazily.
+
+        Parameters:
+            model (Model): The model class the objects belong to.
+            objects (iterable): The unsaved model instances.
+            atomic_batches (bool): Whether to commit each batch in its own transaction.
+            progress (bool): Whether to report the running total after each batch.
+        """
+        inserted = 0
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                inserted += self._insert_batch(model, batch, atomic_batches)
+                batch = []
+                if progress:
+                    self.stdout.write(f"  {model._meta.verbose_name_plural}: {inserted}")
+        if batch:
+            inserted += self._insert_batch(model, batch, atomic_batches)
+        return inserted
+
+    @staticmethod
+    def _insert_batch(model, batch, atomic):
+        if atomic:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+        else:
+            model.objects.bulk_create(batch)
+        return len(batch)
+
+    @staticmethod
+    def _free_blocker(drawn, index, distance):
+        """
+        Returns the index of the `distance`-th task before the task at `index` that doesn't block it yet, counting
+        back from the task just before it.
+
+        Parameters:
+            drawn (list of int): The sorted indexes of the tasks already blocking the task.
+            index (int): The index of the task.
+            distance (int): The position of the blocker among the free ones, at most their number.
+        """
+        # The number of free blockers from a position up to the task only grows as the position moves back, so the
+        # closest position with `distance` of them is found by bisection
+        low, high = 0, index - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if (index - middle) - (len(drawn) - bisect.bisect_left(drawn, middle)) >= distance:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    @staticmethod
+    def _next_id(model):
+        """
+        Returns the ID the next inserted row is expected to receive, used to read back bulk inserted rows.
+        """
+        last = model.objects.order_by('-id').values_list('id', flat=True).first()
+        return (last or 0) + 1
@@ -0,0 +1,330 @@
+import http.client
+import json
+import logging
+import math
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from socketserver import ThreadingMixIn
+from urllib.parse import urlencode
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import got_request_exception
+from django.db import OperationalError, connection
+from django.middleware.csrf import CSRF_ALLOWED_CHARS
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+from project_task.models import Project, Sprint, Task
+from project_task.scoping import project_scope
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """
+    WSGI server handling every request in its own thread, like a multi-threaded production server would.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """
+    Request handler that doesn't log every request to stderr.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    """
+    Management command that load tests the sprint board with concurrent simulated users.
+
+    The project is served by a multi-threaded WSGI server started in this process on a local port, so the test runs
+    offline against whatever database is configured, normally one filled by `generate_data`. Every simulated user is
+    a thread with its own logged in session, repeatedly opening the sprint board, loading a task's details, editing
+    the task and moving a backlog task into the sprint, as a user working on the board does. The users are run at
+    increasing concurrency levels, and for each level the throughput, latency percentiles, errors and "database is
+    locked" errors are reported, showing the concurrency at which locking starts to limit throughput.
+
+    The simulated users share the process, and its interpreter lock, with the server, so the latencies are
+    pessimistic in absolute terms and are meant to be compared between concurrency levels and between runs. The edits
+    and moves are committed, so the test changes the tasks of the sprint it runs against.
+    """
+
+    help = "Load test the sprint board with concurrent users against a locally started server."
+
+    # The requests of one round of a simulated user, in order
+    ACTIONS = ('sprint_boards', 'get_task_data', 'edit_tasks', 'move_selected_tasks_to_sprint')
+
+    STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 2, 4, 8, 16],
+                            help="Numbers of simultaneous users to run, one level after the other.")
+        parser.add_argument('--duration', type=float, default=10, help="Seconds each concurrency level runs for.")
+        parser.add_argument('--think-time', type=float, default=0,
+                            help="Seconds a user waits between requests.")
+        parser.add_argument('--sprint', type=int, default=None,
+                            help="Sprint to work on. Defaults to the latest active sprint of the project.")
+        parser.add_argument('--project', default=None,
+                            help="Name of the project whose members are simulated. Defaults to the default project.")
+        parser.add_argument('--seed', type=int, default=2101, help="Seed for the users' random choices.")
+        parser.add_argument('--output', default=None, help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        levels = options['concurrency']
+        if min(levels) < 1:
+            raise CommandError("Concurrency levels must be at least 1.")
+        if options['duration'] <= 0:
+            raise CommandError("The duration must be positive.")
+
+        context = self._sample_context(options['project'], options['sprint'], max(levels))
+        rng = random.Random(options['seed'])
+
+        # Server errors are reported as status codes, so keep their tracebacks out of the report
+        request_logger = logging.getLogger('django.request')
+        request_logger.disabled = True
+        lock_errors = _LockErrorCounter()
+        got_request_exception.connect(lock_errors.receive, dispatch_uid='load_test_board.lock_errors')
+
+        server = make_server('127.0.0.1', 0, WSGIHandler(), server_class=_ThreadingWSGIServer,
+                             handler_class=_QuietRequestHandler)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        results = {}
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, '127.0.0.1']):
+                server_thread.start()
+                address = server.server_address
+                self.stdout.write(f"Serving on http://{address[0]}:{address[1]}/, sprint {context['sprint_id']}, "
+                                  f"{options['duration']:g}s per level")
+                for level in levels:
+                    users = [_SimulatedUser(address, session, context, random.Random(rng.getrandbits(64)),
+                                            options['think_time'])
+                             for session in context['sessions'][:level]]
+                    results[level] = self._run_level(users, options['duration'], lock_errors)
+                    self._print_level(level, results[level])
+        finally:
+            server.shutdown()
+            server.server_close()
+            got_request_exception.disconnect(dispatch_uid='load_test_board.lock_errors')
+            request_logger.disabled = False
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump({
+                    'meta': {'sprint_id': context['sprint_id'], 'duration_s': options['duration'],
+                             'think_time_s': options['think_time'], 'database': connection.vendor},
+                    'levels': results,
+                }, output_file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+    ### Load generation ###
+
+    def _run_level(self, users, duration, lock_errors):
+        """
+        Runs the users simultaneously for the given duration.
+
+        Returns:
+            dict: The throughput, latency percentiles and error counts of the level, overall and by action.
+        """
+        lock_errors.reset()
+        deadline = time.monotonic() + duration
+        threads = [threading.Thread(target=user.run, args=(deadline,)) for user in users]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        samples = [sample for user in users for sample in user.samples]
+        by_action = defaultdict(list)
+        for sample in samples:
+            by_action[sample[0]].append(sample)
+        return {
+            **self._summarize(samples, elapsed),
+            'lock_errors': lock_errors.count,
+            'actions': {action: self._summarize(by_action[action], elapsed) for action in self.ACTIONS},
+        }
+
+    def _summarize(self, samples, elapsed):
+        timings = sorted(duration for _, duration, _ in samples)
+        return {
+            'requests': len(samples),
+            'throughput_rps': round(len(samples) / elapsed, 2),
+            'p50_ms': round(self._percentile(timings, 50) * 1000, 2),
+            'p95_ms': round(self._percentile(timings, 95) * 1000, 2),
+            'p99_ms': round(self._percentile(timings, 99) * 1000, 2),
+            'errors': sum(1 for _, _, status in samples if status is None or status >= 400),
+        }
+
+    ### Sample data ###
+
+    def _sample_context(self, project_name, sprint_id, sessions):
+        """
+        Picks the sprint, tasks and users of the test and logs in a session for each simulated user.
+
+        Returns:
+            dict: The sprint ID, the IDs of its tasks and of the backlog tasks, the session cookies of the users and
+            their user IDs.
+        """
+        project = Project.objects.filter(name=project_name).first() if project_name else Project.get_default()
+        if project is None:
+            raise CommandError(f"Project '{project_name}' not found.")
+        members = list(project.members.filter(is_active=True).order_by('id'))
+        if not members:
+            raise CommandError("The project has no members. Run `manage.py generate_data` first.")
+
+        with project_scope(project.id):
+            sprints = Sprint.objects.filter(id=sprint_id) if sprint_id else \
+                Sprint.objects.filter(is_completed=False).order_by('-start_date')
+            sprint = sprints.first()
+            if sprint is None:
+                raise CommandError("No sprint found. Run `manage.py generate_data` first.")
+            task_ids = list(Task.objects.filter(sprints=sprint).values_list('id', flat=True))
+            backlog_task_ids = list(Task.objects.filter(sprints=None).values_list('id', flat=True)[:1000])
+        if not task_ids:
+            raise CommandError(f"Sprint {sprint.id} has no tasks.")
+
+        # Every simulated user gets a session of its own, members being reused when there are more users than members
+        cookies = []
+        for index in range(sessions):
+            user = members[index % len(members)]
+            client = Client()
+            client.force_login(user)
+            session_cookie = client.cookies[settings.SESSION_COOKIE_NAME].value
+            csrf_token = get_random_string(32, CSRF_ALLOWED_CHARS)
+            cookies.append({
+                'user_id': user.pk,
+                'csrf_token': csrf_token,
+                'cookie': f"{settings.SESSION_COOKIE_NAME}={session_cookie}; "
+                          f"{settings.CSRF_COOKIE_NAME}={csrf_token}",
+            })
+
+        return {
+            'sprint_id': sprint.id,
+            'task_ids': task_ids,
+            'backlog_task_ids': backlog_task_ids,
+            'sessions': cookies,
+        }
+
+    ### Reporting ###
+
+    @staticmethod
+    def _percentile(sorted_values, percentile):
+        """
+        Returns the nearest-rank percentile of an already sorted list.
+        """
+        if not sorted_values:
+            return 0.0
+        rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    def _print_level(self, level, result):
+        if not hasattr(self, '_printed_header'):
+            self._printed_header = True
+            header = (f"{'users':>6}{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+                      f"{'errors':>8}{'locked':>8}")
+            self.stdout.write(header)
+            self.stdout.write('-' * len(header))
+        self.stdout.write(
+            f"{level:>6}{result['requests']:>10}{result['throughput_rps']:>9.1f}{result['p50_ms']:>9.1f}"
+            f"{result['p95_ms']:>9.1f}{result['p99_ms']:>9.1f}{result['errors']:>8}{result['lock_errors']:>8}"
+        )
+
+
+class _SimulatedUser:
+    """
+    A user working on the sprint board, sending the board's requests one after the other over HTTP.
+
+    Attributes:
+        samples (list of tuple): (action, seconds, status code or None on a connection error) of every request.
+    """
+
+    def __init__(self, address, session, context, rng, think_time):
+        self.address = address
+        self.session = session
+        self.context = context
+        self.rng = rng
+        self.think_time = think_time
+        self.samples = []
+
+    def run(self, deadline):
+        """
+        Repeats rounds of the board's requests until the deadline, finishing the request in progress.
+        """
+        sprint_id = self.context['sprint_id']
+        while True:
+            task_id = self.rng.choice(self.context['task_ids'])
+            requests = (
+                ('sprint_boards', 'GET', reverse('sprint_boards', kwargs={'sprint_id': sprint_id}), None),
+                ('get_task_data', 'GET', reverse('get_task_data', kwargs={'task_id': task_id}), None),
+                ('edit_tasks', 'POST', reverse('edit_tasks', kwargs={'task_id': task_id}), {
+                    'assignee': self.session['user_id'], 'status': self.rng.choice(Command.STATUSES),
+                }),
+            )
+            if self.context['backlog_task_ids']:
+                requests += (('move_selected_tasks_to_sprint', 'POST', reverse('move_selected_tasks_to_sprint'), {
+                    'selected_tasks': self.rng.choice(self.context['backlog_task_ids']), 'sprint_id': sprint_id,
+                }),)
+            for action, method, path, data in requests:
+                if time.monotonic() >= deadline:
+                    return
+                self.samples.append((action, *self._request(method, path, data)))
+                if self.think_time:
+                    time.sleep(self.think_time)
+
+    def _request(self, method, path, data):
+        """
+        Sends one request on a new connection and reads the whole response.
+
+        Returns:
+            tuple: The elapsed wall time in seconds and the response status code, or None if the request failed.
+        """
+        headers = {'Cookie': self.session['cookie']}
+        body = None
+        if method == 'POST':
+            body = urlencode(data)
+            headers.update({'Content-Type': 'application/x-www-form-urlencoded',
+                            'X-CSRFToken': self.session['csrf_token']})
+        connection = http.client.HTTPConnection(*self.address, timeout=60)
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            status = None
+        finally:
+            connection.close()
+        return time.perf_counter() - start, status
+
+
+class _LockErrorCounter:
+    """
+    Counts the requests that failed because the database was locked, as reported by `got_request_exception`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+
+    def receive(self, sender, **kwargs):
+        # The signal is sent while the exception is being handled
+        exception = sys.exc_info()[1]
+        if isinstance(exception, OperationalError) and 'locked' in str(exception):
+            with self._lock:
+                self.count += 1
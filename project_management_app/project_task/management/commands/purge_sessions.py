@@ -0,0 +1,54 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Management command that deletes expired database sessions.
+
+    Unlike `clearsessions`, which deletes every expired session with a single statement, the sessions are deleted in
+    small batches, each in its own short transaction with an optional pause after it, so the deletion never holds the
+    database long enough to block the requests writing tasks. The command stops once its time budget is spent and the
+    remaining sessions are left to its next run, e.g. from cron.
+    """
+
+    help = "Delete expired database sessions in batches, within a time budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Sessions deleted per statement.")
+        parser.add_argument('--max-seconds', type=float, default=60,
+                            help="Time budget after which no further batch is started.")
+        parser.add_argument('--pause', type=float, default=0.05, help="Seconds to wait between batches.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("The batch size must be at least 1.")
+        if settings.SESSION_ENGINE.endswith('signed_cookies'):
+            self.stdout.write("Sessions are stored in signed cookies, there is nothing to purge.")
+            return
+
+        deadline = time.monotonic() + options['max_seconds']
+        # Sessions expiring while the command runs are left to its next run, so that it always terminates
+        now = timezone.now()
+        deleted = 0
+        while True:
+            # Read through the expire_date index, so no batch scans the table
+            keys = list(Session.objects.filter(expire_date__lt=now).order_by('expire_date')
+                        .values_list('session_key', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+            deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+            self.stdout.write(f"  sessions: {deleted}")
+            if len(keys) < options['batch_size']:
+                break
+            if time.monotonic() + options['pause'] >= deadline:
+                self.stdout.write(self.style.WARNING("Time budget spent, the remaining sessions are left for the next "
+                                                     "run."))
+                break
+            time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired sessions."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from project_task.models import Sprint
+from project_task.reports import SprintReports
+
+
+class Command(BaseCommand):
+    """
+    Management command that builds the frozen reports of archived sprints.
+
+    By default only archived sprints without a report are frozen, which backfills sprints archived before reports
+    existed. With --replace the existing reports are rebuilt from the current data as well.
+    """
+
+    help = "Build the frozen reports of archived sprints."
+
+    def add_arguments(self, parser):
+        parser.add_argument('sprint_ids', nargs='*', type=int,
+                            help="Sprints to build. Defaults to every archived sprint.")
+        parser.add_argument('--replace', action='store_true', help="Rebuild reports that already exist.")
+        parser.add_argument('--batch-size', type=int, default=200, help="Sprints built per batch.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("The batch size must be at least 1.")
+
+        sprints = Sprint.objects.filter(is_completed=True)
+        if options['sprint_ids']:
+            sprints = sprints.filter(id__in=options['sprint_ids'])
+        if not options['replace']:
+            sprints = sprints.filter(report__isnull=True)
+        sprint_ids = list(sprints.order_by('id').values_list('id', flat=True))
+
+        built = 0
+        for start in range(0, len(sprint_ids), options['batch_size']):
+            built += len(SprintReports.freeze(sprint_ids[start:start + options['batch_size']],
+                                              replace=options['replace']))
+            self.stdout.write(f"  reports: {built}")
+
+        self.stdout.write(self.style.SUCCESS(f"Built {built} sprint reports."))
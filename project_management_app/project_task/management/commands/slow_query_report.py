@@ -0,0 +1,75 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from project_management_app.slow_queries import get_config
+
+
+class Command(BaseCommand):
+    """
+    Management command that summarizes the slow query log.
+
+    Reads the current log file and its rotated backups, groups the records by statement and prints the top offenders
+    by total time and by number of occurrences, with the views and call sites that issued them.
+    """
+
+    help = "Summarize the slow query log by total time and by count."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=None, help="Slow query log to read. Defaults to SLOW_QUERY_LOG['FILE'].")
+        parser.add_argument('--top', type=int, default=10, help="Number of statements to show in each ranking.")
+        parser.add_argument('--view', default=None, help="Only include queries issued by this view.")
+
+    def handle(self, *args, **options):
+        config = get_config()
+        log_file = Path(options['file'] or config['FILE'])
+        files = [log_file] + [Path(f"{log_file}.{index}") for index in range(1, config['BACKUP_COUNT'] + 1)]
+        files = [path for path in files if path.exists()]
+        if not files:
+            raise CommandError(f"No slow query log found at {log_file}")
+
+        statements = defaultdict(lambda: {
+            'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'views': defaultdict(int), 'call_sites': defaultdict(int),
+        })
+        for path in files:
+            with open(path) as log:
+                for line in log:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if options['view'] and record.get('view') != options['view']:
+                        continue
+                    stats = statements[record['sql']]
+                    stats['count'] += 1
+                    stats['total_ms'] += record['duration_ms']
+                    stats['max_ms'] = max(stats['max_ms'], record['duration_ms'])
+                    stats['views'][record.get('view') or '-'] += 1
+                    stats['call_sites'][record.get('call_site') or '-'] += 1
+
+        if not statements:
+            self.stdout.write("No slow queries recorded.")
+            return
+
+        self._print_ranking("Top statements by total time", statements, 'total_ms', options['top'])
+        self._print_ranking("Top statements by count", statements, 'count', options['top'])
+
+    def _print_ranking(self, title, statements, key, top):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        ranking = sorted(statements.items(), key=lambda item: item[1][key], reverse=True)[:top]
+        for rank, (sql, stats) in enumerate(ranking, start=1):
+            self.stdout.write(
+                f"{rank:>3}. {stats['count']} queries, {stats['total_ms']:.1f} ms total, "
+                f"{stats['total_ms'] / stats['count']:.1f} ms mean, {stats['max_ms']:.1f} ms max"
+            )
+            self.stdout.write(f"     SQL:   {sql[:300]}")
+            self.stdout.write(f"     Views: {self._most_common(stats['views'])}")
+            self.stdout.write(f"     Sites: {self._most_common(stats['call_sites'])}")
+        self.stdout.write('')
+
+    @staticmethod
+    def _most_common(counts, limit=3):
+        ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return ', '.join(f"{name} ({count})" for name, count in ranked)
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.4 on 2026-10-19 20:33
+
+import django.core.validators
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('start_date', models.DateField(default=django.utils.timezone.now)),
+                ('end_date', models.DateField(default=django.utils.timezone.now)),
+                ('is_completed', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.CharField(max_length=500)),
+                ('type', models.CharField(choices=[('STORY', 'STORY'), ('BUG', 'BUG')], default='STORY', max_length=5)),
+                ('priority', models.CharField(choices=[('LOW', 'LOW'), ('MED', 'MEDIUM'), ('IMP', 'IMPORTANT'), ('URG', 'URGENT')], max_length=3)),
+                ('stage', models.CharField(choices=[('PLA', 'PLANNING'), ('DEV', 'DEVELOPMENT'), ('TES', 'TESTING'), ('ITG', 'INTEGRATION')], max_length=3)),
+                ('story_point', models.PositiveIntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(10)])),
+                ('created_date', models.DateField(default=django.utils.timezone.now)),
+                ('status', models.CharField(choices=[('NOT', 'NOT STARTED'), ('IN_PROG', 'IN PROGRESS'), ('COM', 'COMPLETED')], default='NOT', max_length=7)),
+                ('backlog', models.BooleanField(default=False)),
+                ('completed_date', models.DateField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.4 on 2026-10-19 20:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('project_task', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SprintReport',
+            fields=[
+                ('sprint', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='report', serialize=False, to='project_task.sprint')),
+                ('series', models.JSONField()),
+                ('summary', models.JSONField()),
+                ('etag', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.CreateModel(
+            name='TaskEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=20)),
+                ('old_value', models.CharField(blank=True, max_length=200, null=True)),
+                ('new_value', models.CharField(blank=True, max_length=200, null=True)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('sprint', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='project_task.sprint')),
+                ('task', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='events', to='project_task.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task', 'timestamp'], name='task_event_task_time_idx'), models.Index(fields=['sprint', 'task'], name='task_event_sprint_idx'), models.Index(fields=['timestamp'], name='task_event_time_idx')],
+            },
+        ),
+    ]
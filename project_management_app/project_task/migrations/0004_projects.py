@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.text
+import project_task.models
+
+DEFAULT_PROJECT_NAME = 'Default'
+
+SCOPED_MODELS = ['sprint', 'tag', 'task']
+
+
+def assign_default_project(apps, schema_editor):
+    """
+    Creates the default project and points the existing tasks, sprints and tags at it.
+    """
+    Project = apps.get_model('project_task', 'Project')
+    alias = schema_editor.connection.alias
+    project, _ = Project.objects.using(alias).get_or_create(name=DEFAULT_PROJECT_NAME)
+    for model_name in SCOPED_MODELS:
+        apps.get_model('project_task', model_name).objects.using(alias).filter(project__isnull=True) \
+            .update(project=project)
+
+
+def project_field(null=False):
+    if null:
+        return models.ForeignKey(db_index=False, editable=False, null=True,
+                                 on_delete=django.db.models.deletion.CASCADE, to='project_task.project')
+    return models.ForeignKey(db_index=False, default=project_task.models.default_project_id, editable=False,
+                             on_delete=django.db.models.deletion.CASCADE, to='project_task.project')
+
+
+class Migration(migrations.Migration):
+    """
+    Scopes tasks, sprints and tags to projects.
+
+    The project is first added as a nullable column, the existing rows are pointed at the default project, and only
+    then is the column made required and indexed, so that databases from before projects are upgraded in place.
+    """
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('project_task', '0003_task_events_and_sprint_reports'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Project',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('members', models.ManyToManyField(blank=True, related_name='projects', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        *[migrations.AddField(model_name=model_name, name='project', field=project_field(null=True))
+          for model_name in SCOPED_MODELS],
+        migrations.RunPython(assign_default_project, migrations.RunPython.noop),
+        *[migrations.AlterField(model_name=model_name, name='project', field=project_field())
+          for model_name in SCOPED_MODELS],
+        # Tag names are unique within a project instead of globally
+        migrations.AlterField(
+            model_name='tag',
+            name='name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('project', 'name'), name='unique_tag_name_per_project'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(models.F('project'), django.db.models.functions.text.Lower('name'),
+                               name='tag_project_lower_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprint',
+            index=models.Index(fields=['project', 'is_completed', 'end_date'], name='sprint_project_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'completed_date'], name='task_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'created_date'], name='task_project_created_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import project_task.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_task', '0004_projects'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project', models.ForeignKey(db_index=False, default=project_task.models.default_project_id, editable=False, on_delete=django.db.models.deletion.CASCADE, to='project_task.project')),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='blocked_by_dependencies', to='project_task.task')),
+                ('blocked_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocking_dependencies', to='project_task.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'blocked_by', 'task'], name='task_dependency_project_idx')],
+                'constraints': [models.UniqueConstraint(fields=('task', 'blocked_by'), name='unique_task_dependency'), models.CheckConstraint(check=models.Q(('task', models.F('blocked_by')), _negated=True), name='task_dependency_not_self')],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+"""
+Forms of the project backlog's modals, rendered on demand.
+
+The backlog page only contains the modals' frames, and each modal fetches its form the first time it opens. The
+rendered forms hold no user or task data, so they are cached per project and day, the day being the initial created
+date of new tasks. The CSRF token is part of the page's frame, never of the cached forms.
+"""
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from . import caching
+from .forms import CreateNewSprintForm, CreateNewTaskForm, EditTaskForm
+from .scoping import get_current_project_id
+
+# Cache namespace of rendered forms, invalidated whenever the tags or users behind their choice fields change
+CACHE_NAMESPACE = 'modal-forms'
+
+
+class ModalForms:
+    """
+    Utility class for rendering the forms of the backlog's modals.
+    """
+
+    FORMS = {
+        'create_task': CreateNewTaskForm,
+        'edit_task': EditTaskForm,
+        'create_sprint': CreateNewSprintForm,
+    }
+
+    TEMPLATE = 'project_task/pb_modal_form.html'
+
+    CACHE_TIMEOUT = 60 * 60
+
+    @staticmethod
+    def render(name):
+        """
+        Returns the HTML of an empty form, from the cache when it was already rendered today for the current project.
+
+        Parameters:
+            name (str): The name of the form, one of `FORMS`.
+
+        Returns:
+            str or None: The rendered form, or None if there is no form with that name.
+        """
+        form_class = ModalForms.FORMS.get(name)
+        if form_class is None:
+            return None
+
+        return caching.get_or_compute(
+            CACHE_NAMESPACE, (get_current_project_id(), name, timezone.localdate().isoformat()),
+            lambda: render_to_string(ModalForms.TEMPLATE, {'form': form_class()}), ModalForms.CACHE_TIMEOUT,
+        )
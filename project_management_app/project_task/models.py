@@ -1,29 +1,120 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+from .scoping import ProjectScopedManager, get_current_project_id
 
-class Tag(models.Model):
+
+class Project(models.Model):
+    """
+    A model for a team's project. Tasks, sprints, tags and working hours each belong to a single project.
+    """
+    DEFAULT_NAME = 'Default'
+
+    name = models.CharField(max_length=200, unique=True)
+    members = models.ManyToManyField('register.CustomizedUser', blank=True, related_name='projects')
+
+    @classmethod
+    def get_default(cls):
+        """
+        Returns the default project, which is open to every user and holds the data created outside of a project.
+        It is created by the migration adding projects, see `project_task.signals.create_default_project`.
+        """
+        return cls.objects.get(name=cls.DEFAULT_NAME)
+
+    @classmethod
+    def available_to(cls, user):
+        """
+        Returns the projects a user can work in: every project for superusers, the user's projects and the default
+        project otherwise.
+        """
+        if user.is_superuser:
+            return cls.objects.all()
+        return cls.objects.filter(models.Q(members=user) | models.Q(name=cls.DEFAULT_NAME)).distinct()
+
+    def assignable_users(self):
+        """
+        Returns the active users the project's tasks can be assigned to: every active user in the default project, the
+        project's members otherwise.
+        """
+        users = self.members.model.objects.filter(is_active=True)
+        if self.name != self.DEFAULT_NAME:
+            users = users.filter(projects=self)
+        return users
+
+    def __str__(self):
+        return self.name
+
+
+def default_project_id():
+    """
+    Returns the ID of the project new rows of project-scoped models go to: the current project, or the default project
+    outside of a project scope.
+
+    Requests always run in a project scope, so only management commands and the shell read the default project here.
+    It is only ever read: the migration adding projects creates it, see `project_task.signals.create_default_project`.
+    """
+    return get_current_project_id() or Project.objects.values_list('id', flat=True).get(name=Project.DEFAULT_NAME)
+
+
+class ProjectScopedModel(models.Model):
+    """
+    Abstract model for the data of a project.
+
+    `objects` only returns the rows of the current project (see `project_task.scoping`), while `all_objects` returns
+    the rows of every project. A row created without a project is assigned to the current project, or to the default
+    project outside of a project scope.
+
+    The project is not indexed on its own, since the indexes of every scoped model lead with it.
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, default=default_project_id, editable=False,
+                                db_index=False)
+
+    objects = ProjectScopedManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        abstract = True
+
+
+class Tag(ProjectScopedModel):
     """
     A model for a tag that can be associated with a task.
     """
-    name = models.CharField(max_length=100, unique=True)  # Name of the tag (e.g., front-end, back-end, testing).
+    name = models.CharField(max_length=100)  # Name of the tag (e.g., front-end, back-end, testing).
+
+    class Meta:
+        constraints = [
+            # Tag names are unique within a project, which also indexes tag lookups by project and name
+            models.UniqueConstraint(fields=['project', 'name'], name='unique_tag_name_per_project'),
+        ]
+        indexes = [
+            # Case-insensitive prefix searches of the tag autocomplete
+            models.Index(F('project'), Lower('name'), name='tag_project_lower_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
-class Sprint(models.Model):
+class Sprint(ProjectScopedModel):
     name = models.CharField(max_length=255)
     start_date = models.DateField(default=timezone.now)
     end_date = models.DateField(default=timezone.now)
     is_completed = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'is_completed', 'end_date'], name='sprint_project_state_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
-class Task(models.Model):
+class Task(ProjectScopedModel):
     """
     A model for a task that consist of all the required and non required information.
     """
@@ -85,6 +176,24 @@ class Task(models.Model):
     sprints = models.ManyToManyField(Sprint, blank=True)
     backlog = models.BooleanField(default=False)
     completed_date = models.DateField(null=True, blank=True)
+    version = models.PositiveIntegerField(default=1, editable=False)  # Bumped on every save, for conflict detection
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'status', 'completed_date'], name='task_project_status_idx'),
+            models.Index(fields=['project', 'created_date'], name='task_project_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the task, bumping its version when an existing task is updated.
+        """
+        if not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'version'}
+        super().save(*args, **kwargs)
 
     def add_to_sprint(self, sprint):
         self.sprints.add(sprint)
@@ -92,3 +201,86 @@ class Task(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class TaskDependency(ProjectScopedModel):
+    """
+    A dependency between two tasks of a project: `task` is blocked by `blocked_by`, which has to be completed first.
+
+    Dependencies are added through `project_task.dependencies.TaskDependencies`, which refuses the ones that would
+    make a task block itself, directly or through other tasks.
+    """
+    # Indexed by the unique constraint, which leads with the task
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, db_index=False, related_name='blocked_by_dependencies')
+    blocked_by = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='blocking_dependencies')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'blocked_by'], name='unique_task_dependency'),
+            models.CheckConstraint(check=~models.Q(task=F('blocked_by')), name='task_dependency_not_self'),
+        ]
+        indexes = [
+            # Covers loading the dependency graph of a whole project
+            models.Index(fields=['project', 'blocked_by', 'task'], name='task_dependency_project_idx'),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id} blocked by task {self.blocked_by_id}"
+
+
+class TaskEvent(models.Model):
+    """
+    An append-only record of a single field transition of a task.
+
+    Values are stored as strings, with None standing for an empty value. Besides the task fields listed in
+    `project_task.events.TRACKED_FIELDS`, two pseudo fields are recorded: 'exists' changes from None to '1' when
+    a task is created and back when it is deleted, and 'sprint' changes from None to the sprint ID when the task is
+    added to `sprint` and back when it is removed. Events outlive the task they describe, so the task reference is
+    not enforced by the database.
+    """
+    task = models.ForeignKey(Task, on_delete=models.DO_NOTHING, db_constraint=False, related_name='events')
+    field = models.CharField(max_length=20)
+    old_value = models.CharField(max_length=200, null=True, blank=True)
+    new_value = models.CharField(max_length=200, null=True, blank=True)
+    sprint = models.ForeignKey(Sprint, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True,
+                               related_name='+')
+    actor = models.ForeignKey('register.CustomizedUser', on_delete=models.SET_NULL, null=True, blank=True,
+                              related_name='+')
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'timestamp'], name='task_event_task_time_idx'),
+            models.Index(fields=['sprint', 'task'], name='task_event_sprint_idx'),
+            models.Index(fields=['timestamp'], name='task_event_time_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Task events are append-only and cannot be changed.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"Task {self.task_id} {self.field}: {self.old_value} -> {self.new_value}"
+
+
+class SprintReport(models.Model):
+    """
+    The frozen report of an archived sprint: its chart series and summary metrics as they were when it was archived.
+
+    Reports are built once by `project_task.reports.SprintReports` and never change afterwards, so they can be served
+    with an ETag, the hash of the serialized report. Rebuilding a report replaces the row, and with it the ETag.
+    """
+    sprint = models.OneToOneField(Sprint, on_delete=models.CASCADE, primary_key=True, related_name='report')
+    series = models.JSONField()
+    summary = models.JSONField()
+    etag = models.CharField(max_length=64)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Sprint reports are immutable and cannot be changed.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"Report of sprint {self.sprint_id}"
@@ -0,0 +1,218 @@
+"""
+Capacity-aware sprint planning.
+
+`SprintPlanner` proposes the backlog tasks to add to a sprint within a capacity in story points, and optionally within
+the capacity of each assignee. The proposal maximizes the priority-weighted value of the tasks with a greedy knapsack:
+tasks are taken by value per story point as long as they fit, which is close to the optimum when tasks are small next
+to the capacity, and linear-logarithmic in the size of the backlog.
+
+Proposals respect the dependencies between tasks: a task is only proposed once every remaining task blocking it is
+planned, either in a sprint already or earlier in the proposal. A blocker inherits the value of the most valuable task
+it blocks, so that a low priority task holding up an urgent one is planned with it.
+"""
+import heapq
+from collections import defaultdict
+
+from django.db.models import Exists, OuterRef, Sum
+from django.db.models.functions import Coalesce
+
+from register.models import CustomizedUser
+from .models import Task, TaskDependency
+
+
+class SprintPlanner:
+    """
+    Utility class for proposing the tasks of a sprint.
+    """
+
+    # Value of a task by priority
+    PRIORITY_WEIGHTS = {Task.URGENT: 8, Task.IMPORTANT: 4, Task.MEDIUM: 2, Task.LOW: 1}
+
+    # Upper bound on the number of tasks in one proposal, as tasks of zero story points always fit
+    MAX_TASKS = 1000
+
+    @staticmethod
+    def propose(sprint, candidates, capacity, assignee_capacities=None):
+        """
+        Proposes the backlog tasks to add to a sprint.
+
+        The tasks already in the sprint use up the capacity first. Tasks without story points are never proposed,
+        and neither are the tasks blocked by remaining tasks that can't be planned, like tasks without story points
+        or tasks left out of the candidates.
+
+        Parameters:
+            sprint (Sprint): The sprint to plan.
+            candidates (QuerySet): The backlog tasks to choose from, e.g. from TaskManager.list_tasks.
+            capacity (int): The story points the sprint can hold.
+            assignee_capacities (dict, optional): The story points each assignee can take in the sprint, by user ID,
+                or True for the sprint capacity of each user. The tasks of other assignees and the unassigned tasks
+                are only limited by the sprint's capacity.
+
+        Returns:
+            dict: A dictionary containing:
+                - 'capacity' (int): The capacity of the sprint.
+                - 'planned_points' (int): The story points already in the sprint.
+                - 'proposed_points' (int): The story points of the proposed tasks.
+                - 'tasks' (list of dict): The ID, name, story points, priority and assignee of the proposed tasks, each
+                  after the tasks blocking it.
+                - 'assignees' (dict): The capacity and remaining points of each assignee with a capacity, by user ID.
+                - 'skipped' (dict): The number of candidates left out for having no story points ('unestimated') or
+                  for being blocked by tasks that can't be planned ('blocked').
+        """
+        # Story points already in the sprint, per assignee
+        planned = dict(
+            Task.sprints.through.objects.filter(sprint_id=sprint.id).values('task__assignee_id')
+            .annotate(points=Coalesce(Sum('task__story_point'), 0)).values_list('task__assignee_id', 'points')
+        )
+        remaining = capacity - sum(planned.values())
+
+        if assignee_capacities is True:
+            assignee_capacities = dict(CustomizedUser.objects.values_list('id', 'sprint_capacity'))
+        assignees = {
+            assignee_id: {'capacity': assignee_capacity,
+                          'remaining': assignee_capacity - planned.get(assignee_id, 0)}
+            for assignee_id, assignee_capacity in (assignee_capacities or {}).items()
+        }
+
+        nodes, unestimated = SprintPlanner._candidates(candidates)
+        blocks, blocker_counts, order, blocked = SprintPlanner._dependencies(candidates, nodes)
+        values = SprintPlanner._inherited_values(nodes, blocks, order, blocked)
+
+        def key(task_id):
+            # Most value per story point first, then the oldest task. Tasks of zero points count as half a point.
+            return -values[task_id] / (nodes[task_id][0] or 0.5), task_id
+
+        proposed = []
+        ready = [key(task_id) for task_id, count in blocker_counts.items() if count == 0 and task_id not in blocked]
+        heapq.heapify(ready)
+        while ready and len(proposed) < SprintPlanner.MAX_TASKS:
+            _, task_id = heapq.heappop(ready)
+            points, priority, assignee_id = nodes[task_id]
+            budget = assignees.get(assignee_id)
+            if points > remaining or (budget is not None and points > budget['remaining']):
+                # Left out along with the tasks it blocks
+                continue
+            remaining -= points
+            if budget is not None:
+                budget['remaining'] -= points
+            proposed.append({'id': task_id, 'story_point': points, 'priority': priority, 'assignee_id': assignee_id})
+            for blocked_id in blocks[task_id]:
+                blocker_counts[blocked_id] -= 1
+                if blocker_counts[blocked_id] == 0:
+                    heapq.heappush(ready, key(blocked_id))
+
+        # Only the proposed tasks' names are read, instead of the names of every candidate
+        names = dict(Task.objects.filter(id__in=[task['id'] for task in proposed]).values_list('id', 'name'))
+        for task in proposed:
+            task['name'] = names[task['id']]
+
+        return {
+            'capacity': capacity,
+            'planned_points': sum(planned.values()),
+            'proposed_points': sum(task['story_point'] for task in proposed),
+            'tasks': proposed,
+            'assignees': assignees,
+            'skipped': {
+                'unestimated': unestimated,
+                'blocked': len(blocked),
+            },
+        }
+
+    ### Utilities Methods ###
+
+    @staticmethod
+    def _candidates(candidates):
+        """
+        Utility method to read the candidates with one query.
+
+        Returns:
+            tuple: A tuple containing:
+                - dict: The story points, priority and assignee ID of each estimated candidate, by task ID.
+                - int: The number of candidates without story points.
+        """
+        nodes = {}
+        unestimated = 0
+        for task_id, story_point, priority, assignee_id in candidates.exclude(status=Task.COMPLETED).values_list(
+                'id', 'story_point', 'priority', 'assignee_id').iterator(chunk_size=10000):
+            if story_point is None:
+                unestimated += 1
+            else:
+                nodes[task_id] = (story_point, priority, assignee_id)
+        return nodes, unestimated
+
+    @staticmethod
+    def _dependencies(candidates, nodes):
+        """
+        Utility method to read the remaining blockers of the candidates with one query.
+
+        Blockers that are planned in a sprint already are satisfied. The candidates blocked by tasks that are neither
+        planned nor candidates can't be planned, and neither can the candidates they block, directly or not, nor the
+        candidates of cycles.
+
+        Returns:
+            tuple: A tuple containing:
+                - defaultdict: The candidates each candidate blocks, by task ID.
+                - dict: The number of candidates blocking each candidate, by task ID.
+                - list of int: The IDs of the candidates in topological order, without the candidates of cycles.
+                - set: The IDs of the candidates that can't be planned.
+        """
+        blocks = defaultdict(list)
+        blocker_counts = dict.fromkeys(nodes, 0)
+        blocked = set()
+        dependencies = TaskDependency.all_objects.filter(task__in=candidates.values('id')) \
+            .exclude(blocked_by__status=Task.COMPLETED) \
+            .annotate(planned=Exists(Task.sprints.through.objects.filter(task_id=OuterRef('blocked_by_id')))) \
+            .values_list('blocked_by_id', 'task_id', 'planned')
+        for blocker_id, blocked_id, planned in dependencies.iterator(chunk_size=10000):
+            if blocked_id not in nodes or planned:
+                continue
+            if blocker_id in nodes:
+                blocks[blocker_id].append(blocked_id)
+                blocker_counts[blocked_id] += 1
+            else:
+                blocked.add(blocked_id)
+
+        # Spread the blocked candidates to the candidates they block, in topological order
+        order = SprintPlanner._topological_order(blocks, blocker_counts)
+        for task_id in order:
+            if task_id in blocked:
+                blocked.update(blocks[task_id])
+        blocked.update(set(nodes) - set(order))
+        return blocks, blocker_counts, order, blocked
+
+    @staticmethod
+    def _topological_order(blocks, blocker_counts):
+        """
+        Utility method to order the candidates so that every candidate comes after the candidates blocking it, with
+        Kahn's algorithm.
+
+        Returns:
+            list of int: The ordered task IDs, without the candidates of cycles.
+        """
+        remaining = dict(blocker_counts)
+        order = [task_id for task_id, count in remaining.items() if count == 0]
+        for task_id in order:
+            for blocked_id in blocks[task_id]:
+                remaining[blocked_id] -= 1
+                if remaining[blocked_id] == 0:
+                    order.append(blocked_id)
+        return order
+
+    @staticmethod
+    def _inherited_values(nodes, blocks, order, blocked):
+        """
+        Utility method to compute the value of each candidate, the highest priority weight among the candidate and
+        the plannable candidates it blocks, directly or not.
+
+        Returns:
+            dict: The value of each candidate, by task ID.
+        """
+        weights = SprintPlanner.PRIORITY_WEIGHTS
+        values = {task_id: weights.get(node[1], 1) for task_id, node in nodes.items()}
+
+        # In reverse topological order, the candidates a candidate blocks have their final value before it
+        for task_id in reversed(order):
+            for blocked_id in blocks[task_id]:
+                if blocked_id not in blocked and values[blocked_id] > values[task_id]:
+                    values[task_id] = values[blocked_id]
+        return values
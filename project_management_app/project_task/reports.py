@@ -0,0 +1,137 @@
+"""
+Frozen reports of archived sprints.
+
+Once a sprint is archived its burndown and hours no longer change, so `SprintReports` computes them a single time,
+together with the sprint's summary metrics, and stores the result as a `SprintReport`. Reports are frozen by the code
+archiving sprints, and archived sprint views only read them: they serve the stored report instead of recomputing it,
+with an ETag, so clients revalidate their copy with a 304 response.
+"""
+import hashlib
+import json
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .charts import SprintCharts
+from .models import Sprint, SprintReport, Task
+
+
+class SprintReports:
+    """
+    Utility class for freezing and reading the reports of archived sprints.
+    """
+
+    @staticmethod
+    def freeze(sprint_ids, replace=False):
+        """
+        Builds and stores the reports of the given archived sprints.
+
+        Sprints that are not archived are skipped, and so are sprints that already have a report unless `replace` is
+        set, in which case their report is rebuilt from the current data.
+
+        Parameters:
+            sprint_ids (iterable of int): The IDs of the sprints.
+            replace (bool): Whether to rebuild existing reports.
+
+        Returns:
+            dict: The new reports keyed by sprint ID.
+        """
+        sprints = Sprint.objects.filter(id__in=list(sprint_ids), is_completed=True)
+        if not replace:
+            sprints = sprints.filter(report__isnull=True)
+        reports = SprintReports._build({sprint.id: sprint for sprint in sprints})
+        if not reports:
+            return {}
+
+        with transaction.atomic():
+            if replace:
+                SprintReport.objects.filter(sprint_id__in=reports).delete()
+            # Concurrent requests may freeze the same sprint, the first report stored wins
+            SprintReport.objects.bulk_create(reports.values(), ignore_conflicts=True)
+        return reports
+
+    @staticmethod
+    def get(sprint_ids):
+        """
+        Returns the reports of the given sprints that are archived, without writing to the database.
+
+        Archived sprints without a stored report, e.g. sprints archived before reports existed, get a report built
+        from the current data, which is not stored. `rebuild_sprint_reports` freezes their reports.
+
+        Parameters:
+            sprint_ids (iterable of int): The IDs of the sprints.
+
+        Returns:
+            dict: The report of each archived sprint keyed by sprint ID.
+        """
+        reports = {}
+        missing = {}
+        for sprint in Sprint.objects.filter(id__in=set(sprint_ids), is_completed=True).select_related('report'):
+            try:
+                reports[sprint.id] = sprint.report
+            except SprintReport.DoesNotExist:
+                missing[sprint.id] = sprint
+        reports.update(SprintReports._build(missing))
+        return reports
+
+    ### Utilities Methods ###
+
+    @staticmethod
+    def _build(sprints):
+        """
+        Utility method to build the unsaved reports of several sprints from their current data.
+
+        Parameters:
+            sprints (dict): The sprints keyed by ID.
+
+        Returns:
+            dict: The report of each sprint keyed by sprint ID.
+        """
+        if not sprints:
+            return {}
+
+        series = SprintCharts.compute(sprints)
+        summaries = SprintReports._summaries(sprints, series)
+        reports = {}
+        for sprint_id, sprint in sprints.items():
+            content = {'series': series[sprint_id], 'summary': summaries[sprint_id]}
+            serialized = json.dumps({'sprint': sprint_id, **content}, sort_keys=True)
+            reports[sprint_id] = SprintReport(sprint=sprint, etag=hashlib.sha256(serialized.encode()).hexdigest(),
+                                              **content)
+        return reports
+
+    @staticmethod
+    def _summaries(sprints, series):
+        """
+        Utility method to compute the summary metrics of several sprints with one query grouped by sprint.
+        """
+        completed = Q(task__status=Task.COMPLETED)
+        totals = {
+            row['sprint_id']: row
+            for row in Task.sprints.through.objects.filter(sprint_id__in=sprints).values('sprint_id').annotate(
+                total_tasks=Count('task_id'),
+                completed_tasks=Count('task_id', filter=completed),
+                committed_points=Coalesce(Sum('task__story_point'), 0),
+                completed_points=Coalesce(Sum('task__story_point', filter=completed), 0),
+            )
+        }
+
+        summaries = {}
+        for sprint_id, sprint in sprints.items():
+            row = totals.get(sprint_id, {})
+            committed_points = row.get('committed_points', 0)
+            completed_points = row.get('completed_points', 0)
+            summaries[sprint_id] = {
+                'name': sprint.name,
+                'start_date': sprint.start_date.isoformat(),
+                'end_date': sprint.end_date.isoformat(),
+                'length_days': len(series[sprint_id]['days']),
+                'total_tasks': row.get('total_tasks', 0),
+                'completed_tasks': row.get('completed_tasks', 0),
+                'committed_points': committed_points,
+                'completed_points': completed_points,
+                'completion_rate': round(completed_points / committed_points, 4) if committed_points else None,
+                'hours_logged': series[sprint_id]['accumulated'][-1] if series[sprint_id]['accumulated'] else 0.0,
+            }
+        return summaries
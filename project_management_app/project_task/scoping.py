@@ -0,0 +1,52 @@
+"""
+Per-request project scoping.
+
+The project a request works in is held in a context variable, set by `ProjectScopeMiddleware` for the duration of the
+request. The default manager of every project-scoped model filters by it, so each query of a request only reads the
+current project's rows and its cost depends on that project's size. Outside of a request, e.g. in management commands
+and the shell, no project is set and the managers return the rows of every project.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import models
+
+# Session key of the project the user last switched to
+SESSION_KEY = 'project_id'
+
+_current_project = ContextVar('current_project', default=None)
+
+
+def get_current_project_id():
+    """
+    Returns the ID of the project the current request works in, or None outside of a project scope.
+    """
+    return _current_project.get()
+
+
+@contextmanager
+def project_scope(project_id):
+    """
+    Scopes the queries of project-scoped models within the block to a project.
+
+    Parameters:
+        project_id (int or None): The ID of the project, or None to lift the scope.
+    """
+    token = _current_project.set(project_id)
+    try:
+        yield
+    finally:
+        _current_project.reset(token)
+
+
+class ProjectScopedManager(models.Manager):
+    """
+    Manager that only returns the rows of the current project, or every row when no project is set.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        project_id = _current_project.get()
+        if project_id is not None:
+            queryset = queryset.filter(project_id=project_id)
+        return queryset
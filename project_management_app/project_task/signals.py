@@ -0,0 +1,184 @@
+"""
+Signal handlers that invalidate cached results when the data they were computed from changes, and the one that creates
+the default project after migrations.
+
+Caches are invalidated once the transaction commits, so a request that reads in the meantime cannot cache the old
+data under the new version. Bulk updates and inserts do not send signals, so code that writes with `bulk_update`
+or `bulk_create` invalidates explicitly. The task details, tag and sprint lists are invalidated for the project of the
+changed rows only, while user changes reach every project.
+"""
+from functools import partial
+
+from django.apps import apps as global_apps
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from register.models import CustomizedUser, WorkingHour
+from . import caching, dependencies, forecast, modal_forms
+from .charts import SprintCharts
+from .models import Project, Sprint, Tag, Task, TaskDependency
+
+
+@receiver(post_save, sender=Task, dispatch_uid='project_task.invalidate_on_task_completion')
+def invalidate_on_task_completion(sender, instance, **kwargs):
+    """
+    Invalidates forecasts whenever a completed task is saved.
+    """
+    if instance.status == Task.COMPLETED:
+        transaction.on_commit(partial(caching.invalidate, forecast.CACHE_NAMESPACE))
+
+
+@receiver(post_save, sender=Sprint, dispatch_uid='project_task.invalidate_on_sprint_archive')
+def invalidate_on_sprint_archive(sender, instance, **kwargs):
+    """
+    Invalidates forecasts whenever an archived sprint is saved.
+    """
+    if instance.is_completed:
+        transaction.on_commit(partial(caching.invalidate, forecast.CACHE_NAMESPACE))
+
+
+@receiver(post_save, sender=Task, dispatch_uid='project_task.invalidate_charts_on_task_save')
+@receiver(pre_delete, sender=Task, dispatch_uid='project_task.invalidate_charts_on_task_delete')
+def invalidate_charts_on_task_change(sender, instance, **kwargs):
+    """
+    Invalidates the charts of every sprint a saved or deleted task belongs to.
+    """
+    SprintCharts.invalidate_tasks([instance.id])
+
+
+@receiver(m2m_changed, sender=Task.sprints.through, dispatch_uid='project_task.invalidate_charts_on_sprint_move')
+def invalidate_charts_on_sprint_move(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Invalidates the charts of the sprints tasks are added to or removed from.
+    """
+    if action in ('post_add', 'post_remove'):
+        SprintCharts.invalidate_sprints([instance.id] if reverse else pk_set)
+    elif action == 'pre_clear':
+        if reverse:
+            SprintCharts.invalidate_sprints([instance.id])
+        else:
+            SprintCharts.invalidate_tasks([instance.id])
+
+
+@receiver(post_save, sender=Sprint, dispatch_uid='project_task.invalidate_charts_on_sprint_save')
+def invalidate_charts_on_sprint_save(sender, instance, **kwargs):
+    """
+    Invalidates the charts of a saved sprint, whose dates may have changed.
+    """
+    SprintCharts.invalidate_sprints([instance.id])
+
+
+@receiver(post_save, sender=WorkingHour, dispatch_uid='project_task.invalidate_charts_on_hours_save')
+@receiver(post_delete, sender=WorkingHour, dispatch_uid='project_task.invalidate_charts_on_hours_delete')
+def invalidate_charts_on_hours_change(sender, instance, **kwargs):
+    """
+    Invalidates the charts of the sprints of a task whose logged hours changed.
+    """
+    if instance.task_id:
+        SprintCharts.invalidate_tasks([instance.task_id])
+
+
+@receiver(post_save, sender=Tag, dispatch_uid='project_task.invalidate_modal_forms_on_tag_save')
+@receiver(post_delete, sender=Tag, dispatch_uid='project_task.invalidate_modal_forms_on_tag_delete')
+@receiver(post_save, sender=CustomizedUser, dispatch_uid='project_task.invalidate_modal_forms_on_user_save')
+@receiver(post_delete, sender=CustomizedUser, dispatch_uid='project_task.invalidate_modal_forms_on_user_delete')
+def invalidate_modal_forms(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidates the rendered backlog forms whenever a tag or user is saved or deleted, except for the last login
+    updates of users.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    transaction.on_commit(partial(caching.invalidate, modal_forms.CACHE_NAMESPACE))
+
+
+@receiver(post_save, sender=Task, dispatch_uid='project_task.invalidate_task_caches_on_task_save')
+@receiver(post_delete, sender=Task, dispatch_uid='project_task.invalidate_task_caches_on_task_delete')
+def invalidate_task_caches_on_task_change(sender, instance, **kwargs):
+    """
+    Invalidates the task details and tag lists of the task's project whenever a task is saved or deleted.
+    """
+    transaction.on_commit(partial(caching.invalidate, caching.TASK_DETAILS, caching.TAGS,
+                                  project_id=instance.project_id))
+
+
+@receiver(m2m_changed, sender=Task.tags.through, dispatch_uid='project_task.invalidate_task_caches_on_tagging')
+@receiver(m2m_changed, sender=Task.sprints.through, dispatch_uid='project_task.invalidate_task_caches_on_sprint_move')
+def invalidate_task_caches_on_relation_change(sender, instance, action, **kwargs):
+    """
+    Invalidates the task details and tag lists of a project whenever its tasks are tagged, untagged, or moved between
+    sprints.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(partial(caching.invalidate, caching.TASK_DETAILS, caching.TAGS,
+                                      project_id=instance.project_id))
+
+
+@receiver(post_save, sender=Tag, dispatch_uid='project_task.invalidate_tag_caches_on_tag_save')
+@receiver(post_delete, sender=Tag, dispatch_uid='project_task.invalidate_tag_caches_on_tag_delete')
+def invalidate_tag_caches(sender, instance, **kwargs):
+    """
+    Invalidates the tag lists and the task details, which hold tag names, of the tag's project whenever a tag is saved
+    or deleted.
+    """
+    transaction.on_commit(partial(caching.invalidate, caching.TAGS, caching.TASK_DETAILS,
+                                  project_id=instance.project_id))
+
+
+@receiver(post_save, sender=Sprint, dispatch_uid='project_task.invalidate_sprint_caches_on_sprint_save')
+@receiver(post_delete, sender=Sprint, dispatch_uid='project_task.invalidate_sprint_caches_on_sprint_delete')
+def invalidate_sprint_caches(sender, instance, **kwargs):
+    """
+    Invalidates the lists of active sprints of the sprint's project whenever a sprint is saved or deleted.
+    """
+    transaction.on_commit(partial(caching.invalidate, caching.SPRINTS, project_id=instance.project_id))
+
+
+@receiver(post_save, sender=CustomizedUser, dispatch_uid='project_task.invalidate_user_caches_on_user_save')
+@receiver(post_delete, sender=CustomizedUser, dispatch_uid='project_task.invalidate_user_caches_on_user_delete')
+def invalidate_user_caches(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidates the user directory and the task details, which hold assignee names, whenever a user is saved or
+    deleted, except for the last login updates.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    transaction.on_commit(partial(caching.invalidate, caching.USERS, caching.TASK_DETAILS))
+
+
+@receiver(m2m_changed, sender=Project.members.through, dispatch_uid='project_task.invalidate_user_caches_on_membership')
+def invalidate_user_caches_on_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Invalidates the user directory, which only lists the members of a project, of the projects whose members change.
+    """
+    if action in ('post_add', 'post_remove'):
+        for project_id in (pk_set if reverse else [instance.id]):
+            transaction.on_commit(partial(caching.invalidate, caching.USERS, project_id=project_id))
+    elif action == 'post_clear':
+        # The projects a user was removed from are no longer known after the clear, so all of them are invalidated
+        project_id = None if reverse else instance.id
+        transaction.on_commit(partial(caching.invalidate, caching.USERS, project_id=project_id))
+
+
+@receiver(post_save, sender=TaskDependency, dispatch_uid='project_task.invalidate_graphs_on_dependency_save')
+@receiver(post_delete, sender=TaskDependency, dispatch_uid='project_task.invalidate_graphs_on_dependency_delete')
+def invalidate_dependency_graphs(sender, instance, **kwargs):
+    """
+    Invalidates the dependency graphs whenever a dependency is added or removed.
+    """
+    transaction.on_commit(partial(caching.invalidate, dependencies.CACHE_NAMESPACE))
+
+
+def create_default_project(sender, apps=global_apps, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Creates the default project after migrations if it doesn't exist, as after `flush`, which empties the tables
+    without running the migration that creates it. Connected to post_migrate in `ProjectTaskConfig.ready`.
+
+    The migrated state is used instead of the model, so that migrating to a state from before projects leaves them out.
+    """
+    try:
+        project_model = apps.get_model('project_task', 'Project')
+    except LookupError:
+        return
+    project_model.objects.using(using).get_or_create(name=Project.DEFAULT_NAME)
@@ -0,0 +1,155 @@
+// Configuration object for theme and font size settings
+const CONFIG = {
+    themes: {
+        LIGHT: 'light-theme',
+        DARK: 'dark-theme',
+        labels: {
+            LIGHT: `<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" fill="currentColor" class="bi bi-sun-fill" viewBox="0 0 16 16">
+                        <path d="M8 12a4 4 0 1 0 0-8 4 4 0 0 0 0 8zM8 0a.5.5 0 0 1 .5.5v2a.5.5 0 0 1-1 0v-2A.5.5 0 0 1 8 0zm0 13a.5.5 0 0 1 .5.5v2a.5.5 0 0 1-1 0v-2A.5.5 0 0 1 8 13zm8-5a.5.5 0 0 1-.5.5h-2a.5.5 0 0 1 0-1h2a.5.5 0 0 1 .5.5zM3 8a.5.5 0 0 1-.5.5h-2a.5.5 0 0 1 0-1h2A.5.5 0 0 1 3 8zm10.657-5.657a.5.5 0 0 1 0 .707l-1.414 1.415a.5.5 0 1 1-.707-.708l1.414-1.414a.5.5 0 0 1 .707 0zm-9.193 9.193a.5.5 0 0 1 0 .707L3.05 13.657a.5.5 0 0 1-.707-.707l1.414-1.414a.5.5 0 0 1 .707 0zm9.193 2.121a.5.5 0 0 1-.707 0l-1.414-1.414a.5.5 0 0 1 .707-.707l1.414 1.414a.5.5 0 0 1 0 .707zM4.464 4.465a.5.5 0 0 1-.707 0L2.343 3.05a.5.5 0 1 1 .707-.707l1.414 1.414a.5.5 0 0 1 0 .708z"/>
+                    </svg> LIGHT`,
+            DARK: `<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" fill="currentColor" class="bi bi-moon-fill" viewBox="0 0 16 16">
+                        <path d="M6 .278a.768.768 0 0 1 .08.858 7.208 7.208 0 0 0-.878 3.46c0 4.021 3.278 7.277 7.318 7.277.527 0 1.04-.055 1.533-.16a.787.787 0 0 1 .81.316.733.733 0 0 1-.031.893A8.349 8.349 0 0 1 8.344 16C3.734 16 0 12.286 0 7.71 0 4.266 2.114 1.312 5.124.06A.752.752 0 0 1 6 .278z"/>
+                   </svg> DARK`
+        }
+    },
+    fontSizes: {
+        SML: 'SML',
+        MED: 'MED',
+        LRG: 'LRG',
+        labels: {
+            SML: `<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" fill="currentColor" class="bi bi-type" viewBox="0 0 16 16">
+                    <path d="m2.244 13.081.943-2.803H6.66l.944 2.803H8.86L5.54 3.75H4.322L1 13.081h1.244zm2.7-7.923L6.34 9.314H3.51l1.4-4.156h.034zm9.146 7.027h.035v.896h1.128V8.125c0-1.51-1.114-2.345-2.646-2.345-1.736 0-2.59.916-2.666 2.174h1.108c.068-.718.595-1.19 1.517-1.19.971 0 1.518.52 1.518 1.464v.731H12.19c-1.647.007-2.522.8-2.522 2.058 0 1.319.957 2.18 2.345 2.18 1.06 0 1.716-.43 2.078-1.011zm-1.763.035c-.752 0-1.456-.397-1.456-1.244 0-.65.424-1.115 1.408-1.115h1.805v.834c0 .896-.752 1.525-1.757 1.525z"/>
+                  </svg> SML`,
+            MED: `<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" fill="currentColor" class="bi bi-type" viewBox="0 0 16 16">
+                    <path d="m2.244 13.081.943-2.803H6.66l.944 2.803H8.86L5.54 3.75H4.322L1 13.081h1.244zm2.7-7.923L6.34 9.314H3.51l1.4-4.156h.034zm9.146 7.027h.035v.896h1.128V8.125c0-1.51-1.114-2.345-2.646-2.345-1.736 0-2.59.916-2.666 2.174h1.108c.068-.718.595-1.19 1.517-1.19.971 0 1.518.52 1.518 1.464v.731H12.19c-1.647.007-2.522.8-2.522 2.058 0 1.319.957 2.18 2.345 2.18 1.06 0 1.716-.43 2.078-1.011zm-1.763.035c-.752 0-1.456-.397-1.456-1.244 0-.65.424-1.115 1.408-1.115h1.805v.834c0 .896-.752 1.525-1.757 1.525z"/>
+                  </svg> MED`,
+            LRG: `<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" fill="currentColor" class="bi bi-type" viewBox="0 0 16 16">
+                    <path d="m2.244 13.081.943-2.803H6.66l.944 2.803H8.86L5.54 3.75H4.322L1 13.081h1.244zm2.7-7.923L6.34 9.314H3.51l1.4-4.156h.034zm9.146 7.027h.035v.896h1.128V8.125c0-1.51-1.114-2.345-2.646-2.345-1.736 0-2.59.916-2.666 2.174h1.108c.068-.718.595-1.19 1.517-1.19.971 0 1.518.52 1.518 1.464v.731H12.19c-1.647.007-2.522.8-2.522 2.058 0 1.319.957 2.18 2.345 2.18 1.06 0 1.716-.43 2.078-1.011zm-1.763.035c-.752 0-1.456-.397-1.456-1.244 0-.65.424-1.115 1.408-1.115h1.805v.834c0 .896-.752 1.525-1.757 1.525z"/>
+                  </svg> LRG`
+        }
+    }
+};
+
+// Cache DOM elements for reuse
+const BODY = document.body;
+const THEME_BUTTON = document.getElementById('theme-toggle-btn');
+const FONT_SIZE_BUTTON = document.getElementById('fontsize-btn');
+
+$(document).ready(function () {
+    // Initial Setup for theme and font size based on stored settings or defaults
+    const storedTheme = localStorage.getItem('theme') || CONFIG.themes.LIGHT;
+    const storedFontSize = localStorage.getItem('fontSize') || CONFIG.fontSizes.MED;
+    const storedIsSideNavOpen = localStorage.getItem('isSideNavOpen') || true;
+    BODY.classList.add(storedTheme, storedFontSize, storedIsSideNavOpen);
+    updateThemeButton(storedTheme);
+    updateFontSizeButton(storedFontSize);
+    updateSideNav(storedIsSideNavOpen);
+});
+
+function toggleSideNav() {
+    const isOpen = localStorage.getItem('isSideNavOpen') !== 'true';
+    updateSideNav(isOpen);
+}
+
+function updateSideNav (isOpen) {
+    if (isOpen) {
+        document.getElementById('sidenav').style.width = '160px';
+        document.getElementById('content').style.marginLeft = '160px';
+    } else {
+        document.getElementById('sidenav').style.width = '0';
+        document.getElementById('content').style.marginLeft = '0';
+    }
+    localStorage.setItem('isSideNavOpen', isOpen);
+}
+
+/**
+ * Toggles the theme between light and dark mode and updates the local storage and button label accordingly.
+ */
+function toggleThemeColour() {
+    const newTheme = BODY.classList.contains(CONFIG.themes.LIGHT) ? CONFIG.themes.DARK : CONFIG.themes.LIGHT;
+    BODY.classList.toggle(CONFIG.themes.LIGHT);
+    BODY.classList.toggle(CONFIG.themes.DARK);
+    localStorage.setItem('theme', newTheme);
+    updateThemeButton(newTheme);
+}
+
+/**
+ * Updates the theme button label based on the current theme.
+ * @param {string} theme - The current theme (light or dark).
+ */
+function updateThemeButton(theme) {
+    let selected_theme = theme === CONFIG.themes.DARK? 'DARK' : 'LIGHT';
+    THEME_BUTTON.innerHTML = CONFIG.themes.labels[selected_theme];
+    THEME_BUTTON.classList.toggle('btn-dark', theme === CONFIG.themes.LIGHT);
+    THEME_BUTTON.classList.toggle('btn-light', theme === CONFIG.themes.DARK);
+}
+
+/**
+ * Toggles the font size between small, medium, and large, updates the local storage and button label accordingly.
+ */
+function changeFontSize() {
+    const newFontSize = BODY.classList.contains(CONFIG.fontSizes.SML) ? CONFIG.fontSizes.MED :
+                        BODY.classList.contains(CONFIG.fontSizes.MED) ? CONFIG.fontSizes.LRG : CONFIG.fontSizes.SML;
+    BODY.className = `${localStorage.getItem('theme') || CONFIG.themes.LIGHT} ${newFontSize}`;
+    localStorage.setItem('fontSize', newFontSize);
+    updateFontSizeButton(newFontSize);
+}
+
+/**
+ * Updates the font size button label based on the current font size.
+ * @param {string} size - The current font size (SML, MED, or LRG).
+ */
+function updateFontSizeButton(size) {
+    FONT_SIZE_BUTTON.innerHTML = CONFIG.fontSizes.labels[size];
+    const newFontSize = size === CONFIG.fontSizes.SML ? 'small' :
+                        size === CONFIG.fontSizes.MED ? 'medium' : 'large';
+    document.body.style.fontSize = newFontSize;
+}
+
+function showHelp() {
+    const modalBodyContent = document.getElementById('helpModalBody');
+    switch(document.getElementsByTagName('h1').item(0).outerText){
+        case 'Home':
+            modalBodyContent.innerHTML =
+                `<h3>Home</h3>
+                 <p>TODO: Implement this at base.html showHelp() script</p>`;
+            break;
+        case 'Project Backlog':
+            modalBodyContent.innerHTML =
+                `<h3>Project Backlog</h3>
+                 <p>This page allows new tasks to be created by generating a modal to fill in fields such as
+                 name, type etc. When the task is made, it will be added to the Project Backlog table, but can
+                 be clicked on to edit task details and saved. The task can also be deleted by clicking on the
+                 delete button in the Action column. The page can be viewed in either List or Kanban and the
+                 tasks can be sorted based on priority, tags and date.</p>`;
+            break;
+        case 'Sprint Backlog':
+            modalBodyContent.innerHTML =
+                `<h3>Sprint Backlog</h3>
+                 <p>Sprint Backlog displays all sprints that have been created, including their start and end
+                 dates. When a sprint is clicked on, the website will redirect to it's corresponding Sprint
+                 Board. The 'Archive Sprint' button will allow the sprint to be archived and moved to the
+                 'Archived Sprints' tab, which can be accessed in the sidebar.</p>`;
+            break;
+        case 'Archived Sprints':
+            modalBodyContent.innerHTML =
+                `<h3>Archived Sprint</h3>
+                 <p>This page displays a table of all sprints that have been archived, including when the sprint
+                  started and ended.</p>`;
+            break;
+        case 'Sprint:':
+        modalBodyContent.innerHTML =
+            `<h3>Selected Sprint</h3>
+             <p>This page shows the task included in the selected sprint. Tasks are split into 3 categories:
+             Incomplete, In progress and Complete. </p>`;
+            break;
+        default:
+           modalBodyContent.innerHTML =
+                `<h3>Selected Sprint</h3>
+                 <p>This page shows the task included in the selected sprint. Tasks are split into 3 categories:
+                 Incomplete, In progress and Complete. </p>`;
+            break;
+    }
+    // show modal
+    $('#helpModal').modal('show');
+}
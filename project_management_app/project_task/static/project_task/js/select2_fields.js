@@ -0,0 +1,75 @@
+/**
+ * Initialize the tag filter using the Select2 library.
+ * This function sets up the Select2 configuration for both
+ * the task creation and task editing modals.
+ *
+ * @param {string} selector - The DOM selector for the tag input.
+ * @param {boolean} allowTagCreation - Whether to allow creating new tags or not.
+ */
+function initializeTagFilter(selector, allowTagCreation) {
+    // Initialize the Select2 plugin on the specified selector
+    $(selector).select2({
+        tags: allowTagCreation, // Enable or disable tag creation based on the allowTagCreation parameter
+        tokenSeparators: [','], // Specify the separators used to tokenize tags
+        allowClear: true, // Allow clearing the selected tag(s)
+        placeholder: 'Select tag(s)', // Set the placeholder text for the tag input
+        theme: 'bootstrap', // Set the theme for the Select2 dropdown
+        ...autocompleteOptions(selector), // Search the tags on the server instead of listing them all
+    });
+}
+
+
+/**
+ * Initialize the assignee field using the Select2 library, searching the users on the server.
+ *
+ * @param {string} selector - The DOM selector for the assignee select.
+ */
+function initializeAssigneeSelect(selector) {
+    $(selector).select2({
+        allowClear: true, // Allow unassigning the task
+        placeholder: 'Select assignee', // Set the placeholder text for the assignee input
+        theme: 'bootstrap', // Set the theme for the Select2 dropdown
+        dropdownParent: $(selector).closest('.modal'), // Keep the search input focusable inside the modal
+        ...autocompleteOptions(selector),
+    });
+}
+
+
+/**
+ * Replace the selection of a Select2 field, adding the options of the selected values.
+ *
+ * @param {string} selector - The DOM selector for the select.
+ * @param {Array} values - The values to select.
+ * @param {Array} labels - The labels of the values, in the same order.
+ */
+function selectOptions(selector, values, labels) {
+    const select = $(selector);
+    select.find('option').filter((index, option) => option.value !== '').remove(); // Keep the empty option
+    values.forEach((value, index) => select.append(new Option(labels[index], value, true, true)));
+    select.trigger('change');
+}
+
+
+/**
+ * Build the Select2 options loading the choices of a select from its autocomplete endpoint, given by its
+ * data-autocomplete-url attribute. The endpoint returns one page of matches per request.
+ *
+ * @param {string} selector - The DOM selector for the select.
+ * @returns {Object} The Select2 options, empty if the select has no autocomplete endpoint.
+ */
+function autocompleteOptions(selector) {
+    const url = $(selector).data('autocomplete-url');
+    if (!url) {
+        return {};
+    }
+    return {
+        ajax: {
+            url: url,
+            dataType: 'json',
+            delay: 250, // Wait for the user to stop typing before searching
+            data: function (params) {
+                return {term: params.term || '', page: params.page || 1};
+            },
+        },
+    };
+}
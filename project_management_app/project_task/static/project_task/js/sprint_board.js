@@ -0,0 +1,237 @@
+/**
+ * Backlog task picker of the "Add Task to Sprint" modal, loading the unplanned tasks matching its filters one
+ * page at a time. Checked tasks stay in the list when the filters change.
+ */
+const backlogPicker = {
+    page: 0,
+    request: null,
+
+    /**
+     * Load the first page of tasks matching the filters, replacing the unchecked tasks in the list.
+     */
+    reload: function () {
+        $('#backlogTaskList .form-check').filter(function () {
+            return !$(this).find('input').prop('checked');
+        }).remove();
+        this.page = 0;
+        this.loadMore();
+    },
+
+    /**
+     * Load the next page of tasks matching the filters.
+     */
+    loadMore: function () {
+        if (this.request) {
+            this.request.abort(); // Only the latest filters count
+        }
+        const list = $('#backlogTaskList');
+        const page = this.page + 1;
+        this.request = $.get(list.data('url'), {
+            page: page,
+            q: $('#backlogSearch').val(),
+            tag: $('#backlogTag').val() || '',
+            priority: $('#backlogPriority').val(),
+        }).done((response) => {
+            this.page = page;
+            response.tasks.forEach(function (task) {
+                if (list.find(`input[value="${task.id}"]`).length) {
+                    return; // Already checked from a previous search
+                }
+                const item = $('<div class="form-check">' +
+                    '<input type="checkbox" class="form-check-input" name="selected_tasks">' +
+                    '<label class="form-check-label"></label></div>');
+                item.find('input').val(task.id).attr('id', 'backlog-task-' + task.id);
+                item.find('label').attr('for', 'backlog-task-' + task.id)
+                    .text(`${task.name} (${task.priority}, ${task.tags.join(', ')})`);
+                list.append(item);
+            });
+            $('#backlogEmpty').toggle(!list.children().length);
+            $('#loadMoreBacklog').toggle(response.pagination.more);
+        });
+    },
+};
+
+/**
+ * Ask the planner for the backlog tasks that fit the capacity, of the picker's tag if any, and check them in the
+ * picker instead of the current selection. Moving the selected tasks accepts the proposal.
+ */
+function proposeSprintTasks() {
+    const planner = $('#sprintPlanner');
+    const params = {capacity: $('#planCapacity').val(), per_assignee: $('#planPerAssignee').prop('checked') ? 1 : 0};
+    if ($('#backlogTag').val()) {
+        params.tag = $('#backlogTag').val();
+    }
+    $.get(planner.data('url'), params).done(function (proposal) {
+        const list = $('#backlogTaskList');
+        list.find('input').prop('checked', false);
+        proposal.tasks.slice().reverse().forEach(function (task) {
+            let input = list.find(`input[value="${task.id}"]`);
+            if (!input.length) {
+                const item = $('<div class="form-check">' +
+                    '<input type="checkbox" class="form-check-input" name="selected_tasks">' +
+                    '<label class="form-check-label"></label></div>');
+                item.find('input').val(task.id).attr('id', 'backlog-task-' + task.id);
+                item.find('label').attr('for', 'backlog-task-' + task.id)
+                    .text(`${task.name} (${task.priority}, ${task.story_point} points)`);
+                list.prepend(item);
+                input = item.find('input');
+            }
+            input.prop('checked', true);
+        });
+        $('#backlogEmpty').toggle(!list.children().length);
+        $('#planSummary').show().text(
+            `${proposal.tasks.length} tasks of ${proposal.proposed_points} points proposed, ` +
+            `${proposal.planned_points} of ${proposal.capacity} points already planned. ` +
+            `Left out: ${proposal.skipped.unestimated} unestimated, ${proposal.skipped.blocked} blocked.`
+        );
+    }).fail(function (xhr) {
+        $('#planSummary').show().text(xhr.responseJSON ? xhr.responseJSON.message : 'The planner failed.');
+    });
+}
+
+function changeView() {
+        const selectedView = document.getElementById("view").value;
+        if (selectedView === "listView") {
+            document.getElementById("listView").style.display = "block";
+            document.getElementById("kanbanView").style.display = "none";
+        } else if (selectedView === "kanbanView") {
+            document.getElementById("listView").style.display = "none";
+            document.getElementById("kanbanView").style.display = "block";
+        }
+    }
+
+
+function filterTasks() {
+    const selectedCategory = document.getElementById("filter").value;
+    const rows = document.querySelectorAll("#backlogTable tr");
+    const cards = document.querySelectorAll("#kanbanView .card.mb-3"); // Select all cards with class "card mb-3" in the kanbanView
+
+    rows.forEach(row => {
+        const category = row.getAttribute("data-category");
+        if (selectedCategory === "" || category.includes(selectedCategory)) {
+            row.style.display = "table-row";
+        } else {
+            row.style.display = "none";
+        }})
+
+    cards.forEach(card => {
+        const cardTags = card.querySelectorAll(".badge-info"); // Get tags within the card
+        let cardMatchesCategory = false;
+
+        cardTags.forEach(tag => {
+            const tagCategory = tag.textContent.trim();
+            if (selectedCategory === "" || tagCategory.includes(selectedCategory)) {
+                cardMatchesCategory = true;
+            }
+        });
+
+        if (cardMatchesCategory) {
+            card.style.display = "block"; // Show the card
+        } else {
+            card.style.display = "none"; // Hide the card
+        }
+    });
+}
+
+
+function updateTaskOnScreen(updatedData) {
+
+    var taskId = updatedData.id;
+    var taskElement = $('#task_' + taskId); // Adjust this selector based on your HTML structure
+
+    // Update the task element with the new data
+    taskElement.find('.task-name').text(updatedData.name);
+    taskElement.find('.task-status').text(updatedData.status);
+    // Update other properties as needed
+}
+
+
+$(document).on('click', '.open-modal', function(e) {
+    e.preventDefault();
+    initializeTagFilter('#editTaskModal #id_tags', true);   //Initialize the Select2 tag filter in the edit task modal. Function at top of the script section.
+    initializeAssigneeSelect('#editTaskModal #id_assignee');
+    var taskId = $(this).data('task-id');
+    var url = '/sprint-boards/get_task_data/' + taskId + '/';
+
+    // Make an AJAX request to fetch task data
+    $.get(url, function(request) {
+        const data = request.task_data; // extract the task data from the JSON response
+
+        // Select the task's tags and assignee, adding their options as the fields only load matches on search
+        selectOptions('#editTaskModal #id_tags', data.tag_ids, data.tags);
+        if (data.assignee) {
+            selectOptions('#editTaskModal #id_assignee', [data.assignee.id], [data.assignee.username]);
+        } else {
+            $('#editTaskModal #id_assignee').val(null).trigger('change');
+        }
+
+        // Populate form fields with the retrieved data
+        $('#editTaskModal #id_name').val(data.name);
+        $('#editTaskModal #id_type').val(data.type);
+        $('#editTaskModal #id_priority').val(data.priority);
+        $('#editTaskModal #id_story_point').val(data.story_point);
+        $('#editTaskModal #id_description').val(data.description);
+        $('#editTaskModal #id_assignee_id').val(data.assignee_id);
+        $('#editTaskModal #id_status').val(data.status);
+        $('#editTaskModal #id_stage').val(data.stage);
+        $('#editTaskModal #id_created_date').val(data.created_date);
+        $('#editTaskModal #id_total_hour').val(data.total_hour);
+        $('#updateChanges').data('task-id', taskId);
+    });
+
+    // Show the modal
+    $('#editTaskModal').modal('show');
+});
+
+$(document).ready(function() {
+    // The backlog picker loads its tasks when the modal first opens and whenever its filters change
+    $('#backlogTag').select2({
+        allowClear: true,
+        placeholder: 'Tag',
+        theme: 'bootstrap',
+        dropdownParent: $('#taskSelectionModal'), // Keep the search input focusable inside the modal
+        ...autocompleteOptions('#backlogTag'),
+    });
+    $('#taskSelectionModal').one('show.bs.modal', () => backlogPicker.reload());
+    $('#backlogTag, #backlogPriority').on('change', () => backlogPicker.reload());
+    let searchTimeout = null;
+    $('#backlogSearch').on('input', function () {
+        clearTimeout(searchTimeout);
+        searchTimeout = setTimeout(() => backlogPicker.reload(), 250); // Wait for the user to stop typing
+    });
+    $('#loadMoreBacklog').on('click', () => backlogPicker.loadMore());
+    $('#planSprintButton').on('click', proposeSprintTasks);
+
+    $('#editTaskForm').submit(function(event) {
+        event.preventDefault();
+
+        // Retrieve the task ID from the update button's data attribute
+        var taskId = $('#updateChanges').data('task-id');
+
+        // Check if taskId is undefined and handle it
+        if (typeof taskId === 'undefined') {
+            console.error('Task ID is undefined. Make sure the data-task-id attribute is set on the button.');
+            return;
+        }
+
+        // Serialize the form data
+        var formData = $(this).serialize();
+
+        // Send an AJAX request to update the task
+        $.ajax({
+            url: '/sprint-boards/edit_tasks/' + taskId + '/',
+            method: 'POST',
+            data: formData,
+            success: function(response) {
+                // Handle success response
+                // Close the modal
+                $('#editTaskModal').modal('hide');
+                updateTaskOnScreen(response.updated_task);
+
+            },
+            error: function(xhr, status, error) {
+                console.error(xhr.responseText);
+            }
+        });
+    });
+});
@@ -1,3 +1,604 @@
-from django.test import TestCase
+import json
+from datetime import date, datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError
+from django.forms.models import model_to_dict
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from register.models import CustomizedUser, WorkingHour
+from . import caching
+from .dependencies import TaskDependencies
+from .events import EXISTS, TaskHistory
+from .models import Project, Sprint, SprintReport, Tag, Task, TaskDependency
+from .planning import SprintPlanner
+from .reports import SprintReports
+from .scoping import SESSION_KEY, project_scope
+from .views import TaskManager
+
+
+# Pages link their static files by name, without the manifest of fingerprinted names that collectstatic writes
+static_files_by_name = override_settings(STORAGES={**settings.STORAGES, 'staticfiles': {
+    'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+}})
+
+
+def create_task(name, **fields):
+    return Task.objects.create(name=name, description=name, priority=fields.pop('priority', Task.MEDIUM),
+                               stage=Task.PLANNING, **fields)
+
+
+class BulkEditTasksTests(TestCase):
+    """
+    Tests of the bulk edit endpoint, in particular of its version conflicts.
+    """
+
+    def setUp(self):
+        self.user = CustomizedUser.objects.create_user(username='editor', email='editor@example.com',
+                                                       password='password', first_name='Ed', last_name='Itor')
+        self.client.force_login(self.user)
+        self.first = create_task('First')
+        self.second = create_task('Second')
+
+    def post(self, updates):
+        return self.client.post(reverse('bulk_edit_tasks'), json.dumps({'tasks': updates}),
+                                content_type='application/json')
+
+    def test_updates_every_task_and_bumps_their_versions(self):
+        response = self.post([
+            {'id': self.first.id, 'version': self.first.version, 'status': Task.IN_PROGRESS},
+            {'id': self.second.id, 'version': self.second.version, 'assignee': self.user.id},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.status, Task.IN_PROGRESS)
+        self.assertEqual(self.second.assignee, self.user)
+        self.assertEqual(self.first.version, 2)
+        self.assertEqual(self.second.version, 2)
+
+    def test_stale_version_is_a_conflict_and_nothing_is_written(self):
+        # Someone else edits the second task after the editor loaded it
+        self.second.status = Task.COMPLETED
+        self.second.save()
+        self.second.refresh_from_db()
+
+        response = self.post([
+            {'id': self.first.id, 'version': self.first.version, 'status': Task.IN_PROGRESS},
+            {'id': self.second.id, 'version': self.second.version - 1, 'status': Task.IN_PROGRESS},
+        ])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual([conflict['id'] for conflict in response.json()['conflicts']], [self.second.id])
+        first = Task.objects.get(id=self.first.id)
+        second = Task.objects.get(id=self.second.id)
+        self.assertEqual((first.status, first.version), (Task.NOT_STARTED, self.first.version))
+        self.assertEqual((second.status, second.version), (Task.COMPLETED, self.second.version))
+
+
+class TimeLogTests(TestCase):
+    """
+    Tests of logging time, through the time-logging endpoint and the sprint board's task edits.
+    """
+
+    def setUp(self):
+        self.user = CustomizedUser.objects.create_user(username='logger', email='logger@example.com',
+                                                       password='password', first_name='Log', last_name='Ger')
+        self.client.force_login(self.user)
+        self.task = create_task('Logged')
+
+    def log_time(self, *entries):
+        return self.client.post(reverse('log_time'), json.dumps({'entries': entries}),
+                                content_type='application/json')
+
+    def test_logging_again_on_the_same_day_updates_the_entry(self):
+        response = self.log_time({'task': self.task.id, 'date': '2024-01-08', 'duration': '01:30:00'})
+        self.assertEqual(response.json()['total_hours'], {str(self.task.id): 1.5})
+
+        response = self.log_time({'task': self.task.id, 'date': '2024-01-08', 'duration': 2},
+                                 {'task': self.task.id, 'date': '2024-01-09', 'duration': 1})
+        self.assertEqual(response.json()['total_hours'], {str(self.task.id): 3.0})
+        self.assertEqual(
+            list(WorkingHour.objects.order_by('date').values_list('date', 'hour')),
+            [(date(2024, 1, 8), timedelta(hours=2)), (date(2024, 1, 9), timedelta(hours=1))],
+        )
+
+    def test_the_last_entry_of_a_task_and_day_wins(self):
+        self.log_time({'task': self.task.id, 'date': '2024-01-08', 'duration': 4},
+                      {'task': self.task.id, 'date': '2024-01-08', 'duration': '00:45:00'})
+
+        self.assertEqual(list(WorkingHour.objects.values_list('hour', flat=True)), [timedelta(minutes=45)])
+
+    def test_invalid_durations_are_rejected_and_nothing_is_logged(self):
+        # json.dumps writes NaN and Infinity, which json.loads accepts
+        for duration in [1e12, float('nan'), float('inf'), -1, 24.5, '25:00:00', '1000000000 00:00:00', 'soon',
+                         None, True]:
+            with self.subTest(duration=duration):
+                response = self.log_time({'task': self.task.id, 'duration': 1},
+                                         {'task': self.task.id, 'date': '2024-01-08', 'duration': duration})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['message'], "Entry 2: duration must be between 0 and 24 hours")
+        self.assertFalse(WorkingHour.objects.exists())
+
+    def test_task_edit_is_rolled_back_when_its_time_cannot_be_logged(self):
+        response = self.client.post(reverse('edit_tasks', args=[self.task.id]),
+                                    {'status': Task.COMPLETED, 'hour': '30:00:00'})
+
+        self.assertEqual(response.status_code, 400)
+        task = Task.objects.get(id=self.task.id)
+        self.assertEqual((task.status, task.completed_date, task.version), (Task.NOT_STARTED, None, 1))
+        self.assertFalse(task.events.filter(field='status').exists())
+        self.assertFalse(WorkingHour.objects.exists())
+
+    def test_task_edit_reports_the_total_hours(self):
+        self.log_time({'task': self.task.id, 'date': '2024-01-08', 'duration': 3})
+
+        response = self.client.post(reverse('edit_tasks', args=[self.task.id]),
+                                    {'status': Task.IN_PROGRESS, 'hour': '01:00:00'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated_task']['total_hours'], 4.0)
+
+
+class TaskDependenciesTests(TestCase):
+    """
+    Tests of adding dependencies and of the dependency graphs.
+    """
+
+    def setUp(self):
+        self.design = create_task('Design', story_point=3)
+        self.build = create_task('Build', story_point=5)
+        self.release = create_task('Release', story_point=1)
+        self.hotfix = create_task('Hotfix', story_point=8, priority=Task.URGENT)
+        self.assertTrue(TaskDependencies.add(self.build.id, self.design.id)[0])
+        self.assertTrue(TaskDependencies.add(self.release.id, self.build.id)[0])
+
+    def test_refuses_a_dependency_closing_a_cycle(self):
+        success, _, data = TaskDependencies.add(self.design.id, self.release.id)
+
+        self.assertFalse(success)
+        self.assertEqual(data['cycle'], [self.design.id, self.build.id, self.release.id])
+        self.assertFalse(TaskDependency.objects.filter(task=self.design, blocked_by=self.release).exists())
+
+    def test_refuses_a_task_blocking_itself_or_a_task_of_another_project(self):
+        self.assertFalse(TaskDependencies.add(self.design.id, self.design.id)[0])
+
+        other = Task.objects.create(name='Other', description='Other', priority=Task.LOW, stage=Task.PLANNING,
+                                    project=Project.objects.create(name='Other'))
+        self.assertFalse(TaskDependencies.add(self.design.id, other.id)[0])
+
+    def test_orders_tasks_after_their_blockers(self):
+        graph = TaskDependencies.compute(Task.objects.all())
+
+        order = graph['order']
+        self.assertEqual(sorted(order), sorted([self.design.id, self.build.id, self.release.id, self.hotfix.id]))
+        self.assertLess(order.index(self.design.id), order.index(self.build.id))
+        self.assertLess(order.index(self.build.id), order.index(self.release.id))
+        # Among the tasks ready from the start, the urgent one comes first
+        self.assertEqual(order[0], self.hotfix.id)
+        self.assertEqual(graph['dependencies'], 2)
+        self.assertEqual(graph['cycle'], [])
+
+    def test_critical_path_is_the_chain_with_the_most_story_points(self):
+        graph = TaskDependencies.compute(Task.objects.all())
+
+        self.assertEqual([task['id'] for task in graph['critical_path']['tasks']],
+                         [self.design.id, self.build.id, self.release.id])
+        self.assertEqual(graph['critical_path']['story_points'], 9)
+
+    def test_completed_tasks_are_left_out_of_the_graph(self):
+        self.design.status = Task.COMPLETED
+        self.design.save()
+
+        graph = TaskDependencies.compute(Task.objects.all())
+
+        self.assertNotIn(self.design.id, graph['order'])
+        self.assertEqual(graph['critical_path']['story_points'], 8)
+        self.assertEqual(graph['external_blockers'], {})
+
+    def test_remaining_blockers_outside_of_the_set_are_external(self):
+        graph = TaskDependencies.compute(Task.objects.exclude(id=self.design.id))
+
+        self.assertEqual(graph['external_blockers'], {self.build.id: [self.design.id]})
+
+
+class SprintPlannerTests(TestCase):
+    """
+    Tests of the sprint planner's proposals.
+    """
+
+    def setUp(self):
+        self.sprint = Sprint.objects.create(name='Next')
+        self.user = CustomizedUser.objects.create_user(username='dev', email='dev@example.com', password='password',
+                                                       first_name='De', last_name='Veloper', sprint_capacity=4)
+
+    def propose(self, capacity, assignee_capacities=None):
+        proposal = SprintPlanner.propose(self.sprint, TaskManager.list_tasks(), capacity, assignee_capacities)
+        return proposal, [task['id'] for task in proposal['tasks']]
+
+    def test_stays_within_the_capacity_left_by_the_planned_tasks(self):
+        planned = create_task('Planned', story_point=3)
+        planned.sprints.add(self.sprint)
+        urgent = create_task('Urgent', story_point=5, priority=Task.URGENT)
+        create_task('Medium', story_point=5)
+        low = create_task('Low', story_point=2, priority=Task.LOW)
+
+        proposal, proposed = self.propose(10)
+
+        self.assertEqual(proposal['planned_points'], 3)
+        self.assertEqual(proposed, [urgent.id, low.id])
+        self.assertEqual(proposal['proposed_points'], 7)
+
+    def test_stays_within_each_assignee_capacity(self):
+        first = create_task('First', story_point=3, priority=Task.URGENT, assignee=self.user)
+        create_task('Second', story_point=3, priority=Task.URGENT, assignee=self.user)
+        unassigned = create_task('Unassigned', story_point=3)
+
+        proposal, proposed = self.propose(20, True)
+
+        self.assertEqual(proposed, [first.id, unassigned.id])
+        self.assertEqual(proposal['assignees'][self.user.id], {'capacity': 4, 'remaining': 1})
+
+        # Without assignee capacities, only the sprint's capacity applies
+        self.assertEqual(len(self.propose(20)[1]), 3)
+
+    def test_proposes_blockers_before_the_tasks_they_block(self):
+        blocker = create_task('Blocker', story_point=5, priority=Task.LOW)
+        urgent = create_task('Urgent', story_point=1, priority=Task.URGENT)
+        medium = create_task('Medium', story_point=5)
+        TaskDependencies.add(urgent.id, blocker.id)
+
+        # The blocker inherits the urgency of the task it blocks, and takes the capacity from the medium task
+        _, proposed = self.propose(6)
+
+        self.assertEqual(proposed, [blocker.id, urgent.id])
+        self.assertNotIn(medium.id, proposed)
+
+    def test_leaves_out_tasks_blocked_by_tasks_that_cannot_be_planned(self):
+        unestimated = create_task('Unestimated')
+        blocked = create_task('Blocked', story_point=1, priority=Task.URGENT)
+        TaskDependencies.add(blocked.id, unestimated.id)
+        planned_blocker = create_task('Planned blocker', story_point=1)
+        planned_blocker.sprints.add(Sprint.objects.create(name='Current'))
+        unblocked = create_task('Unblocked', story_point=1)
+        TaskDependencies.add(unblocked.id, planned_blocker.id)
+
+        proposal, proposed = self.propose(10)
+
+        self.assertEqual(proposed, [unblocked.id])
+        self.assertEqual(proposal['skipped'], {'unestimated': 1, 'blocked': 1})
+
+
+class SprintReportTests(TestCase):
+    """
+    Tests that sprint reports are frozen when sprints are archived, and only read by the report views.
+    """
+
+    def setUp(self):
+        self.user = CustomizedUser.objects.create_user(username='viewer', email='viewer@example.com',
+                                                       password='password', first_name='Vie', last_name='Wer')
+        self.client.force_login(self.user)
+        self.sprint = Sprint.objects.create(name='Sprint', start_date=date(2024, 1, 8), end_date=date(2024, 1, 12))
+        self.task = create_task('Planned', story_point=3)
+        self.task.sprints.add(self.sprint)
+
+    def test_reading_the_report_of_an_archived_sprint_writes_nothing(self):
+        Sprint.objects.filter(id=self.sprint.id).update(is_completed=True)
+
+        response = self.client.get(reverse('sprint_report', args=[self.sprint.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['summary']['committed_points'], 3)
+        self.assertEqual(self.client.get(reverse('chart_data', args=[self.sprint.id])).status_code, 200)
+        self.assertFalse(SprintReport.objects.exists())
+
+    def test_archiving_freezes_the_report(self):
+        self.assertEqual(self.client.get(reverse('sprint_report', args=[self.sprint.id])).status_code, 404)
+
+        self.client.get(reverse('archive_sprint_backlog', args=[self.sprint.id]))
+
+        report = SprintReport.objects.get(sprint=self.sprint)
+        self.assertEqual(report.summary['total_tasks'], 1)
+        # Later changes are left out of the frozen report, which clients revalidate with its ETag
+        self.task.story_point = 5
+        self.task.save()
+        response = self.client.get(reverse('sprint_report', args=[self.sprint.id]))
+        self.assertEqual(response.json()['summary']['committed_points'], 3)
+        response = self.client.get(reverse('sprint_report', args=[self.sprint.id]),
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+@static_files_by_name
+class ProjectIsolationTests(TestCase):
+    """
+    Tests that the tasks, sprints, tags, dependencies and assignees of a project stay out of the other projects.
+    """
+
+    def setUp(self):
+        self.first_project = Project.objects.create(name='First')
+        self.second_project = Project.objects.create(name='Second')
+        self.user = CustomizedUser.objects.create_user(username='member', email='member@example.com',
+                                                       password='password', first_name='Mem', last_name='Ber')
+        self.outsider = CustomizedUser.objects.create_user(username='mate', email='mate@example.com',
+                                                           password='password', first_name='Ma', last_name='Te')
+        self.user.projects.add(self.first_project, self.second_project)
+        self.outsider.projects.add(self.first_project)
+
+        with project_scope(self.first_project.id):
+            self.tag = Tag.objects.create(name='first-tag')
+            self.sprint = Sprint.objects.create(name='First sprint')
+            self.task = create_task('First task')
+            self.blocker = create_task('First blocker')
+            self.task.tags.add(self.tag)
+            TaskDependencies.add(self.task.id, self.blocker.id)
+        with project_scope(self.second_project.id):
+            self.own_tag = Tag.objects.create(name='second-tag')
+            self.own_task = create_task('Second task')
+
+        # The user works in the second project
+        self.client.force_login(self.user)
+        session = self.client.session
+        session[SESSION_KEY] = self.second_project.id
+        session.save()
+
+    def test_lists_only_the_current_projects_tasks_sprints_and_tags(self):
+        response = self.client.get(reverse('project_backlog'))
+        self.assertEqual([task.id for task in response.context['tasks']], [self.own_task.id])
+
+        response = self.client.get(reverse('backlog_tasks'))
+        self.assertEqual([task['id'] for task in response.json()['tasks']], [self.own_task.id])
+
+        response = self.client.get(reverse('sprint_backlog'))
+        self.assertEqual(list(response.context['sprint_backlog']), [])
+
+        response = self.client.get(reverse('autocomplete_tags'))
+        self.assertEqual([tag['id'] for tag in response.json()['results']], [self.own_tag.id])
+
+    def test_cannot_fetch_another_projects_tasks_sprints_or_dependencies(self):
+        self.assertEqual(self.client.get(reverse('get_task_data', args=[self.task.id])).json()['status'], 'error')
+        self.assertEqual(self.client.get(reverse('edit_task', args=[self.task.id])).json()['status'], 'error')
+        self.assertEqual(self.client.get(reverse('sprint_boards', args=[self.sprint.id])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('task_dependencies', args=[self.task.id])).status_code, 404)
+
+    def test_cannot_change_another_projects_tasks_sprints_or_dependencies(self):
+        response = self.client.post(reverse('edit_tasks', args=[self.task.id]), {'status': Task.COMPLETED})
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.post(reverse('bulk_edit_tasks'), json.dumps({'tasks': [
+            {'id': self.task.id, 'version': self.task.version, 'status': Task.COMPLETED},
+        ]}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(reverse('delete_task', args=[self.task.id]))
+        self.assertEqual(response.json()['status'], 'error')
+
+        response = self.client.post(reverse('move_selected_tasks_to_sprint'),
+                                    {'selected_tasks': [self.own_task.id], 'sprint_id': self.sprint.id})
+        self.assertEqual(response.status_code, 400)
+
+        # Neither a dependency on a task of another project nor the dependencies of another project can be changed
+        response = self.client.post(reverse('task_dependencies', args=[self.own_task.id]),
+                                    json.dumps({'blocked_by': self.blocker.id}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.delete(reverse('task_dependencies', args=[self.task.id]),
+                                      json.dumps({'blocked_by': self.blocker.id}), content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+
+        task = Task.all_objects.get(id=self.task.id)
+        self.assertEqual((task.status, task.version), (Task.NOT_STARTED, self.task.version))
+        self.assertFalse(Task.sprints.through.objects.filter(sprint=self.sprint).exists())
+        self.assertEqual(TaskDependency.all_objects.count(), 1)
+
+    def test_assignee_autocomplete_only_lists_the_current_projects_members(self):
+        response = self.client.get(reverse('autocomplete_assignees'))
+        self.assertEqual([user['id'] for user in response.json()['results']], [self.user.id])
+
+        # Every user can be assigned tasks of the default project
+        session = self.client.session
+        session[SESSION_KEY] = Project.get_default().id
+        session.save()
+        response = self.client.get(reverse('autocomplete_assignees'))
+        self.assertEqual([user['id'] for user in response.json()['results']], [self.outsider.id, self.user.id])
+
+
+class CacheInvalidationTests(TransactionTestCase):
+    """
+    Tests that writes invalidate the cached values of their project, outside of test transactions, which bypass the
+    cache.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.first_project = Project.objects.create(name='First')
+        self.second_project = Project.objects.create(name='Second')
+        self.user = CustomizedUser.objects.create_user(username='member', email='member@example.com',
+                                                       password='password', first_name='Mem', last_name='Ber')
+        self.user.projects.add(self.second_project)
+
+    def cached(self, namespace, project, value):
+        return caching.get_or_compute(namespace, ('test',), lambda: value, project_id=project.id)
+
+    def test_writes_invalidate_the_values_of_their_project_only(self):
+        writes = {
+            caching.TAGS: lambda: Tag.objects.create(name='tag'),
+            caching.SPRINTS: lambda: Sprint.objects.create(name='Sprint'),
+            caching.TASK_DETAILS: lambda: create_task('Task'),
+        }
+        for namespace, write in writes.items():
+            with self.subTest(namespace=namespace):
+                self.cached(namespace, self.first_project, 'old')
+                self.cached(namespace, self.second_project, 'old')
+
+                with project_scope(self.first_project.id):
+                    write()
+
+                self.assertEqual(self.cached(namespace, self.first_project, 'new'), 'new')
+                self.assertEqual(self.cached(namespace, self.second_project, 'new'), 'old')
+
+    def test_user_changes_invalidate_every_project(self):
+        for project in (self.first_project, self.second_project):
+            self.cached(caching.USERS, project, 'old')
+
+        self.user.first_name = 'Renamed'
+        self.user.save()
+
+        for project in (self.first_project, self.second_project):
+            self.assertEqual(self.cached(caching.USERS, project, 'new'), 'new')
+
+    def test_new_members_are_listed_by_the_assignee_autocomplete(self):
+        newcomer = CustomizedUser.objects.create_user(username='newcomer', email='newcomer@example.com',
+                                                      password='password', first_name='New', last_name='Comer')
+        self.client.force_login(self.user)
+        session = self.client.session
+        session[SESSION_KEY] = self.second_project.id
+        session.save()
+        self.cached(caching.USERS, self.first_project, 'old')
+
+        response = self.client.get(reverse('autocomplete_assignees'))
+        self.assertEqual([user['id'] for user in response.json()['results']], [self.user.id])
+
+        newcomer.projects.add(self.second_project)
+
+        response = self.client.get(reverse('autocomplete_assignees'))
+        self.assertEqual([user['id'] for user in response.json()['results']], [self.user.id, newcomer.id])
+        self.assertEqual(self.cached(caching.USERS, self.first_project, 'new'), 'old')
+
+
+class AdminBulkDeleteTests(TestCase):
+    """
+    Tests of the batched bulk deletes of the task and working hour admins.
+    """
+
+    def setUp(self):
+        self.admin = CustomizedUser.objects.create_superuser('admin', 'admin@example.com', 'Ad', 'Min',
+                                                             password='password')
+        self.client.force_login(self.admin)
+        self.task = create_task('Deleted')
+        self.blocker = create_task('Blocker')
+        self.kept = create_task('Kept')
+        TaskDependencies.add(self.task.id, self.blocker.id)
+        TaskDependencies.add(self.kept.id, self.task.id)
+        for day in (8, 9):
+            WorkingHour.objects.create(task=self.task, person=self.admin, date=date(2024, 1, day),
+                                       hour=timedelta(hours=1))
+        self.kept_hour = WorkingHour.objects.create(task=self.kept, person=self.admin, date=date(2024, 1, 8),
+                                                    hour=timedelta(hours=2))
+
+    def delete_selected(self, url_name, ids):
+        return self.client.post(reverse(url_name), {
+            'action': 'delete_selected', '_selected_action': ids, 'post': 'yes',
+        })
+
+    def test_deleting_working_hours_keeps_the_other_hours(self):
+        hour_ids = list(WorkingHour.objects.filter(task=self.task).values_list('id', flat=True))
+
+        self.assertEqual(self.delete_selected('admin:register_workinghour_changelist', hour_ids).status_code, 302)
+
+        self.assertEqual(list(WorkingHour.objects.values_list('id', flat=True)), [self.kept_hour.id])
+
+    def test_deleting_tasks_deletes_their_hours_and_dependencies(self):
+        self.assertEqual(self.delete_selected('admin:project_task_task_changelist', [self.task.id]).status_code, 302)
+
+        self.assertFalse(Task.objects.filter(id=self.task.id).exists())
+        self.assertEqual(list(WorkingHour.objects.values_list('id', flat=True)), [self.kept_hour.id])
+        self.assertFalse(TaskDependency.objects.exists())
+        self.assertTrue(self.task.events.filter(field=EXISTS, new_value=None).exists())
+
+
+@static_files_by_name
+class SprintReplayTests(TestCase):
+    """
+    Tests that the tasks of a sprint are reconstructed at past moments from the events recorded by the task admin.
+    """
+
+    def setUp(self):
+        self.admin = CustomizedUser.objects.create_superuser('admin', 'admin@example.com', 'Ad', 'Min',
+                                                             password='password')
+        self.client.force_login(self.admin)
+        self.tag = Tag.objects.create(name='tag')
+        self.sprint = Sprint.objects.create(name='Sprint')
+        self.next_sprint = Sprint.objects.create(name='Next sprint')
+
+    def at(self, day, hour=12):
+        return timezone.make_aware(datetime(2024, 1, day, hour))
+
+    def admin_post(self, day, url, data):
+        with mock.patch('project_task.events.timezone.now', return_value=self.at(day)):
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+
+    def change_task(self, day, task, **changes):
+        task.refresh_from_db()
+        data = {key: '' if value is None else value for key, value in model_to_dict(task).items()}
+        data.update({'tags': [tag.id for tag in task.tags.all()],
+                     'sprints': [sprint.id for sprint in task.sprints.all()], **changes})
+        self.admin_post(day, reverse('admin:project_task_task_change', args=[task.id]), data)
+
+    def states(self, sprint, *moments):
+        return [sorted((state['name'], state['status']) for state in tasks)
+                for _, tasks in TaskHistory.sprint_states(sprint.id, moments)]
+
+    def test_replays_field_changes_sprint_moves_and_deletion(self):
+        self.admin_post(1, reverse('admin:project_task_task_add'), {
+            'name': 'Moved', 'description': 'Moved', 'priority': Task.MEDIUM, 'stage': Task.PLANNING,
+            'status': Task.NOT_STARTED, 'type': Task.STORY,
+            'created_date': '2024-01-01', 'tags': [self.tag.id], 'sprints': [self.sprint.id],
+        })
+        moved = Task.objects.get(name='Moved')
+        with mock.patch('project_task.events.timezone.now', return_value=self.at(1)):
+            deleted = create_task('Deleted')
+            TaskHistory.record_created(deleted)
+        deleted.tags.add(self.tag)
+        self.change_task(1, deleted, sprints=[self.sprint.id])
+
+        self.change_task(2, deleted, status=Task.IN_PROGRESS)
+        self.change_task(3, moved, sprints=[self.next_sprint.id])
+        self.admin_post(4, reverse('admin:project_task_task_delete', args=[deleted.id]), {'post': 'yes'})
+
+        not_started, in_progress = Task.NOT_STARTED, Task.IN_PROGRESS
+        self.assertEqual(self.states(self.sprint, self.at(1, 6), date(2024, 1, 1), date(2024, 1, 2),
+                                     date(2024, 1, 3), date(2024, 1, 4)), [
+            [],
+            [('Deleted', not_started), ('Moved', not_started)],
+            [('Deleted', in_progress), ('Moved', not_started)],
+            [('Deleted', in_progress)],
+            [],
+        ])
+        self.assertEqual(self.states(self.next_sprint, date(2024, 1, 2), date(2024, 1, 3)),
+                         [[], [('Moved', not_started)]])
+
+
+class RequestTransactionTests(TestCase):
+    """
+    Tests that request transactions are retried when the database is locked.
+    """
+
+    def setUp(self):
+        self.user = CustomizedUser.objects.create_user(username='archiver', email='archiver@example.com',
+                                                       password='password', first_name='Ar', last_name='Chiver')
+        self.client.force_login(self.user)
+        self.sprint = Sprint.objects.create(name='Sprint', start_date=date(2024, 1, 8), end_date=date(2024, 1, 12))
+
+    def test_archiving_is_retried_once_when_the_database_is_locked(self):
+        freeze = SprintReports.freeze
+        calls = []
+
+        def locked_once(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+            return freeze(*args, **kwargs)
+
+        with mock.patch('project_task.views.SprintReports.freeze', side_effect=locked_once):
+            response = self.client.get(reverse('archive_sprint_backlog', args=[self.sprint.id]))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(calls), 2)
+        self.sprint.refresh_from_db()
+        self.assertTrue(self.sprint.is_completed)
+        self.assertEqual(SprintReport.objects.filter(sprint=self.sprint).count(), 1)
@@ -1,24 +1,48 @@
 from django.urls import path
-from .views import HomeListView, TaskListView, TaskEditView, TaskDeleteView, SprintBoard, CreateGraph
+from .views import (HomeListView, ProjectSwitchView, TaskListView, TaskEditView, TaskDeleteView, BacklogForecastView,
+                    BacklogFormView, BacklogDependenciesView, TaskDependencyView, SprintBoard, CreateGraph,
+                    Autocomplete)
 
 
 urlpatterns = [
     path("", HomeListView.as_view(), name="home_redirect"),
     path("home/", HomeListView.as_view(), name="home"),
+    path("projects/switch/", ProjectSwitchView.as_view(), name="switch_project"),
     path("project-backlog/", TaskListView.as_view(), name="project_backlog"),
     path("project-backlog/edit_task/<int:task_id>/", TaskEditView.as_view(), name="edit_task"),
     path("project-backlog/delete_task/<int:task_id>/", TaskDeleteView.as_view(), name="delete_task"),
+    path("project-backlog/forecast/", BacklogForecastView.as_view(), name="backlog_forecast"),
+    path("project-backlog/forms/<str:form_name>/", BacklogFormView.as_view(), name="backlog_form"),
+    path("project-backlog/dependencies/", BacklogDependenciesView.as_view(), name="backlog_dependencies"),
+    path("project-backlog/dependencies/<int:task_id>/", TaskDependencyView.as_view(), name="task_dependencies"),
+    path("autocomplete/tags/", Autocomplete.tags, name="autocomplete_tags"),
+    path("autocomplete/assignees/", Autocomplete.assignees, name="autocomplete_assignees"),
     # path("sprint-boards/get_updated_data/", SprintBoard.get_updated_data, name="get_updated_data"),
     path("sprint-boards/get_task_data/<int:task_id>/", SprintBoard.get_task_data, name="get_task_data"),
     path("sprint-boards/edit_tasks/<int:task_id>/", SprintBoard.edit_tasks, name="edit_tasks"),
+    path("sprint-boards/bulk_edit_tasks/", SprintBoard.bulk_edit_tasks, name="bulk_edit_tasks"),
+    path("sprint-boards/log_time/", SprintBoard.log_time, name="log_time"),
+    path("sprint-boards/backlog_tasks/", SprintBoard.backlog_tasks, name="backlog_tasks"),
     path('sprint_boards/<int:sprint_id>/', SprintBoard.sprint_boards, name='sprint_boards'),
+    path('sprint_boards/<int:sprint_id>/history/', SprintBoard.sprint_history, name='sprint_history'),
+    path('sprint_boards/<int:sprint_id>/dependencies/', SprintBoard.sprint_dependencies, name='sprint_dependencies'),
+    path('sprint_boards/<int:sprint_id>/plan/', SprintBoard.plan_sprint, name='plan_sprint'),
     # path('redirect_to_sprint_board/<int:sprint_id>/', SprintBoard.redirect_to_sprint_board, name='redirect_to_sprint_board'),
     
     path('sprint_backlog/', SprintBoard.active_sprints, name='sprint_backlog'),
     path('sprint_backlog_archived', SprintBoard.archived_sprints, name='sprint_backlog_archived'),
+    path('sprint_backlog/velocity/', SprintBoard.velocity, name='velocity'),
+    path('sprint_backlog/velocity/data/', SprintBoard.velocity_data, name='velocity_data'),
+    path('sprint_backlog/workload/', SprintBoard.workload, name='workload'),
+    path('sprint_backlog/workload/data/', SprintBoard.workload_data, name='workload_data'),
     path('sprint_backlog/archive_sprint_backlog/<int:sprint_id>/', SprintBoard.archive_sprint_backlog, name='archive_sprint_backlog'),
 
     path("create-graph/<int:sprint_id>/", CreateGraph.create_graph, name="create_graph"),
+    path("create-graph/<int:sprint_id>/data/", CreateGraph.chart_data, name="chart_data"),
+    path("create-graph/data/", CreateGraph.charts_data, name="charts_data"),
+    path("create-graph/<int:sprint_id>/report/", CreateGraph.sprint_report, name="sprint_report"),
+    path("create-graph/<int:sprint_id>/flow/", CreateGraph.cumulative_flow, name="cumulative_flow"),
+    path("create-graph/<int:sprint_id>/flow/data/", CreateGraph.cumulative_flow_data, name="cumulative_flow_data"),
     path('move_selected_tasks_to_sprint/', SprintBoard.move_selected_tasks, name='move_selected_tasks_to_sprint'),
     #path("get_sprint_tasks/", SprintBoard.get_sprint_tasks, name="get_task")
 
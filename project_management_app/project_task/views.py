@@ -1,19 +1,33 @@
-
+import json
+from functools import partial
 from django.urls import reverse_lazy, reverse
-from django.http import JsonResponse, HttpResponseBadRequest
+from django.http import Http404, HttpResponse, JsonResponse, HttpResponseBadRequest
 from django.shortcuts import render, redirect, get_object_or_404, reverse
 from django.views.generic.edit import View
-from .models import Tag, Task, Sprint
+from .models import Project, Tag, Task, TaskDependency, Sprint
+from .analytics import VelocityReport, WorkloadReport
+from .charts import SprintCharts
+from .dependencies import TaskDependencies
+from .events import TaskHistory
+from .forecast import BacklogForecast
+from .modal_forms import ModalForms
+from .planning import SprintPlanner
+from .reports import SprintReports
+from . import caching, forecast, scoping
 from .forms import CreateNewTaskForm, EditTaskForm, CreateNewSprintForm, SprintBoardTaskForm
 from django.db.models import Case, When, Value, IntegerField
 from datetime import timedelta, date, datetime
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from register.models import CustomizedUser, WorkingHour
+from project_management_app.transactions import atomic_request
 from django.core import serializers
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.core.serializers.json import DjangoJSONEncoder
-from django.utils.dateparse import parse_duration
-from django.db.models import Sum
+from django.utils.dateparse import parse_date, parse_datetime, parse_duration
+from django.db.models import Exists, OuterRef, Q, Sum
+from django.db.models.functions import Lower
 
 
 class TaskManager:
@@ -22,13 +36,25 @@ class TaskManager:
     Provides static methods to handle task-related operations like creation, updation, deletion, and fetching details.
     """
 
+    # Fields that can be changed through a bulk edit, mapped to the model attribute they set
+    BULK_EDIT_FIELDS = {
+        'status': 'status',
+        'priority': 'priority',
+        'stage': 'stage',
+        'assignee': 'assignee_id',
+    }
+
+    # Upper bound on the number of tasks accepted in a single bulk edit
+    MAX_BULK_EDIT_TASKS = 200
+
     @staticmethod
-    def create_task(response_data):
+    def create_task(response_data, actor=None):
         """
         Creates a new task based on the provided data.
 
         Parameters:
             response_data (dict): The data for the new task.
+            actor (CustomizedUser, optional): The user creating the task, recorded in the task's history.
 
         Returns:
             tuple: A tuple containing:
@@ -54,8 +80,10 @@ class TaskManager:
             new_task = task_form.save(commit=False)
 
             # Save the task to the database
-            new_task.save()
-            task_form.save_m2m()
+            with transaction.atomic():
+                new_task.save()
+                task_form.save_m2m()
+                TaskHistory.record_created(new_task, actor)
             task_data = task_form.cleaned_data
             task_data['id'] = new_task.id
             return True, f"Task '{str(new_task)}' successfully created!", task_data
@@ -65,13 +93,14 @@ class TaskManager:
             return False, error_message, None
 
     @staticmethod
-    def update_task(task_id, response_data):
+    def update_task(task_id, response_data, actor=None):
         """
         Updates an existing task based on the provided data.
 
         Parameters:
             task_id (int): The ID of the task to be updated.
             response_data (dict): The updated data for the task.
+            actor (CustomizedUser, optional): The user updating the task, recorded in the task's history.
 
         Returns:
             tuple: A tuple containing:
@@ -85,6 +114,9 @@ class TaskManager:
         if not task:
             return False, "The Task does not exist"
 
+        # Keep the current values for the task's history, the form updates the instance in place
+        before = TaskHistory.snapshot(task)
+
         # Create tags and get their IDs
         tag_ids = TaskManager._create_tags(response_data.getlist('tags'))
 
@@ -107,8 +139,10 @@ class TaskManager:
             # Save the task and return feedback
             # Now save the task to DB
 
-            updated_task.save()
-            update_form.save_m2m()
+            with transaction.atomic():
+                updated_task.save()
+                update_form.save_m2m()
+                TaskHistory.record_changes([(task_id, before, TaskHistory.snapshot(updated_task))], actor)
 
             # Get the task details as dictionary
             task_details = TaskManager.get_task_details(task_id)
@@ -119,13 +153,105 @@ class TaskManager:
             return False, update_form.errors, None
 
     @staticmethod
-    def delete_task(task_id):
+    def bulk_update_tasks(updates, actor=None):
+        """
+        Applies partial field updates to many tasks in a single transaction.
+
+        Every update names the task, the version of the task the editor last saw and the fields to change. If any
+        task has been changed since (its version differs), nothing is applied and the conflicting tasks are
+        returned instead, so concurrent editors never silently overwrite each other's changes.
+
+        Parameters:
+            updates (list of dict): Updates with an 'id', a 'version' and any of the BULK_EDIT_FIELDS.
+            actor (CustomizedUser, optional): The user editing the tasks, recorded in the tasks' history.
+
+        Returns:
+            tuple: A tuple containing:
+                - bool: Status of the update (True if successful, False otherwise).
+                - str: Success or error message.
+                - dict or None: The new version of each updated task if successful, the conflicting tasks with
+                  their current version and values if there were conflicts, None otherwise.
+        """
+        if not updates:
+            return False, "No task updates provided", None
+        if len(updates) > TaskManager.MAX_BULK_EDIT_TASKS:
+            return False, f"At most {TaskManager.MAX_BULK_EDIT_TASKS} tasks can be edited at once", None
+
+        changes = {}
+        for index, update in enumerate(updates):
+            success, message, change = TaskManager._parse_bulk_update(update)
+            if not success:
+                return False, f"Update {index + 1}: {message}", None
+            if change[0] in changes:
+                return False, f"Update {index + 1}: task {change[0]} is listed more than once", None
+            changes[change[0]] = change[1:]
+
+        assignee_ids = {fields['assignee_id'] for _, fields in changes.values() if fields.get('assignee_id')}
+        missing = assignee_ids - set(CustomizedUser.objects.filter(id__in=assignee_ids).values_list('id', flat=True))
+        if missing:
+            return False, f"Users not found: {', '.join(str(user_id) for user_id in sorted(missing))}", None
+
+        columns = {'version', 'completed_date'}.union(*(fields for _, fields in changes.values()))
+        with transaction.atomic():
+            tasks = {
+                task.id: task
+                for task in Task.objects.select_for_update().filter(id__in=changes).only('id', 'status', *columns)
+            }
+            missing = changes.keys() - tasks.keys()
+            if missing:
+                return False, f"Tasks not found: {', '.join(str(task_id) for task_id in sorted(missing))}", None
+
+            conflicts = TaskManager._version_conflicts(tasks, changes)
+            if conflicts:
+                return False, f"{len(conflicts)} of the tasks were changed by someone else", {'conflicts': conflicts}
+
+            today = timezone.now().date()
+            history = []
+            for task_id, (version, fields) in changes.items():
+                task = tasks[task_id]
+                before = TaskHistory.snapshot(task)
+                for field, value in fields.items():
+                    setattr(task, field, value)
+                if task.status == Task.COMPLETED and not task.completed_date:
+                    task.completed_date = today
+                task.version = version + 1
+                history.append((task_id, before, TaskHistory.snapshot(task)))
+
+            # Only rows still at the version the editor saw are written, which also catches editors that raced
+            # past the check above on databases without row locks
+            expected = Q()
+            for task_id, (version, _) in changes.items():
+                expected |= Q(id=task_id, version=version)
+            if Task.objects.filter(expected).bulk_update(tasks.values(), sorted(columns)) != len(tasks):
+                transaction.set_rollback(True)
+                current = {
+                    task.id: task for task in Task.objects.filter(id__in=changes).only('id', *columns)
+                }
+                return False, "Some of the tasks were changed by someone else", {
+                    'conflicts': TaskManager._version_conflicts(current, changes)
+                }
+            TaskHistory.record_changes(history, actor)
+
+            # bulk_update sends no signals, so invalidate the charts, task details, and forecasts when tasks were
+            # completed, here
+            SprintCharts.invalidate_tasks(changes)
+            transaction.on_commit(partial(caching.invalidate, caching.TASK_DETAILS,
+                                          project_id=scoping.get_current_project_id()))
+            if any(fields.get('status') == Task.COMPLETED for _, fields in changes.values()):
+                transaction.on_commit(partial(caching.invalidate, forecast.CACHE_NAMESPACE))
+
+        versions = {task_id: task.version for task_id, task in tasks.items()}
+        return True, f"{len(tasks)} tasks successfully updated!", {'versions': versions}
+
+    @staticmethod
+    def delete_task(task_id, actor=None):
         """
         This method deletes an existing task.
         It checks if the task exists, saves the name for feedback, then deletes the task.
 
         Parameters:
             task_id (int): The ID of the task to be deleted.
+            actor (CustomizedUser, optional): The user deleting the task, recorded in the task's history.
 
         Returns:
             tuple: A tuple containing:
@@ -141,11 +267,58 @@ class TaskManager:
         # Save the task name for feedback
         task_name = task.name
 
-        # Delete the task
-        task.delete()
+        # Delete the task, keeping its final state in its history
+        with transaction.atomic():
+            TaskHistory.record_deleted(task, actor)
+            task.delete()
 
         return True, f"Task '{task_name}' was successfully deleted!"
 
+    @staticmethod
+    def move_tasks_to_sprint(task_ids, sprint_id, actor=None):
+        """
+        Adds tasks to a sprint with a single bulk insert.
+        Tasks that are already in the sprint are left as they are.
+
+        Parameters:
+            task_ids (list of str or int): The IDs of the tasks to move.
+            sprint_id (int): The ID of the sprint.
+            actor (CustomizedUser, optional): The user moving the tasks, recorded in the tasks' history.
+
+        Returns:
+            tuple: A tuple containing:
+                - bool: Status of the move (True if successful, False otherwise).
+                - str: Success or error message.
+        """
+        try:
+            task_ids = {int(task_id) for task_id in task_ids}
+            sprint_id = int(sprint_id)
+        except (TypeError, ValueError):
+            return False, "Invalid task or sprint ID"
+
+        if not Sprint.objects.filter(id=sprint_id).exists():
+            return False, f"Sprint {sprint_id} not found"
+        missing = task_ids - set(Task.objects.filter(id__in=task_ids).values_list('id', flat=True))
+        if missing:
+            return False, f"Tasks not found: {', '.join(str(task_id) for task_id in sorted(missing))}"
+
+        membership = Task.sprints.through
+        with transaction.atomic():
+            already_added = set(
+                membership.objects.filter(sprint_id=sprint_id, task_id__in=task_ids).values_list('task_id', flat=True)
+            )
+            added = sorted(task_ids - already_added)
+            membership.objects.bulk_create(
+                [membership(task_id=task_id, sprint_id=sprint_id) for task_id in added], ignore_conflicts=True
+            )
+            TaskHistory.record_sprint_changes(sprint_id, added=added, actor=actor)
+            # bulk_create sends no m2m_changed signal, so invalidate the sprint's charts and tag lists here
+            SprintCharts.invalidate_sprints([sprint_id])
+            transaction.on_commit(partial(caching.invalidate, caching.TAGS,
+                                          project_id=scoping.get_current_project_id()))
+
+        return True, f"{len(added)} tasks moved to the sprint"
+
     @staticmethod
     def list_tasks(tag_filter=None, priority_sort=None, date_created_sort=None):
         """
@@ -204,7 +377,7 @@ class TaskManager:
     @staticmethod
     def get_task_details(task_id):
         """
-        This method fetches the details of a specific task given its ID.
+        This method fetches the details of a specific task given its ID, through the cache.
         If the task exists, it will return its details as a dictionary.
         If the task does not exist, it will return None.
 
@@ -219,32 +392,52 @@ class TaskManager:
                 - dict or None: Task details as a dictionary if the task was found, None otherwise.
         """
 
-        # Fetch the task object using the provided ID
+        task_details = caching.get_or_compute(caching.TASK_DETAILS, (task_id,),
+                                              partial(TaskManager._task_details, task_id),
+                                              project_id=scoping.get_current_project_id())
+        if task_details is None:
+            return False, f"Task {task_id} not found", None
+
+        return True, f'Fetching Task {task_id}', task_details
+
+    ### Utilities Methods ###
+
+    @staticmethod
+    def _task_details(task_id):
+        """
+        Utility method to read the details of a task from the database.
+
+        Parameters:
+            task_id (int): The ID of the task.
+
+        Returns:
+            dict or None: The task's details, or None if the task doesn't exist.
+        """
         task = TaskManager._read_task(task_id)
         if not task:
-            return False, f"Task {task_id} not found", None
+            return None
+        tags = list(task.tags.all())
 
         # Convert the task details to a dictionary
-        task_details = {
+        return {
             'id': task.id,
             'name': task.name,
             'description': task.description,
             'type': task.type,
             'priority': task.priority,
             'stage': task.stage,
-            'tags': [tag.name for tag in task.tags.all()],
+            'tags': [tag.name for tag in tags],
+            'tag_ids': [tag.id for tag in tags],
             'story_point': task.story_point,
-            'assignee': {'id': task.assignee.id, 'email': task.assignee.email} if task.assignee else None,
+            'assignee': {'id': task.assignee.id, 'username': task.assignee.username, 'email': task.assignee.email}
+            if task.assignee else None,
             'status': task.status,
             # 'sprint': task.sprint,
             'created_date': task.created_date,
+            'version': task.version,
             # ... add any other necessary fields here ...
         }
 
-        return True, f'Fetching Task {task_id}', task_details
-
-    ### Utilities Methods ###
-
     @staticmethod
     def _create_tags(tags):
         """
@@ -288,6 +481,214 @@ class TaskManager:
         except Task.DoesNotExist:
             return None
 
+    @staticmethod
+    def _parse_bulk_update(update):
+        """
+        Utility method to validate a single bulk edit update.
+
+        Parameters:
+            update (dict): The raw update.
+
+        Returns:
+            tuple: A tuple containing:
+                - bool: Whether the update is valid.
+                - str: Error message if the update is invalid.
+                - tuple or None: (task_id, version, {model attribute: value}) if the update is valid, None otherwise.
+        """
+        if not isinstance(update, dict):
+            return False, "must be an object", None
+
+        try:
+            task_id = int(update.get('id'))
+            version = int(update.get('version'))
+        except (TypeError, ValueError):
+            return False, "a valid task id and version are required", None
+
+        choices = {
+            'status': Task.STATUS_CHOICES,
+            'priority': Task.PRIORITY_CHOICES,
+            'stage': Task.STAGE_CHOICES,
+        }
+        fields = {}
+        for key, attribute in TaskManager.BULK_EDIT_FIELDS.items():
+            if key not in update:
+                continue
+            value = update[key]
+            if key == 'assignee':
+                if value not in (None, ''):
+                    try:
+                        value = int(value)
+                    except (TypeError, ValueError):
+                        return False, "assignee must be a user ID or null", None
+                else:
+                    value = None
+            elif value not in {choice for choice, _ in choices[key]}:
+                return False, f"'{value}' is not a valid {key}", None
+            fields[attribute] = value
+
+        unknown = update.keys() - TaskManager.BULK_EDIT_FIELDS.keys() - {'id', 'version'}
+        if unknown:
+            return False, f"fields cannot be bulk edited: {', '.join(sorted(unknown))}", None
+        if not fields:
+            return False, "no fields to update", None
+
+        return True, '', (task_id, version, fields)
+
+    @staticmethod
+    def _version_conflicts(tasks, changes):
+        """
+        Utility method to list the tasks whose current version differs from the version the editor saw.
+
+        Parameters:
+            tasks (dict): The current Task objects, keyed by ID.
+            changes (dict): The parsed updates as (version, fields) tuples, keyed by task ID.
+
+        Returns:
+            list of dict: The ID, current version and current values of the edited fields of each conflicting task.
+        """
+        conflicts = []
+        for task_id, (version, fields) in changes.items():
+            task = tasks.get(task_id)
+            if task is None:
+                # Deleted since the editor loaded it
+                conflicts.append({'id': task_id, 'version': None})
+                continue
+            if task.version == version:
+                continue
+            conflicts.append({
+                'id': task_id,
+                'version': task.version,
+                **{key: getattr(task, attribute) for key, attribute in TaskManager.BULK_EDIT_FIELDS.items()
+                   if attribute in fields},
+            })
+        return conflicts
+
+
+class TimeLogManager:
+    """
+    Utility class for logging working hours.
+    Provides static methods to record time against tasks in batches and to read back the per-task totals.
+    """
+
+    # Upper bound on the number of entries accepted in a single batch
+    MAX_ENTRIES = 500
+
+    @staticmethod
+    def log_time(person, entries):
+        """
+        Records a batch of time entries for a person.
+
+        Each person has a single WorkingHour row per task per day. Logging time for a (task, date) that already has
+        an entry replaces its duration, and when the same (task, date) appears more than once in a batch the last
+        entry wins. All entries are validated first and then written with one bulk upsert in a single transaction.
+
+        Parameters:
+            person (CustomizedUser): The person the time is logged for.
+            entries (list of dict): Entries with a 'task' ID, an optional 'date' (ISO date, defaults to today) and a
+                'duration' (a duration string such as "01:30:00" or a number of hours).
+
+        Returns:
+            tuple: A tuple containing:
+                - bool: Status of the logging (True if successful, False otherwise).
+                - str: Success or error message.
+                - dict or None: Total hours logged on each affected task if successful, None otherwise.
+        """
+        if not entries:
+            return False, "No time entries provided", None
+        if len(entries) > TimeLogManager.MAX_ENTRIES:
+            return False, f"At most {TimeLogManager.MAX_ENTRIES} time entries can be logged at once", None
+
+        rows = {}
+        for index, entry in enumerate(entries):
+            success, message, row = TimeLogManager._parse_entry(entry)
+            if not success:
+                return False, f"Entry {index + 1}: {message}", None
+            rows[row[:2]] = row[2]
+
+        task_ids = {task_id for task_id, _ in rows}
+        task_projects = dict(Task.objects.filter(id__in=task_ids).values_list('id', 'project_id'))
+        missing = task_ids - task_projects.keys()
+        if missing:
+            return False, f"Tasks not found: {', '.join(str(task_id) for task_id in sorted(missing))}", None
+
+        # Bulk inserts bypass save, so each entry is explicitly put in its task's project
+        working_hours = [
+            WorkingHour(task_id=task_id, project_id=task_projects[task_id], person=person, date=day, hour=duration)
+            for (task_id, day), duration in rows.items()
+        ]
+        with transaction.atomic():
+            WorkingHour.objects.bulk_create(
+                working_hours,
+                update_conflicts=True,
+                unique_fields=['task', 'person', 'date'],
+                update_fields=['hour'],
+            )
+            # bulk_create sends no signals, so invalidate the charts of the tasks' sprints here
+            SprintCharts.invalidate_tasks(task_ids)
+
+        return True, f"Logged {len(working_hours)} time entries", TimeLogManager.total_hours(task_ids)
+
+    @staticmethod
+    def total_hours(task_ids):
+        """
+        Computes the total hours logged on each of the given tasks with a single grouped query.
+
+        Parameters:
+            task_ids (iterable of int): The IDs of the tasks.
+
+        Returns:
+            dict: Total hours logged on each task, keyed by task ID. Tasks without any logged time map to 0.0.
+        """
+        totals = {task_id: 0.0 for task_id in task_ids}
+        grouped = WorkingHour.objects.filter(task_id__in=totals).values('task_id').annotate(total=Sum('hour'))
+        for row in grouped:
+            totals[row['task_id']] = row['total'].total_seconds() / 3600
+        return totals
+
+    ### Utilities Methods ###
+
+    @staticmethod
+    def _parse_entry(entry):
+        """
+        Utility method to validate a single time entry.
+
+        Parameters:
+            entry (dict): The raw entry.
+
+        Returns:
+            tuple: A tuple containing:
+                - bool: Whether the entry is valid.
+                - str: Error message if the entry is invalid.
+                - tuple or None: (task_id, date, duration) if the entry is valid, None otherwise.
+        """
+        if not isinstance(entry, dict):
+            return False, "must be an object", None
+
+        try:
+            task_id = int(entry.get('task'))
+        except (TypeError, ValueError, OverflowError):
+            return False, "a valid task ID is required", None
+
+        raw_date = entry.get('date')
+        try:
+            day = date.fromisoformat(raw_date) if raw_date else timezone.localdate()
+        except (TypeError, ValueError):
+            return False, "date must be in YYYY-MM-DD format", None
+
+        raw_duration = entry.get('duration')
+        if isinstance(raw_duration, (int, float)) and not isinstance(raw_duration, bool):
+            # Checked before building the timedelta, which fails on huge numbers, and NaN fails every comparison
+            duration = timedelta(hours=raw_duration) if 0 <= raw_duration <= 24 else None
+        else:
+            try:
+                duration = parse_duration(raw_duration) if isinstance(raw_duration, str) else None
+            except OverflowError:
+                duration = None
+        if duration is None or duration < timedelta() or duration > timedelta(hours=24):
+            return False, "duration must be between 0 and 24 hours", None
+
+        return True, '', (task_id, day, duration)
+
 
 class TaskListView(View):
     """
@@ -304,8 +705,8 @@ class TaskListView(View):
         """
         Handles GET requests to render the product backlog page.
 
-        Fetches tasks based on filtering and sorting parameters from the URL, generates forms for task creation and
-        editing, and prepares the context for the template rendering.
+        Fetches tasks based on filtering and sorting parameters from the URL and prepares the context for the template
+        rendering. The forms of the page's modals are loaded separately, from `BacklogFormView`.
 
         Parameters:
             request (HttpRequest): The HTTP request object.
@@ -314,20 +715,11 @@ class TaskListView(View):
             HttpResponse: Rendered project backlog page with tasks and relevant context.
         """
 
-        # Generate an empty CreateNewTask form and EditTask form
-        create_new_task_form = CreateNewTaskForm()
-        create_new_sprint_form = CreateNewSprintForm()
-        edit_task_form = EditTaskForm()
-
         # Extract sorting, view, and date created sort parameters from the URL or use default values
         priority_sort = request.GET.get('priority_sort', 'priority_ascending')
         current_view = request.GET.get('view', 'list_view')
         date_sort = request.GET.get('date_sort', 'date_ascending')
 
-        # Retrieve tags that are currently in use
-        used_tags_ids = Task.objects.values_list('tags', flat=True).distinct()
-        tags = Tag.objects.filter(id__in=used_tags_ids)
-
         # Process the selected tags passed via the URL
         selected_tags_string = request.GET.get('tags_filter', '')
         selected_tags = selected_tags_string.split(",") if selected_tags_string else []
@@ -338,15 +730,11 @@ class TaskListView(View):
         # Construct the context for the template
         context = {
             "name": "project-backlog",
-            "create_new_task_form": create_new_task_form,
-            "edit_task_form": edit_task_form,
             "tasks": tasks,
-            "tags": tags,
             "current_view": current_view,
             "priority_sort": priority_sort,
             "selected_tags": selected_tags,
             "date_sort": date_sort,
-            "create_new_sprint_form": create_new_sprint_form,
         }
 
         # Render and return the template with the prepared context
@@ -378,7 +766,7 @@ class TaskListView(View):
 
         else:
             # Attempt to create a new task using the TaskManager utility
-            success, message, task_details = TaskManager.create_task(request.POST)
+            success, message, task_details = TaskManager.create_task(request.POST, request.user)
             # Handle unsuccessful task creation (e.g., form validation errors)
             if not success:
                 return JsonResponse({'status': 'error', 'message': message})
@@ -391,6 +779,177 @@ class TaskListView(View):
 
 
 
+class BacklogFormView(View):
+    """
+    View returning the empty forms of the project backlog's modals, which load them when they first open.
+    """
+
+    def get(self, request, form_name):
+        """
+        Returns the rendered fields of a form, without the surrounding form element and its CSRF token.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+            form_name (str): The name of the form, one of `ModalForms.FORMS`.
+
+        Returns:
+            HttpResponse: The HTML fragment of the form, or a 404 response if there is no form with that name.
+        """
+        html = ModalForms.render(form_name)
+        if html is None:
+            raise Http404(f"Form {form_name} not found")
+        return HttpResponse(html)
+
+
+class BacklogForecastView(View):
+    """
+    View class for the backlog completion forecast.
+    """
+
+    def get(self, request):
+        """
+        Handles GET requests for a Monte Carlo forecast of when the product backlog will be completed.
+
+        The backlog can be narrowed with the same `tags_filter` parameter as the project backlog page. `unit`
+        chooses between forecasting story 'points' and 'tasks', `simulations` and `history` set the number of
+        simulated futures and of recent archived sprints sampled, and `seed` makes the forecast reproducible.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            JsonResponse: The P50, P85 and P95 completion dates, or an error message.
+        """
+        selected_tags_string = request.GET.get('tags_filter', '')
+        selected_tags = selected_tags_string.split(",") if selected_tags_string else []
+
+        unit = request.GET.get('unit', 'points')
+        try:
+            simulations = int(request.GET.get('simulations', BacklogForecast.DEFAULT_SIMULATIONS))
+            history = int(request.GET.get('history', BacklogForecast.DEFAULT_HISTORY))
+            seed = int(request.GET['seed']) if request.GET.get('seed') else None
+        except ValueError:
+            simulations = history = None
+
+        error = None
+        if unit not in BacklogForecast.UNITS:
+            error = f"unit must be one of {', '.join(BacklogForecast.UNITS)}"
+        elif simulations is None:
+            error = "simulations, history and seed must be integers"
+        elif not 1 <= simulations <= BacklogForecast.MAX_SIMULATIONS or history < 1:
+            error = f"simulations must be between 1 and {BacklogForecast.MAX_SIMULATIONS} and history at least 1"
+        if error:
+            return JsonResponse({'status': 'error', 'message': error}, status=400)
+
+        tasks = TaskManager.list_tasks(tag_filter=selected_tags)
+        success, message, result = BacklogForecast.forecast(tasks, selected_tags, unit, simulations, history, seed)
+        if not success:
+            return JsonResponse({'status': 'error', 'message': message})
+
+        return JsonResponse({'status': 'success', 'message': message, **result})
+
+
+class BacklogDependenciesView(View):
+    """
+    View class for the dependency graph of the product backlog.
+    """
+
+    def get(self, request):
+        """
+        Handles GET requests for the topological order and the critical path of the remaining backlog tasks.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            JsonResponse: The dependency graph, as returned by TaskDependencies.compute.
+        """
+        graph = TaskDependencies.graph(Task.objects.all(), 'backlog')
+        return JsonResponse({'status': 'success', 'message': 'Backlog dependencies', **graph})
+
+
+class TaskDependencyView(View):
+    """
+    View class for the dependencies of a task.
+
+    GET lists the tasks blocking the task and the tasks it blocks. POST and DELETE add and remove a dependency of
+    the task, given as a JSON body of the form {"blocked_by": 2}.
+    """
+
+    def get(self, request, task_id):
+        """
+        Handles GET requests for the tasks blocking a task and the tasks it blocks.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+            task_id (int): The ID of the task.
+
+        Returns:
+            JsonResponse: The 'blocked_by' and 'blocks' tasks, each with its ID, name and status.
+        """
+        task = get_object_or_404(Task, pk=task_id)
+        blocked_by = TaskDependency.objects.filter(task=task).order_by('blocked_by_id') \
+            .values_list('blocked_by_id', 'blocked_by__name', 'blocked_by__status')
+        blocks = TaskDependency.objects.filter(blocked_by=task).order_by('task_id') \
+            .values_list('task_id', 'task__name', 'task__status')
+        return JsonResponse({
+            'status': 'success',
+            'message': f'Dependencies of task {task.id}',
+            'blocked_by': [{'id': other_id, 'name': name, 'status': status} for other_id, name, status in blocked_by],
+            'blocks': [{'id': other_id, 'name': name, 'status': status} for other_id, name, status in blocks],
+        })
+
+    def post(self, request, task_id):
+        """
+        Handles POST requests to make the task blocked by another task.
+
+        Returns:
+            JsonResponse: A success message, or an error message with the 'cycle' the dependency would close.
+        """
+        blocked_by_id = self._blocked_by_id(request)
+        if blocked_by_id is None:
+            return JsonResponse({'status': 'error', 'message': 'Request body must be {"blocked_by": <task ID>}'},
+                                status=400)
+
+        success, message, data = TaskDependencies.add(task_id, blocked_by_id)
+        if not success:
+            return JsonResponse({'status': 'error', 'message': message, **(data or {})}, status=400)
+        return JsonResponse({'status': 'success', 'message': message})
+
+    def delete(self, request, task_id):
+        """
+        Handles DELETE requests to remove a dependency of the task.
+
+        Returns:
+            JsonResponse: A success message, or a 404 response if the task isn't blocked by the other task.
+        """
+        blocked_by_id = self._blocked_by_id(request)
+        if blocked_by_id is None:
+            return JsonResponse({'status': 'error', 'message': 'Request body must be {"blocked_by": <task ID>}'},
+                                status=400)
+
+        success, message = TaskDependencies.remove(task_id, blocked_by_id)
+        if not success:
+            return JsonResponse({'status': 'error', 'message': message}, status=404)
+        return JsonResponse({'status': 'success', 'message': message})
+
+    ### Utilities Methods ###
+
+    @staticmethod
+    def _blocked_by_id(request):
+        """
+        Utility method to read the ID of the blocking task from a JSON request body.
+
+        Returns:
+            int or None: The ID, or None if the body is not a JSON object with an integer `blocked_by`.
+        """
+        try:
+            blocked_by_id = json.loads(request.body).get('blocked_by')
+        except (ValueError, AttributeError):
+            return None
+        return blocked_by_id if isinstance(blocked_by_id, int) and not isinstance(blocked_by_id, bool) else None
+
+
 class TaskEditView(View):
     """
     View class for the task edit page.
@@ -443,7 +1002,7 @@ class TaskEditView(View):
         """
 
         # Attempt to update the task using the TaskManager utility
-        success, message, task_data = TaskManager.update_task(task_id, request.POST)
+        success, message, task_data = TaskManager.update_task(task_id, request.POST, request.user)
 
         # If the task was successfully updated, send a success response
         if success:
@@ -474,7 +1033,7 @@ class TaskDeleteView(View):
         """
 
         # Attempt to delete the task using the TaskManager utility
-        success, message = TaskManager.delete_task(task_id)
+        success, message = TaskManager.delete_task(task_id, request.user)
 
         # If the task was successfully deleted, send a success response
         if success:
@@ -528,32 +1087,140 @@ class HomeListView(View):
             return redirect('/login')
 
 
+class ProjectSwitchView(View):
+    """
+    View to switch the project the user works in.
+    """
+
+    def post(self, request):
+        """
+        Stores the selected project in the session and redirects to the home page, since the page the user came from
+        belongs to the previous project.
+        """
+        project = Project.available_to(request.user).filter(id=request.POST.get('project_id')).first()
+        if project is None:
+            return HttpResponseBadRequest("Project not found")
+        request.session[scoping.SESSION_KEY] = project.id
+        return redirect('home')
+
+
 class SprintBoard:
+    # Number of tasks per page of the backlog task picker
+    BACKLOG_PAGE_SIZE = 50
+
     def sprint_boards(request, sprint_id):
 
         form = SprintBoardTaskForm()
 
-        sprints = Sprint.objects.get(pk=sprint_id)
         sprint = get_object_or_404(Sprint, pk=sprint_id)
-        tasks = Task.objects.filter(sprints=sprints)
-        backlog_tasks = Task.objects.filter(sprints=None)
-        # Fetch unique tags associated with tasks
-        tags = Tag.objects.filter(task__isnull=False).distinct()
+        tasks = Task.objects.filter(sprints=sprint)
+        # The filter only offers the tags of the sprint's tasks, as it filters the tasks shown on the board
+        tags = caching.get_or_compute(caching.TAGS, ('sprint', sprint.id),
+                                      lambda: list(Tag.objects.filter(task__sprints=sprint).distinct()),
+                                      project_id=scoping.get_current_project_id())
         statuses = [('NOT', 'Incomplete'), ('IN_PROG', 'In Progress'), ('COM', 'Complete')]
         if sprint.is_completed:
         # Delete tasks that are not completed and associated with the archived sprint
             tasks = tasks.filter(status='COM')
-        return render(request, "project_task/sprint_board.html", {"name": "sprint-board", "tasks": tasks, "statuses": statuses, "tags": tags,"backlog_tasks": backlog_tasks, 'sprint_id': sprint_id, 'sprint': sprint, 'form': form})
+        return render(request, "project_task/sprint_board.html", {"name": "sprint-board", "tasks": tasks, "statuses": statuses, "tags": tags, 'sprint_id': sprint_id, 'sprint': sprint, 'form': form,
+                      'priorities': Task.PRIORITY_CHOICES})
+
+    def sprint_history(request, sprint_id):
+        """
+        Returns the tasks of a sprint as they were at the moment given by the `at` query parameter, an ISO date or
+        datetime that defaults to now. A date stands for the end of that day.
+        """
+        sprint = get_object_or_404(Sprint, pk=sprint_id)
+        raw_moment = request.GET.get('at')
+        try:
+            moment = parse_date(raw_moment) or parse_datetime(raw_moment) if raw_moment else timezone.now()
+        except ValueError:
+            moment = None
+        if moment is None:
+            return JsonResponse({'status': 'error', 'message': 'at must be an ISO date or datetime'}, status=400)
+
+        tasks = TaskHistory.sprint_state_at(sprint.id, moment)
+        return JsonResponse({'status': 'success', 'message': f'Sprint {sprint.id} at {moment}', 'tasks': tasks})
+
+    def sprint_dependencies(request, sprint_id):
+        """
+        Returns the topological order and the critical path of the remaining tasks of a sprint, with the tasks
+        blocked by remaining tasks outside of the sprint.
+        """
+        sprint = get_object_or_404(Sprint, pk=sprint_id)
+        graph = TaskDependencies.graph(Task.objects.filter(sprints=sprint), f'sprint-{sprint.id}')
+        return JsonResponse({'status': 'success', 'message': f'Dependencies of sprint {sprint.id}', **graph})
+
+    def plan_sprint(request, sprint_id):
+        """
+        Proposes backlog tasks to add to a sprint, within the `capacity` query parameter, in story points, and within
+        the sprint capacity of each assignee if `per_assignee` is 1. The candidates can be narrowed down by `tag`
+        names. The board's task picker checks the proposed tasks, and accepting them moves them with
+        move_selected_tasks, in one bulk insert.
+        """
+        sprint = get_object_or_404(Sprint, pk=sprint_id)
+        if sprint.is_completed:
+            return JsonResponse({'status': 'error', 'message': f'Sprint {sprint.id} is archived'}, status=400)
+
+        try:
+            capacity = int(request.GET.get('capacity', ''))
+        except ValueError:
+            capacity = -1
+        if capacity < 0:
+            return JsonResponse({'status': 'error', 'message': 'capacity must be a non-negative integer'}, status=400)
+
+        candidates = TaskManager.list_tasks(tag_filter=request.GET.getlist('tag'))
+        proposal = SprintPlanner.propose(sprint, candidates, capacity, request.GET.get('per_assignee') == '1')
+        return JsonResponse({'status': 'success', 'message': f'Proposal for sprint {sprint.id}', **proposal})
+
+    def backlog_tasks(request):
+        """
+        Returns a page of the tasks that aren't planned in any sprint, newest first, for the board's task picker.
+
+        The tasks can be narrowed down by `tag` name, `priority` and a `q` text contained in their names. `page` is
+        the 1-based page to return, and `more` in the response tells whether there is a next one.
+        """
+        try:
+            page = int(request.GET.get('page', 1))
+        except ValueError:
+            page = 0
+        if page < 1:
+            return JsonResponse({'status': 'error', 'message': 'page must be a positive integer'}, status=400)
+        priority = request.GET.get('priority')
+        if priority and priority not in dict(Task.PRIORITY_CHOICES):
+            return JsonResponse({'status': 'error', 'message': f'Invalid priority {priority}'}, status=400)
+
+        tasks = Task.objects.filter(~Exists(Task.sprints.through.objects.filter(task_id=OuterRef('pk'))))
+        if priority:
+            tasks = tasks.filter(priority=priority)
+        if request.GET.get('tag'):
+            tasks = tasks.filter(tags__name=request.GET['tag'])
+        if request.GET.get('q', '').strip():
+            tasks = tasks.filter(name__icontains=request.GET['q'].strip())
+
+        # One more row than needed tells whether there is a next page without counting the backlog
+        offset = (page - 1) * SprintBoard.BACKLOG_PAGE_SIZE
+        tasks = list(tasks.order_by('-created_date', '-id').prefetch_related('tags')
+                     [offset:offset + SprintBoard.BACKLOG_PAGE_SIZE + 1])
+        return JsonResponse({
+            'status': 'success',
+            'message': f'Backlog page {page}',
+            'tasks': [
+                {'id': task.id, 'name': task.name, 'priority': task.get_priority_display(),
+                 'story_point': task.story_point, 'tags': [tag.name for tag in task.tags.all()]}
+                for task in tasks[:SprintBoard.BACKLOG_PAGE_SIZE]
+            ],
+            'pagination': {'more': len(tasks) > SprintBoard.BACKLOG_PAGE_SIZE},
+        })
 
     def move_selected_tasks(request):
         # Handle the selection and moving of tasks to the sprint board
         if request.method == 'POST':
             selected_tasks = request.POST.getlist('selected_tasks')  # extract the list of selected tasks
             sprint_id = request.POST.get('sprint_id')  # extract the sprint id
-            for task_id in selected_tasks:  # loop through the list of selected tasks
-                task = get_object_or_404(Task, pk=task_id)  # TODO: need error handling redundancy here if task does not exist
-                task.sprints.add(sprint_id)
-                task.save()
+            success, message = TaskManager.move_tasks_to_sprint(selected_tasks, sprint_id, request.user)
+            if not success:
+                return HttpResponseBadRequest(message)
         return redirect('sprint_boards', sprint_id=sprint_id)
 
     def active_sprints(request):
@@ -563,13 +1230,22 @@ class SprintBoard:
         # Get all completed sprints
         completed_sprints = Sprint.objects.filter(end_date__lte=timezone.now(), is_completed=False)
 
-        # Update completed sprints and move them to the archived sprints
-        for sprint in completed_sprints:
-            sprint.is_completed = True
-            sprint.save()
-
-        # Get the sprint backlog (only active sprints)
-        sprint_backlog = active_sprints
+        # Update completed sprints and move them to the archived sprints, freezing their reports, in one transaction.
+        # The view isn't run in a request transaction, which would bypass the cache of the active sprints below.
+        archived_ids = []
+        with transaction.atomic():
+            for sprint in completed_sprints:
+                sprint.is_completed = True
+                sprint.save()
+                archived_ids.append(sprint.id)
+            if archived_ids:
+                SprintReports.freeze(archived_ids)
+
+        # Get the sprint backlog (only active sprints), which only changes when sprints are saved or a day passes
+        sprint_backlog = caching.get_or_compute(
+            caching.SPRINTS, ('active', timezone.localdate().isoformat()), lambda: list(active_sprints),
+            project_id=scoping.get_current_project_id(),
+        )
 
         return render(request, 'project_task/sprint_backlog.html', {'sprint_backlog': sprint_backlog})
 
@@ -577,17 +1253,72 @@ class SprintBoard:
         sprint_backlog_archived = Sprint.objects.filter(is_completed=True)
         return render(request, 'project_task/sprint_backlog_archived.html', {'sprint_backlog_archived': sprint_backlog_archived})
 
+    def velocity(request):
+        """
+        Renders the velocity report of the archived sprints. The chart and table load their data from velocity_data.
+        """
+        window = SprintBoard._velocity_window(request)
+        return render(request, 'project_task/velocity.html', {'name': 'velocity', 'window': window})
+
+    def velocity_data(request):
+        """
+        Returns the velocity report of the archived sprints as JSON, with rolling averages over the number of
+        sprints given by the `window` query parameter.
+        """
+        report = VelocityReport.build(SprintBoard._velocity_window(request))
+        return JsonResponse({'status': 'success', 'message': 'Velocity report', **report})
+
+    def _velocity_window(request):
+        try:
+            window = int(request.GET.get('window', VelocityReport.DEFAULT_WINDOW))
+        except ValueError:
+            window = VelocityReport.DEFAULT_WINDOW
+        return min(max(window, 1), VelocityReport.MAX_WINDOW)
+
+    def workload(request):
+        """
+        Renders the workload and capacity of each person in the sprints that aren't archived, or in the sprints
+        given by the `sprints` query parameter. The table loads its data from workload_data.
+        """
+        return render(request, 'project_task/workload.html', {
+            'name': 'workload',
+            'sprints': ','.join(str(sprint_id) for sprint_id in SprintBoard._workload_sprints(request)),
+        })
+
+    def workload_data(request):
+        """
+        Returns the workload and capacity of each person as JSON, in the sprints given by the comma-separated
+        `sprints` query parameter, or in the sprints that aren't archived.
+        """
+        report = WorkloadReport.build(SprintBoard._workload_sprints(request))
+        return JsonResponse({'status': 'success', 'message': 'Workload report', **report})
+
+    def _workload_sprints(request):
+        sprint_ids = []
+        for sprint_id in request.GET.get('sprints', '').split(','):
+            try:
+                sprint_ids.append(int(sprint_id))
+            except ValueError:
+                continue
+        return sprint_ids[:WorkloadReport.MAX_SPRINTS]
+
+    @atomic_request
     def archive_sprint_backlog(request, sprint_id):
         try:
             sprint = get_object_or_404(Sprint, id=sprint_id)
+            was_completed = sprint.is_completed
 
-            if not sprint.is_completed:
+            if not was_completed:
                 # If the sprint is not completed, set the end_date to today
                 sprint.end_date = timezone.now()
 
             sprint.is_completed = True  # Mark the sprint as completed
 
-            sprint.save()
+            with transaction.atomic():
+                sprint.save()
+                # Freeze the sprint's report from its final data. A sprint that was reopened and is archived again
+                # gets a new report.
+                SprintReports.freeze([sprint.id], replace=not was_completed)
 
         except Sprint.DoesNotExist:
             # Handle the case where the sprint does not exist
@@ -627,10 +1358,60 @@ class SprintBoard:
         return JsonResponse({'status': 'error', 'message': message, 'task_data': task_data})
 
 
+    def log_time(request):
+        """
+        Logs a batch of working hours for the current user in one request.
+
+        Expects a JSON body of the form {"entries": [{"task": 1, "date": "2023-10-19", "duration": "01:30:00"}, ...]}.
+        Each entry updates the user's entry for that task and day, and the response contains the new total hours of
+        every affected task.
+        """
+        if request.method != 'POST':
+            return JsonResponse({'status': 'error', 'message': 'Invalid request method'}, status=405)
+
+        try:
+            entries = json.loads(request.body).get('entries')
+        except (ValueError, AttributeError):
+            return JsonResponse({'status': 'error', 'message': 'Request body must be a JSON object'}, status=400)
+        if not isinstance(entries, list):
+            return JsonResponse({'status': 'error', 'message': 'entries must be a list'}, status=400)
+
+        success, message, totals = TimeLogManager.log_time(request.user, entries)
+        if not success:
+            return JsonResponse({'status': 'error', 'message': message}, status=400)
+
+        return JsonResponse({'status': 'success', 'message': message, 'total_hours': totals})
+
+    def bulk_edit_tasks(request):
+        """
+        Applies status, assignee, priority and stage changes to many tasks in one request.
+
+        Expects a JSON body of the form {"tasks": [{"id": 1, "version": 3, "status": "COM", "assignee": 2}, ...]},
+        where version is the version of the task the editor last loaded. Either every update is applied or, if any
+        task has changed in the meantime, none is and a 409 response lists the conflicting tasks.
+        """
+        if request.method != 'POST':
+            return JsonResponse({'status': 'error', 'message': 'Invalid request method'}, status=405)
+
+        try:
+            updates = json.loads(request.body).get('tasks')
+        except (ValueError, AttributeError):
+            return JsonResponse({'status': 'error', 'message': 'Request body must be a JSON object'}, status=400)
+        if not isinstance(updates, list):
+            return JsonResponse({'status': 'error', 'message': 'tasks must be a list'}, status=400)
+
+        success, message, data = TaskManager.bulk_update_tasks(updates, request.user)
+        if not success:
+            status = 409 if data and 'conflicts' in data else 400
+            return JsonResponse({'status': 'error', 'message': message, **(data or {})}, status=status)
+
+        return JsonResponse({'status': 'success', 'message': message, **data})
+
     def edit_tasks(request, task_id):
         if request.method == 'POST':
-            tasks = Task.objects.get(pk=task_id)
-    
+            tasks = get_object_or_404(Task, pk=task_id)
+            before = TaskHistory.snapshot(tasks)
+
             # Retrieve the assignee's user ID from the POST data
             assignee_id = request.POST.get('assignee')
 
@@ -645,29 +1426,28 @@ class SprintBoard:
             if tasks.status == Task.COMPLETED and not tasks.completed_date:
                 tasks.completed_date = timezone.now().date()
 
+            # Time is logged through the time-logging API, updating today's entry instead of adding a new one
             hour_str = request.POST.get('hour')
-            time = parse_duration(hour_str)
-
-            
-            person = request.user
-
-            # Update the WorkingHour instance associated with the task
-            working_hour, created = WorkingHour.objects.get_or_create(
-                task=tasks,
-                person=person, 
-                date = timezone.now(),
-                hour = time,
-            )
-            working_hour.hour = time
-            working_hour.save()
-
-            tasks.save()
-            
+            total_hours = None
+
+            with transaction.atomic():
+                tasks.save()
+                TaskHistory.record_changes([(tasks.id, before, TaskHistory.snapshot(tasks))], request.user)
+                if hour_str:
+                    success, message, totals = TimeLogManager.log_time(
+                        request.user, [{'task': tasks.id, 'duration': hour_str}]
+                    )
+                    if not success:
+                        # The edit is rejected as a whole, so the task isn't saved without its time entry
+                        transaction.set_rollback(True)
+                        return JsonResponse({'status': 'error', 'message': message}, status=400)
+                    total_hours = totals[tasks.id]
 
             updated_task = {
-                'assignee': tasks.assignee.username,
+                'assignee': tasks.assignee.username if tasks.assignee else None,
                 'status': tasks.status,
-                'hour': str(working_hour.hour)
+                'total_hours': total_hours,
+                'version': tasks.version,
             }
 
             return JsonResponse({'message': 'Task updated successfully', 'updated_task': updated_task})
@@ -702,78 +1482,213 @@ class CreateGraph:
     template_name = 'create_graph.html'
 
     @staticmethod
-    def accumulated_hours_data(sprint):
-        start_date = sprint.start_date
-        end_date = sprint.end_date
+    def create_graph(request, sprint_id):
+        sprint = get_object_or_404(Sprint, pk=sprint_id)
+        # Archived sprints are served from their frozen report, active ones from the series cached per sprint
+        report = SprintReports.get([sprint.id]).get(sprint.id)
+        series = report.series if report else SprintCharts.series([sprint.id])[sprint.id]
 
-        accumulated_hours_per_day = []
-        total_hours = 0.0
-        current_date = start_date
+        context = {
+            "sprint_id": sprint.id,
+            "days": series['days'],
+            "remaining_effort": series['remaining'],
+            "accumulated_hours": series['accumulated'],
+            "ideal_effort": series['ideal'],
+            "summary": report.summary if report else None,
+        }
+        return render(request, 'project_task/create_graph.html', context)
 
-        while current_date <= end_date:
-            # Filter tasks by the current date and accumulate the hours logged for that day
-            hours_logged_today = WorkingHour.objects.filter(task__sprints=sprint, date=current_date).aggregate(
-                sum_hours=Sum('hour'))['sum_hours'] or timedelta()
-            total_hours += hours_logged_today.total_seconds()
-            accumulated_hours_per_day.append(total_hours)
-            current_date += timedelta(days=1)
+    @staticmethod
+    def chart_data(request, sprint_id):
+        """
+        Returns the day labels and the ideal, remaining and accumulated series of a sprint's charts as JSON.
+        The series of an archived sprint come from its frozen report, which clients revalidate with its ETag.
+        """
+        report = SprintReports.get([sprint_id]).get(sprint_id)
+        if report:
+            return CreateGraph._frozen_response(request, report, {
+                'status': 'success', 'message': f'Chart data of sprint {sprint_id}', **report.series,
+            })
 
-        return accumulated_hours_per_day
+        series = SprintCharts.series([sprint_id])
+        if sprint_id not in series:
+            return JsonResponse({'status': 'error', 'message': f'Sprint {sprint_id} not found'}, status=404)
+        return JsonResponse({'status': 'success', 'message': f'Chart data of sprint {sprint_id}', **series[sprint_id]})
 
     @staticmethod
-    def remaining_effort_data(sprint):
-        start_date = sprint.start_date
-        end_date = sprint.end_date
+    def charts_data(request):
+        """
+        Returns the chart series of several sprints at once, given as a comma separated `ids` query parameter.
+        The sprints that are not cached are computed together with one grouped query per series.
+        """
+        try:
+            sprint_ids = [int(sprint_id) for sprint_id in request.GET.get('ids', '').split(',') if sprint_id]
+        except ValueError:
+            return JsonResponse({'status': 'error', 'message': 'ids must be a comma separated list of sprint IDs'},
+                                status=400)
+        if not 1 <= len(sprint_ids) <= SprintCharts.MAX_SPRINTS:
+            return JsonResponse({'status': 'error',
+                                 'message': f'Between 1 and {SprintCharts.MAX_SPRINTS} sprint IDs are required'},
+                                status=400)
+
+        # Archived sprints are read from their frozen reports, only the active ones are computed
+        series = {sprint_id: report.series for sprint_id, report in SprintReports.get(sprint_ids).items()}
+        series.update(SprintCharts.series(sprint_id for sprint_id in sprint_ids if sprint_id not in series))
+        return JsonResponse({
+            'status': 'success',
+            'message': f'Chart data of {len(series)} sprints',
+            'sprints': {str(sprint_id): data for sprint_id, data in series.items()},
+            'missing': [sprint_id for sprint_id in sprint_ids if sprint_id not in series],
+        })
 
-        remaining_points_per_day = []
-        total_story_points = Task.objects.filter(sprints=sprint).aggregate(total=Sum('story_point'))['total'] or 0
+    @staticmethod
+    def sprint_report(request, sprint_id):
+        """
+        Returns the frozen report of an archived sprint, its chart series and summary metrics, as JSON.
+        """
+        report = SprintReports.get([sprint_id]).get(sprint_id)
+        if report is None:
+            return JsonResponse({'status': 'error', 'message': f'Sprint {sprint_id} is not archived'}, status=404)
+        return CreateGraph._frozen_response(request, report, {
+            'status': 'success',
+            'message': f'Report of sprint {sprint_id}',
+            'created_at': report.created_at,
+            'series': report.series,
+            'summary': report.summary,
+        })
 
-        current_date = start_date
+    @staticmethod
+    def cumulative_flow_series(sprint):
+        """
+        Computes the daily number of tasks in each status and in each stage over a sprint.
 
-        while current_date <= end_date:
-            points_burned_today = \
-                Task.objects.filter(sprints=sprint, status=Task.COMPLETED, completed_date=current_date).aggregate(
-                    total=Sum('story_point'))['total'] or 0
+        Every day is reconstructed from the task event log in one ordered pass, so the number of queries does not
+        depend on the length of the sprint. Days after today are left out.
 
-            total_story_points -= points_burned_today
+        Parameters:
+            sprint (Sprint): The sprint.
 
-            remaining_points_per_day.append(total_story_points)
+        Returns:
+            dict: The ISO date of each day, and for 'status' and 'stage' a list of {'value', 'label', 'counts'}
+            series, one per choice, in the order of the model choices.
+        """
+        last_day = min(sprint.end_date, timezone.localdate())
+        days = [sprint.start_date + timedelta(days=i) for i in range((last_day - sprint.start_date).days + 1)]
+        choices = {'status': Task.STATUS_CHOICES, 'stage': Task.STAGE_CHOICES}
+
+        counts = {field: {value: [0] * len(days) for value, _ in field_choices}
+                  for field, field_choices in choices.items()}
+        for index, (_, tasks) in enumerate(TaskHistory.sprint_states(sprint.id, days)):
+            for task in tasks:
+                for field, field_counts in counts.items():
+                    if task[field] in field_counts:
+                        field_counts[task[field]][index] += 1
+
+        series = {
+            field: [{'value': value, 'label': label, 'counts': counts[field][value]} for value, label in field_choices]
+            for field, field_choices in choices.items()
+        }
+        return {'days': [day.isoformat() for day in days], **series}
 
-            current_date += timedelta(days=1)
+    @staticmethod
+    def cumulative_flow(request, sprint_id):
+        sprint = get_object_or_404(Sprint, pk=sprint_id)
+        return render(request, 'project_task/cumulative_flow.html', {"sprint": sprint})
 
-        return remaining_points_per_day
+    @staticmethod
+    def cumulative_flow_data(request, sprint_id):
+        sprint = get_object_or_404(Sprint, pk=sprint_id)
+        return JsonResponse({'status': 'success', 'message': f'Cumulative flow of {sprint}',
+                             **CreateGraph.cumulative_flow_series(sprint)})
 
     @staticmethod
-    def ideal_effort_data(sprint, total_story_points):
-        num_days_in_sprint = (sprint.end_date - sprint.start_date).days + 1
-        if num_days_in_sprint == 1:
-            ideal_decrease_per_day = total_story_points  # Or however you want to handle this special case
-        else:
-            ideal_decrease_per_day = total_story_points / (num_days_in_sprint - 1)
-        ideal_effort = [total_story_points - i * ideal_decrease_per_day for i in range(num_days_in_sprint)]
-        return ideal_effort
+    def _frozen_response(request, report, data):
+        """
+        Returns data from a frozen sprint report as JSON with the report's ETag, or a 304 response if the client
+        already has it.
+        """
+        etag = quote_etag(report.etag)
+        response = get_conditional_response(request, etag=etag) or JsonResponse(data)
+        response['ETag'] = etag
+        # A report is replaced when its sprint is archived again or rebuilt, under the same URL, so clients keep it
+        # but revalidate it on every use
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class Autocomplete:
+    """
+    Autocomplete endpoints of the tag and assignee fields, in the format expected by Select2.
+
+    Both take the typed prefix as `term` and the 1-based page to return as `page`, and respond with
+    {"results": [{"id": ..., "text": ...}], "pagination": {"more": bool}}. Matches are found and ordered through an
+    index on the lowercased name, so each page costs the same however many tags and users there are.
+    """
+
+    # Number of results per page
+    PAGE_SIZE = 20
+
+    # Upper bound of the strings starting with a prefix, as no character sorts after it
+    _PREFIX_END = '\U0010ffff'
 
     @staticmethod
-    def create_graph(request, sprint_id):
-        sprint = get_object_or_404(Sprint, pk=sprint_id)
-        # Fetch accumulated hours for the given sprint
-        accumulated_hours = CreateGraph.accumulated_hours_data(sprint)
+    def tags(request):
+        """
+        Returns the tags of the current project whose names start with `term`. With `value=name`, the results are
+        identified by their names instead of their IDs, as the backlog's tag filter does.
+        """
+        by_name = request.GET.get('value') == 'name'
+        return Autocomplete._prefix_page(request, Tag.objects.all(), 'name',
+                                         lambda tag: tag.name if by_name else tag.id,
+                                         caching.TAGS, ('search', by_name))
 
-        remaining_effort = CreateGraph.remaining_effort_data(sprint)
+    @staticmethod
+    def assignees(request):
+        """
+        Returns the users the current project's tasks can be assigned to whose usernames start with `term`.
+        """
+        return Autocomplete._prefix_page(request, request.project.assignable_users(), 'username',
+                                         lambda user: user.id, caching.USERS, ('search',))
 
-        total_story_points = Task.objects.filter(sprints=sprint).aggregate(total=Sum('story_point'))['total'] or 0
+    ### Utilities Methods ###
 
-        ideal_effort = CreateGraph.ideal_effort_data(sprint, total_story_points)
+    @staticmethod
+    def _prefix_page(request, queryset, field, value, namespace, key):
+        """
+        Utility method to respond with a page of the objects whose `field` starts with the requested term, ignoring
+        case. Pages are read through the cache of the current project.
 
-        # Calculate the number of days in the sprint
-        num_days_in_sprint = (sprint.end_date - sprint.start_date).days + 1
+        Parameters:
+            request (HttpRequest): The request, with the `term` and `page` query parameters.
+            queryset (QuerySet): The objects to search.
+            field (str): The searched field, which has an index on its lowercased value.
+            value (callable): Returns the value identifying an object in the results.
+            namespace (str): The cache namespace of the pages.
+            key (tuple): The parts identifying the search within the project's namespace.
 
-        days = ["Day {}".format(i + 1) for i in range(num_days_in_sprint)]
+        Returns:
+            JsonResponse: The page of results, or an error response with status 400 if the page is invalid.
+        """
+        term = request.GET.get('term', '').strip().lower()
+        try:
+            page = int(request.GET.get('page', 1))
+        except ValueError:
+            page = 0
+        if page < 1:
+            return JsonResponse({'status': 'error', 'message': 'page must be a positive integer'}, status=400)
+
+        def search():
+            # A range over the lowercased value rather than LIKE/ILIKE, which the databases can't answer from the index
+            matches = queryset.annotate(search_key=Lower(field))
+            if term:
+                matches = matches.filter(search_key__gte=term, search_key__lt=term + Autocomplete._PREFIX_END)
+            offset = (page - 1) * Autocomplete.PAGE_SIZE
+            # One more row than needed tells whether there is a next page without counting the matches
+            objects = list(matches.order_by('search_key', 'pk')[offset:offset + Autocomplete.PAGE_SIZE + 1])
+            return {
+                'results': [{'id': value(obj), 'text': str(obj)} for obj in objects[:Autocomplete.PAGE_SIZE]],
+                'pagination': {'more': len(objects) > Autocomplete.PAGE_SIZE},
+            }
 
-        context = {
-            "days": days,
-            "remaining_effort": remaining_effort,
-            "accumulated_hours": accumulated_hours,
-            "ideal_effort": ideal_effort,
-        }
-        return render(request, 'project_task/create_graph.html', context)
+        page_data = caching.get_or_compute(namespace, (*key, term, page), search, project_id=request.project.id)
+        return JsonResponse({'status': 'success', **page_data})
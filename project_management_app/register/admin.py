@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db import transaction
+from project_task.admin_utils import ScalableModelAdmin
 from .models import CustomizedUser, WorkingHour, ScrumRole
 from django.contrib.auth.admin import UserAdmin
 from django.utils.translation import gettext_lazy as _
@@ -41,7 +43,7 @@ class CustomizedUserAdmin(UserAdmin):
             'fields': ('first_name', 'last_name', 'email')
         }),
         ('Active and Roles', {
-            'fields': ('is_active', 'scrum_role')
+            'fields': ('is_active', 'scrum_role', 'sprint_capacity')
         }),
         ('Permissions', {
             'fields': ('is_superuser', 'is_staff')
@@ -54,8 +56,25 @@ class CustomizedUserAdmin(UserAdmin):
 
 
 @admin.register(WorkingHour)
-class WorkingHoursAdmin(admin.ModelAdmin):
-    pass
+class WorkingHoursAdmin(ScalableModelAdmin):
+    """
+    Admin configuration for the WorkingHour model.
+
+    The changelist joins the task and person into its single query and the change form searches them on demand.
+    Bulk deletes run in batches, each in its own transaction.
+    """
+
+    list_display = ('task', 'person', 'date', 'hour')
+    list_select_related = ('task', 'person')
+    search_fields = ('task__name', 'person__username')
+    date_hierarchy = 'date'
+    autocomplete_fields = ('task', 'person')
+
+    def delete_queryset(self, request, queryset):
+        for hour_ids in self.batched_ids(queryset):
+            with transaction.atomic():
+                # The signals sent for each deleted row invalidate the charts of their tasks' sprints
+                WorkingHour.all_objects.filter(id__in=hour_ids).delete()
 
 
 @admin.register(ScrumRole)
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.4 on 2026-10-19 20:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import register.models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('project_task', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomizedUser',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('username', models.CharField(max_length=30, unique=True, verbose_name='Username')),
+                ('email', models.EmailField(max_length=200, unique=True, verbose_name='Email Address')),
+                ('first_name', models.CharField(max_length=200, verbose_name='First Name')),
+                ('last_name', models.CharField(max_length=200, verbose_name='Last Name')),
+                ('is_superuser', models.BooleanField(default=False, verbose_name='Superuser')),
+                ('is_staff', models.BooleanField(default=False, verbose_name='Staff')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Active')),
+                ('is_email_confirmed', models.BooleanField(default=False)),
+                ('activation_token', models.CharField(default=register.models.generate_activation_token, max_length=255, unique=True)),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date Joined')),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+            ],
+            options={
+                'verbose_name': 'User',
+                'verbose_name_plural': 'Users',
+            },
+        ),
+        migrations.CreateModel(
+            name='ScrumRole',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.CharField(max_length=200)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WorkingHour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(default=django.utils.timezone.now)),
+                ('hour', models.DurationField()),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='project_task.task')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='customizeduser',
+            name='scrum_role',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='register.scrumrole', verbose_name='Scrum Role'),
+        ),
+        migrations.AddField(
+            model_name='customizeduser',
+            name='user_permissions',
+            field=models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+from django.db.models import Count, Min, Q, Sum
+
+
+def merge_duplicate_working_hours(apps, schema_editor):
+    """
+    Merges the working hours of a person on a task and day into their oldest row, holding the sum of their hours.
+
+    Logging time used to add a new row on every edit, so older databases can hold several rows per (task, person,
+    date), which the unique_working_hour_per_day constraint would refuse. The total hours of every task stay the same.
+    Entries without a task are left alone, as the constraint doesn't apply to them.
+    """
+    WorkingHour = apps.get_model('register', 'WorkingHour')
+    working_hours = WorkingHour.objects.using(schema_editor.connection.alias)
+    groups = list(
+        working_hours.filter(task__isnull=False).values('task_id', 'person_id', 'date')
+        .annotate(rows=Count('id'), total=Sum('hour'), keep_id=Min('id')).filter(rows__gt=1)
+        .order_by('keep_id')
+    )
+    batch_size = 500
+    for start in range(0, len(groups), batch_size):
+        batch = groups[start:start + batch_size]
+        rows = Q()
+        for group in batch:
+            rows |= Q(task_id=group['task_id'], person_id=group['person_id'], date=group['date'])
+        working_hours.bulk_update([WorkingHour(id=group['keep_id'], hour=group['total']) for group in batch], ['hour'])
+        working_hours.filter(rows).exclude(id__in=[group['keep_id'] for group in batch]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('register', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workinghour',
+            index=models.Index(fields=['task', 'date', 'hour'], name='working_hour_task_date_idx'),
+        ),
+        migrations.RunPython(merge_duplicate_working_hours, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='workinghour',
+            constraint=models.UniqueConstraint(fields=('task', 'person', 'date'), name='unique_working_hour_per_day'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import project_task.models
+
+
+def assign_default_project(apps, schema_editor):
+    """
+    Points the existing working hours at the default project, created by the migration adding projects.
+    """
+    Project = apps.get_model('project_task', 'Project')
+    WorkingHour = apps.get_model('register', 'WorkingHour')
+    alias = schema_editor.connection.alias
+    project = Project.objects.using(alias).get(name='Default')
+    WorkingHour.objects.using(alias).filter(project__isnull=True).update(project=project)
+
+
+class Migration(migrations.Migration):
+    """
+    Scopes working hours to projects, adding the project as a nullable column that is made required once the existing
+    rows point at the default project.
+    """
+
+    dependencies = [
+        ('project_task', '0004_projects'),
+        ('register', '0002_working_hour_per_day'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workinghour',
+            name='project',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='project_task.project'),
+        ),
+        migrations.RunPython(assign_default_project, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='workinghour',
+            name='project',
+            field=models.ForeignKey(db_index=False, default=project_task.models.default_project_id, editable=False, on_delete=django.db.models.deletion.CASCADE, to='project_task.project'),
+        ),
+        migrations.AddIndex(
+            model_name='workinghour',
+            index=models.Index(fields=['project', 'date'], name='working_hour_project_date_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('register', '0003_working_hour_project'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customizeduser',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='user_lower_username_idx'),
+        ),
+        migrations.AddField(
+            model_name='customizeduser',
+            name='sprint_capacity',
+            field=models.PositiveIntegerField(default=20, verbose_name='Sprint Capacity'),
+        ),
+    ]
@@ -1,9 +1,12 @@
 from django.utils.translation import gettext as _
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 
+from project_task.models import ProjectScopedModel
+
 
 class CustomUserManager(BaseUserManager):
     """
@@ -71,6 +74,13 @@ class CustomUserManager(BaseUserManager):
         return self.create_user(username, email, first_name, last_name, password, **other_fields)
 
 
+def generate_activation_token():
+    """
+    Returns a new random activation token, so that every user gets their own.
+    """
+    return get_random_string(20)
+
+
 class CustomizedUser(AbstractBaseUser, PermissionsMixin):
     """
     Customized User model.
@@ -87,6 +97,7 @@ class CustomizedUser(AbstractBaseUser, PermissionsMixin):
         - is_staff (BooleanField): Designates if the user can access the admin site.
         - is_active (BooleanField): Designates if the user account is active.
         - scrum_role (ForeignKey): Role of the user in Scrum.
+        - sprint_capacity (PositiveIntegerField): Story points the user can take on in a sprint.
         - date_joined (DateTimeField): Date and time the user joined the system.
     """
     objects = CustomUserManager()
@@ -107,10 +118,12 @@ class CustomizedUser(AbstractBaseUser, PermissionsMixin):
     # Additional info
     scrum_role = models.ForeignKey('ScrumRole', on_delete=models.CASCADE, blank=True, null=True,
                                    verbose_name=_("Scrum Role"))
+    # Story points assigned to the user in a sprint beyond which the workload report flags them as over capacity
+    sprint_capacity = models.PositiveIntegerField(default=20, verbose_name=_("Sprint Capacity"))
 
     # Registration info
     is_email_confirmed = models.BooleanField(default=False)  # True after email verification
-    activation_token = models.CharField(max_length=255, default=get_random_string(20), unique=True)
+    activation_token = models.CharField(max_length=255, default=generate_activation_token, unique=True)
 
     # default required fields
     date_joined = models.DateTimeField(default=timezone.now, verbose_name=_("Date Joined"))
@@ -120,6 +133,10 @@ class CustomizedUser(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = _("User")
         verbose_name_plural = _("Users")
+        indexes = [
+            # Case-insensitive prefix searches of the assignee autocomplete
+            models.Index(Lower('username'), name='user_lower_username_idx'),
+        ]
 
     def get_name(self):
         """
@@ -131,7 +148,7 @@ class CustomizedUser(AbstractBaseUser, PermissionsMixin):
         return f"{self.first_name} {self.last_name}"
 
 
-class WorkingHour(models.Model):
+class WorkingHour(ProjectScopedModel):
     """
     This class is used to create a model for working hours.
     """
@@ -140,6 +157,17 @@ class WorkingHour(models.Model):
     date = models.DateField(default=timezone.now)
     hour = models.DurationField()
 
+    class Meta:
+        constraints = [
+            # A person has a single entry per task per day, which logging time updates in place
+            models.UniqueConstraint(fields=['task', 'person', 'date'], name='unique_working_hour_per_day'),
+        ]
+        indexes = [
+            # Covers summing the hours logged on a task within a date range without reading the table
+            models.Index(fields=['task', 'date', 'hour'], name='working_hour_task_date_idx'),
+            models.Index(fields=['project', 'date'], name='working_hour_project_date_idx'),
+        ]
+
 
 class ScrumRole(models.Model):
     """
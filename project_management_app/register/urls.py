@@ -17,6 +17,8 @@ urlpatterns = [
     # Admin URLs
     path('admin/hour_graph/', register_view.AdminGraphView.as_view(), name='hour_graph'),
     path('admin/hour_graph/post/', register_view.AdminGraphView.as_view(), name='graph'),
+    path('admin/profiles/', register_view.ProfileListView.as_view(), name='profile_list'),
+    path('admin/profiles/<str:profile_name>/', register_view.ProfileDownloadView.as_view(), name='profile_download'),
     # Logout URL
     path('logout/', auth_views.LogoutView.as_view(), name='logout')
 ]
\ No newline at end of file
@@ -1,13 +1,17 @@
+from functools import partial
+
 from django.contrib.auth import login
 from django.contrib.auth.views import LoginView
 from django.core.mail import send_mail
-from django.http import JsonResponse
+from django.db import transaction
+from django.http import FileResponse, Http404, JsonResponse
 from django.shortcuts import redirect, render
 from django.views.generic import FormView, View
 from .forms import RegisterFrom, PersonGraphForm, DateGraphForm
 from django.urls import reverse_lazy, reverse
 from .models import CustomizedUser, WorkingHour
 from django.contrib.auth.mixins import UserPassesTestMixin
+from project_management_app.profiling import ProfileStore
 import datetime
 class RegisterView(FormView):
     """
@@ -52,7 +56,8 @@ class RegisterView(FormView):
             }))
         message = f'Click the link below to activate your account:\n{activation_link}'
         from_email = 'your_email@example.com'
-        send_mail(mail_subject, message, from_email, [user.email])
+        # Sent once the user is committed, so a rolled back or retried registration sends no email
+        transaction.on_commit(partial(send_mail, mail_subject, message, from_email, [user.email]))
 
         # Not redirecting as frontend ajax will do the redirecting
         return JsonResponse({"success": "Registered successfully!"})
@@ -239,6 +244,81 @@ class AdminGraphView(UserPassesTestMixin, View):
             return render(request, 'admin/date_graph.html', context)
 
 
+class ProfileListView(UserPassesTestMixin, View):
+    """
+    Class-based view to list the stored request profiles in the admin site.
+
+    Attributes:
+        template_name (str): Specifies the path to the template for rendering the profile list.
+    """
+    template_name = 'admin/profile_list.html'
+
+    def test_func(self):
+        """
+        Only staff users can see the profiles.
+
+        Returns:
+            bool: True if user is staff, False otherwise.
+        """
+        return self.request.user.is_staff
+
+    def get(self, request):
+        """
+        Handle GET request.
+
+        Renders the list of stored profiles, newest first.
+
+        Args:
+            request (HttpRequest): The GET request.
+
+        Returns:
+            HttpResponse: A response containing the rendered profile list.
+        """
+        context = {
+            'has_permission': True,
+            'is_nav_sidebar_enabled': True,
+            'is_popup': False,
+            'title': 'Request Profiles',
+            'profiles': ProfileStore.from_settings().list(),
+        }
+        return render(request, self.template_name, context)
+
+
+class ProfileDownloadView(UserPassesTestMixin, View):
+    """
+    Class-based view to download a stored request profile.
+    """
+
+    def test_func(self):
+        """
+        Only staff users can download the profiles.
+
+        Returns:
+            bool: True if user is staff, False otherwise.
+        """
+        return self.request.user.is_staff
+
+    def get(self, request, profile_name):
+        """
+        Handle GET request.
+
+        Args:
+            request (HttpRequest): The GET request.
+            profile_name (str): Name of the stored profile.
+
+        Returns:
+            FileResponse: The profile as an attachment, loadable with `pstats` or snakeviz.
+
+        Raises:
+            Http404: If no profile with that name is stored.
+        """
+        path = ProfileStore.from_settings().path_for(profile_name)
+        if path is None:
+            raise Http404("Profile not found")
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=profile_name,
+                            content_type='application/octet-stream')
+
+
 class LoginView(LoginView):
     """
     Class-based view to handle user login.